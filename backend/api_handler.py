@@ -2,21 +2,19 @@ import json
 import logging
 import os
 import datetime
+import time
 from argparse import Namespace
+from contextlib import contextmanager
 from time import perf_counter
 
-from ariadne import (
-    gql,
-    graphql_sync,
-)
+from ariadne import graphql_sync
 
 from dataall.base.api import bootstrap as bootstrap_schema, get_executable_schema
-from dataall.base.services.service_provider_factory import ServiceProviderFactory
+from dataall.base.api.dataloader import DataLoaders
 from dataall.core.tasks.service_handlers import Worker
 from dataall.base.aws.sqs import SqsQueue
-from dataall.base.aws.parameter_store import ParameterStoreManager
+from dataall.base.utils import Parameter
 from dataall.base.context import set_context, dispose_context, RequestContext
-from dataall.core.permissions.db import save_permissions_with_tenant
 from dataall.core.permissions.db.tenant_policy_repositories import TenantPolicy
 from dataall.base.db import get_engine
 from dataall.core.permissions import permissions
@@ -26,19 +24,66 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 log = logging.getLogger(__name__)
 
+# duration in milliseconds of each phase of the cold start
+COLD_START_PHASES = {}
+
+
+@contextmanager
+def cold_start_phase(name):
+    phase_start = perf_counter()
+    try:
+        yield
+    finally:
+        COLD_START_PHASES[name] = round((perf_counter() - phase_start) * 1000, 1)
+
+
+def report_cold_start(phases):
+    """Logs the cold start phases in the CloudWatch embedded metric format, CloudWatch turns them into metrics"""
+    print(
+        json.dumps(
+            {
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [
+                        {
+                            'Namespace': 'dataall/api',
+                            'Dimensions': [['envname']],
+                            'Metrics': [{'Name': f'ColdStart.{phase}', 'Unit': 'Milliseconds'} for phase in phases],
+                        }
+                    ],
+                },
+                'envname': ENVNAME,
+                **{f'ColdStart.{phase}': duration for phase, duration in phases.items()},
+            }
+        )
+    )
+
+
 start = perf_counter()
 for name in ['boto3', 's3transfer', 'botocore', 'boto']:
     logging.getLogger(name).setLevel(logging.ERROR)
 
-load_modules(modes={ImportMode.API})
-SCHEMA = bootstrap_schema()
-TYPE_DEFS = gql(SCHEMA.gql(with_directives=False))
 REAUTH_TTL = int(os.environ.get('REAUTH_TTL', '5'))
 ENVNAME = os.getenv('envname', 'local')
-ENGINE = get_engine(envname=ENVNAME)
-Worker.queue = SqsQueue.send
 
-save_permissions_with_tenant(ENGINE)
+with cold_start_phase('LoadModules'):
+    load_modules(modes={ImportMode.API})
+
+# parameters read by the engine and by every request, or every task enqueue, are loaded once per container
+with cold_start_phase('Parameters'):
+    try:
+        Parameter.prefetch(env=ENVNAME, prefixes=['aurora', 'reauth', 'sqs', 'pivotRole'])
+    except Exception as e:
+        log.warning(f'Failed to prefetch SSM parameters: {e}')
+
+with cold_start_phase('Engine'):
+    ENGINE = get_engine(envname=ENVNAME)
+Worker.queue = Worker.coalesced(SqsQueue.send)
+
+# the permissions are saved by the database migration of each deployment, see migrations/seed_permissions.py
+with cold_start_phase('Schema'):
+    SCHEMA = bootstrap_schema()
+    executable_schema = get_executable_schema(SCHEMA)
 
 
 def resolver_adapter(resolver):
@@ -58,8 +103,9 @@ def resolver_adapter(resolver):
     return adapted
 
 
-executable_schema = get_executable_schema()
 end = perf_counter()
+COLD_START_PHASES['Total'] = round((end - start) * 1000, 1)
+report_cold_start(COLD_START_PHASES)
 print(f'Lambda Context ' f'Initialization took: {end - start:.3f} sec')
 
 
@@ -82,6 +128,9 @@ def get_cognito_groups(claims):
 
 
 def get_custom_groups(user_id):
+    # only needed with a custom identity provider, the cognito client is imported on first use
+    from dataall.base.services.service_provider_factory import ServiceProviderFactory
+
     service_provider = ServiceProviderFactory.get_service_provider_instance()
     return service_provider.get_groups_for_user(user_id)
 
@@ -170,11 +219,12 @@ def handler(event, context):
             'username': username,
             'groups': groups,
             'schema': SCHEMA,
+            'loaders': DataLoaders(ENGINE),
         }
 
         # Determine if there are any Operations that Require ReAuth From SSM Parameter
         try:
-            reauth_apis = ParameterStoreManager.get_parameter_value(region=os.getenv('AWS_REGION', 'eu-west-1'), parameter_path=f"/dataall/{ENVNAME}/reauth/apis").split(',')
+            reauth_apis = Parameter.get_parameter(env=ENVNAME, path='reauth/apis').split(',')
         except Exception as e:
             log.info("No ReAuth APIs Found in SSM")
             reauth_apis = None
@@ -216,11 +266,15 @@ def handler(event, context):
                 'body': json.dumps(response)
             }
 
-    success, response = graphql_sync(
-        schema=executable_schema, data=query, context_value=app_context
-    )
+    # the tasks queued by the resolvers are sent together once the request is executed
+    with SqsQueue.batch():
+        success, response = graphql_sync(
+            schema=executable_schema, data=query, context_value=app_context
+        )
 
     dispose_context()
+    ENGINE.remove_session()
+    log.info('DB pool metrics %s', json.dumps(ENGINE.pool_metrics()))
     response = json.dumps(response)
 
     log.info('Lambda Response %s', response)
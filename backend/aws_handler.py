@@ -25,3 +25,4 @@ def handler(event, context=None):
         message = json.loads(record['body'])
         log.info(f'Extracted Message: {message}')
         Worker.process(engine=engine, task_ids=message)
+    log.info(f'Task handlers metrics: {Worker.metrics.to_dict()}')
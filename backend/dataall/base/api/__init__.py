@@ -1,3 +1,5 @@
+import logging
+import os
 from argparse import Namespace
 
 from ariadne import (
@@ -12,6 +14,13 @@ from ariadne import (
 
 from dataall.base.api import gql
 from dataall.base.api.constants import GraphQLEnumMapper
+from dataall.base.api.dataloader import DataLoaders
+
+log = logging.getLogger(__name__)
+
+# The schema definition generated at build time, see write_schema_artifact. Only set in the image of the API handler,
+# a local server always generates the schema so that it follows the changes of the gql types
+SCHEMA_ARTIFACT = os.getenv('graphql_schema_artifact')
 
 
 def bootstrap():
@@ -52,23 +61,29 @@ def bootstrap():
 
 def resolver_adapter(resolver):
     def adapted(obj, info, **kwargs):
+        # the loaders live as long as the graphql context, so they are shared by all the resolvers of a request
+        loaders = info.context.get('loaders')
+        if loaders is None:
+            loaders = info.context['loaders'] = DataLoaders(info.context['engine'])
         response = resolver(
             context=Namespace(
                 engine=info.context['engine'],
                 username=info.context['username'],
                 groups=info.context['groups'],
                 schema=info.context['schema'],
+                loaders=loaders,
             ),
             source=obj or None,
             **kwargs,
         )
+        loaders.track(response)
         return response
 
     return adapted
 
 
-def get_executable_schema():
-    schema = bootstrap()
+def get_executable_schema(schema=None):
+    schema = schema or bootstrap()
     _types = []
     for _type in schema.types:
         if _type.name == 'Query':
@@ -102,6 +117,39 @@ def get_executable_schema():
     for union in schema.unions:
         _unions.append(UnionType(union.name, union.resolver))
 
-    type_defs = GQL(schema.gql(with_directives=False))
+    type_defs = load_type_defs(schema)
     executable_schema = make_executable_schema(type_defs, *(_types + _enums + _unions))
     return executable_schema
+
+
+def load_type_defs(schema):
+    """
+    Returns the schema definition of the prebuilt artifact if it was built with the same modules,
+    otherwise generates and validates it from the schema
+    """
+    if not SCHEMA_ARTIFACT:
+        return GQL(schema.gql(with_directives=False))
+
+    header = _artifact_header()
+    try:
+        with open(SCHEMA_ARTIFACT) as f:
+            if f.readline().rstrip('\n') == header:
+                return f.read()
+        log.warning(f'Schema artifact {SCHEMA_ARTIFACT} was built with different modules, ignoring it')
+    except FileNotFoundError:
+        pass
+    return GQL(schema.gql(with_directives=False))
+
+
+def write_schema_artifact(path):
+    """Generates and validates the schema definition of the loaded modules and saves it to path"""
+    type_defs = GQL(bootstrap().gql(with_directives=False))
+    with open(path, 'w') as f:
+        f.write(f'{_artifact_header()}\n{type_defs}')
+    return path
+
+
+def _artifact_header():
+    from dataall.base.loader import list_loaded_modules
+
+    return f'# modules: {",".join(sorted(list_loaded_modules()))}'
@@ -0,0 +1,14 @@
+"""
+Builds the GraphQL schema artifact shipped with the API handler:
+graphql_schema_artifact=<path> python -m dataall.base.api.build
+"""
+import sys
+
+from dataall.base.api import SCHEMA_ARTIFACT, write_schema_artifact
+from dataall.base.loader import load_modules, ImportMode
+
+if __name__ == '__main__':
+    if not SCHEMA_ARTIFACT:
+        sys.exit('Set graphql_schema_artifact to the path of the schema artifact')
+    load_modules(modes={ImportMode.API})
+    print(f'GraphQL schema written to {write_schema_artifact(SCHEMA_ARTIFACT)}')
@@ -0,0 +1,85 @@
+"""
+Per request batching of the lookups made by field resolvers.
+
+GraphQL resolves the fields of the items of a list one item after the other, so a field resolver that loads the
+environment of a dataset runs once per dataset of the page. The resolver adapter tracks the objects returned by
+the resolvers; the first time a loader misses a key, it loads the keys of all the tracked objects of the same type
+in a single query, and the following items of the list are served from its cache.
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List
+
+log = logging.getLogger(__name__)
+
+# batch_load(session, keys) -> {key: value}, keys without a value are missing
+BatchLoadFn = Callable[[Any, List[Any]], Dict[Any, Any]]
+
+
+class DataLoader:
+    """Caches the values loaded by batch_load, misses are loaded together with the keys queued by prime"""
+
+    def __init__(self, engine, batch_load: BatchLoadFn, default=None):
+        self._engine = engine
+        self._batch_load = batch_load
+        self._default = default
+        self._cache = {}
+        self._queued = set()
+        self.batches = 0
+
+    def prime(self, keys: Iterable):
+        """Queues keys to be loaded with the next miss"""
+        self._queued.update(key for key in keys if key is not None and key not in self._cache)
+
+    def load(self, key):
+        if key is None:
+            return self._default
+        if key not in self._cache:
+            keys = list(self._queued | {key})
+            self._queued.clear()
+            with self._engine.scoped_session() as session:
+                values = self._batch_load(session, keys)
+            self.batches += 1
+            for k in keys:
+                self._cache[k] = values.get(k, self._default)
+        return self._cache[key]
+
+
+class DataLoaders:
+    """The data loaders of a request, created on first use and shared by all the resolvers of the request"""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self._loaders: Dict[str, DataLoader] = {}
+        self._sources = defaultdict(list)
+        self._primed = set()
+
+    def track(self, result):
+        """Records the objects returned by a resolver, either a list or a page of a paginated list"""
+        if isinstance(result, dict):
+            result = result.get('nodes')
+        if isinstance(result, (list, tuple)) and len(result) > 1:
+            for item in result:
+                if item is not None and not isinstance(item, (dict, str, int, float, bool)):
+                    self._sources[type(item)].append(item)
+
+    def loader(self, name: str, batch_load: BatchLoadFn, default=None) -> DataLoader:
+        if name not in self._loaders:
+            self._loaders[name] = DataLoader(self._engine, batch_load, default)
+        return self._loaders[name]
+
+    def load(self, name: str, source, key: str, batch_load: BatchLoadFn, default=None):
+        """
+        Returns the value of the loader `name` for the attribute `key` of source.
+        The attribute of the objects tracked with the same type as source is loaded in the same batch
+        """
+        loader = self.loader(name, batch_load, default)
+        siblings = self._sources.get(type(source), [])
+        primed = (name, type(source), key, len(siblings))
+        if siblings and primed not in self._primed:
+            self._primed.add(primed)
+            loader.prime(getattr(item, key, None) for item in siblings)
+        return loader.load(getattr(source, key))
+
+    def stats(self) -> dict:
+        return {name: loader.batches for name, loader in self._loaders.items()}
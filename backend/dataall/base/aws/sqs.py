@@ -1,7 +1,9 @@
 import json
 import logging
 import os
+import threading
 import uuid
+from contextlib import contextmanager
 
 import boto3
 from botocore.exceptions import ClientError
@@ -10,6 +12,13 @@ from dataall.base.utils import Parameter
 
 logger = logging.getLogger(__name__)
 
+# number of task ids sent in one message, the worker processes the tasks of a message together
+TASKS_PER_MESSAGE = int(os.getenv('sqs_tasks_per_message', '10'))
+# maximum number of entries of sqs:SendMessageBatch
+SEND_BATCH_SIZE = 10
+
+_batch_storage = threading.local()
+
 
 class SqsQueue:
     disabled = True
@@ -45,18 +54,56 @@ class SqsQueue:
 
     @classmethod
     def send(cls, engine, task_ids: [str]):
+        buffer = getattr(_batch_storage, 'task_ids', None)
+        if buffer is not None:
+            logger.debug(f'Buffering task {task_ids} until the end of the batch')
+            buffer.extend(task_ids)
+            return None
+        return cls._send_messages(task_ids)
+
+    @classmethod
+    @contextmanager
+    def batch(cls):
+        """Buffers the tasks sent in the block and sends them with as few SendMessageBatch requests as possible"""
+        if getattr(_batch_storage, 'task_ids', None) is not None:
+            yield
+            return
+
+        _batch_storage.task_ids = []
+        try:
+            yield
+        finally:
+            task_ids, _batch_storage.task_ids = _batch_storage.task_ids, None
+            if task_ids:
+                cls._send_messages(task_ids)
+
+    @classmethod
+    def _send_messages(cls, task_ids: [str]):
         cls.configure_(
             Parameter().get_parameter(env=cls.get_envname(), path='sqs/queue_url')
         )
         client = cls.get_sqs_client()
         logger.debug(f'Sending task {task_ids} through SQS {cls.queue_url}')
+        messages = [task_ids[i : i + TASKS_PER_MESSAGE] for i in range(0, len(task_ids), TASKS_PER_MESSAGE)]
+        responses = []
         try:
-            return client.send_message(
-                QueueUrl=cls.queue_url,
-                MessageBody=json.dumps(task_ids),
-                MessageGroupId=cls._get_random_message_id(),
-                MessageDeduplicationId=cls._get_random_message_id(),
-            )
+            for start in range(0, len(messages), SEND_BATCH_SIZE):
+                response = client.send_message_batch(
+                    QueueUrl=cls.queue_url,
+                    Entries=[
+                        {
+                            'Id': str(i),
+                            'MessageBody': json.dumps(message),
+                            'MessageGroupId': cls._get_random_message_id(),
+                            'MessageDeduplicationId': cls._get_random_message_id(),
+                        }
+                        for i, message in enumerate(messages[start : start + SEND_BATCH_SIZE])
+                    ],
+                )
+                for failure in response.get('Failed', []):
+                    logger.error(f'Failed to send message {failure} through SQS {cls.queue_url}')
+                responses.append(response)
+            return responses
         except ClientError as e:
             logger.error(e)
             raise e
@@ -1,12 +1,16 @@
 import json
 import logging
 import os
+import threading
+import time
 import urllib
+import weakref
 
 import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
+from dataall.base.utils.parameter import Parameter
 from dataall.version import __version__, __pkg_name__
 
 try:
@@ -19,6 +23,59 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# assumed role sessions are refreshed this many seconds before their credentials expire
+SESSION_REFRESH_MARGIN = int(os.getenv('sts_session_refresh_margin', '300'))
+
+
+class _SessionCache:
+    """
+    In-process cache of the assumed role sessions, keyed by role arn and external id,
+    and of the boto3 clients created from any session, keyed by service and region
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sessions = {}
+        self._clients = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get_session(self, role_arn, external_id):
+        with self._lock:
+            cached = self._sessions.get((role_arn, external_id))
+            if cached and cached[1] - SESSION_REFRESH_MARGIN > time.time():
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+            return None
+
+    def put_session(self, role_arn, external_id, session, expiration: float):
+        with self._lock:
+            self._sessions[(role_arn, external_id)] = (session, expiration)
+
+    def get_client(self, session, service_name, region_name, config):
+        key = (service_name, region_name, config)
+        with self._lock:
+            clients = self._clients.setdefault(session, {})
+            if key not in clients:
+                # boto3 sessions are not thread safe, clients are created under the lock
+                clients[key] = session.client(service_name, region_name=region_name, config=config)
+            return clients[key]
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'sessions': len(self._sessions)}
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_session_cache = _SessionCache()
+
 
 class SessionHelper:
     """SessionHelpers is a class simplifying common aws boto3 session tasks and helpers"""
@@ -47,6 +104,9 @@ class SessionHelper:
                     RoleArn=role_arn,
                     RoleSessionName=role_arn.split('/')[1],
                 )
+            session = _session_cache.get_session(role_arn, external_id_secret)
+            if session:
+                return session
             try:
                 region = os.getenv('AWS_REGION', 'eu-west-1')
                 sts = base_session.client(
@@ -56,11 +116,15 @@ class SessionHelper:
                     endpoint_url=f"https://sts.{region}.amazonaws.com"
                 )
                 response = sts.assume_role(**assume_role_dict)
-                return boto3.Session(
+                session = boto3.Session(
                     aws_access_key_id=response['Credentials']['AccessKeyId'],
                     aws_secret_access_key=response['Credentials']['SecretAccessKey'],
                     aws_session_token=response['Credentials']['SessionToken'],
                 )
+                _session_cache.put_session(
+                    role_arn, external_id_secret, session, response['Credentials']['Expiration'].timestamp()
+                )
+                return session
             except ClientError as e:
                 log.error(f'Failed to assume role {role_arn} due to: {e} ')
                 raise e
@@ -68,6 +132,27 @@ class SessionHelper:
         else:
             return boto3.Session()
 
+    @classmethod
+    def get_client(cls, session, service_name, region_name=None, config=None):
+        """Returns a boto3 client of the session, the client is created once per service and region
+        Args:
+            session(object) : a boto3 session, usually returned by remote_session
+            service_name(string) : name of the AWS service
+            region_name(string, optional) : AWS region of the client
+        Returns :
+            a boto3 client, boto3 clients are thread safe and can be shared
+        """
+        return _session_cache.get_client(session, service_name, region_name, config)
+
+    @classmethod
+    def session_cache_stats(cls):
+        """Returns the hits and misses of the assumed role sessions cache"""
+        return _session_cache.stats()
+
+    @classmethod
+    def clear_session_cache(cls):
+        _session_cache.clear()
+
     @classmethod
     def _get_parameter_value(cls, parameter_path=None):
         """
@@ -76,13 +161,10 @@ class SessionHelper:
         :rtype:
         """
         parameter_value = None
-        region = os.getenv('AWS_REGION', 'eu-west-1')
         if not parameter_path:
             raise Exception('Parameter name is None')
         try:
-            session = SessionHelper.get_session()
-            client = session.client('ssm', region_name=region)
-            parameter_value = client.get_parameter(Name=parameter_path)['Parameter']['Value']
+            parameter_value = Parameter.get_parameter_by_name(parameter_path)
             log.debug(f'Found Parameter {parameter_path}|{parameter_value}')
         except ClientError as e:
             log.warning(f'Parameter {parameter_path} not found: {e}')
@@ -4,10 +4,13 @@
 # see : https://github.com/aws-samples/cdk-assume-role-credential-plugin
 
 import ast
+import hashlib
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from abc import abstractmethod
 from typing import Dict
 
@@ -24,6 +27,12 @@ logger = logging.getLogger('cdksass')
 
 ENVNAME = os.getenv('envname', 'local')
 
+# synthesizes the data.all app in the running interpreter instead of a new python process per stack
+SYNTH_IN_PROCESS = os.getenv('cdk_synth_in_process', 'false').lower() == 'true'
+
+# stacks in these states are left untouched when their synthesized templates didn't change
+UP_TO_DATE_STATUSES = ['CREATE_COMPLETE', 'UPDATE_COMPLETE', 'IMPORT_COMPLETE']
+
 
 class CDKCliWrapperExtension:
     def __init__(self):
@@ -143,12 +152,7 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
 
             CommandSanitizer(input_args)
 
-            cmd = [
-                '' '. ~/.nvm/nvm.sh &&',
-                'cdk',
-                'deploy --all',
-                '--require-approval',
-                ' never',
+            context_args = [
                 '-c',
                 f"appid='{stack.name}'",
                 # the target accountid
@@ -165,36 +169,45 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                 f"target_uri='{stack.targetUri}'",
                 '-c',
                 "data='{}'",
-                # skips synth step when no changes apply
-                '--app',
-                f'"{sys.executable} {app_path}"',
-                '--verbose',
             ]
-            logger.info(f"Running command : \n {' '.join(cmd)}")
-
-            # This command is too complex to be executed as a list of commands. We need to run it with shell=True
-            # However, the input arguments have to be sanitized with the CommandSanitizer
 
-            process = subprocess.run(  # nosemgrep
-                ' '.join(cmd),  # nosemgrep
-                text=True,  # nosemgrep
-                shell=True,  # nosec  # nosemgrep
-                encoding='utf-8',  # nosemgrep
-                env=env,  # nosemgrep
-                cwd=cwd,  # nosemgrep
-            )
+            # The templates are synthesized first, the deployment is skipped if they didn't change since
+            # the last successful deployment, otherwise the synthesized cloud assembly is deployed as is
+            assembly_dir = tempfile.mkdtemp(prefix='cdk.out.')
+            try:
+                # extensions bring their own CDK app, only the data.all app is kept loaded in process
+                in_process = SYNTH_IN_PROCESS and not extension
+                template_hash = synth_cdk_stack(stack, context_args, app_path, assembly_dir, env, cwd, in_process)
+                if template_hash and template_hash == stack.templateHash and is_stack_up_to_date(stack):
+                    logger.info(f'Templates of stack {stack.name} did not change, skipping the deployment')
+                    process = None
+                else:
+                    app = assembly_dir if template_hash else f'"{sys.executable} {app_path}"'
+                    process = _run_cdk_command(
+                        ['deploy --all', '--require-approval', ' never', *context_args, '--app', app, '--verbose'],
+                        env,
+                        cwd,
+                    )
+            finally:
+                shutil.rmtree(assembly_dir, ignore_errors=True)
 
             if extension:
                 _CDK_CLI_WRAPPER_EXTENSIONS[stack.stack].post_deployment()
             else:
                 logger.info(f'There is no CDK deployment extension for {stack.stack}. Proceeding further with the post-deployment')
 
-            if process.returncode == 0:
+            if process is None:
                 meta = describe_stack(stack)
                 stack.stackid = meta['StackId']
                 stack.status = meta['StackStatus']
+            elif process.returncode == 0:
+                meta = describe_stack(stack)
+                stack.stackid = meta['StackId']
+                stack.status = meta['StackStatus']
+                stack.templateHash = template_hash
                 update_stack_output(session, stack)
             else:
+                stack.templateHash = None
                 stack.status = 'CREATE_FAILED'
                 logger.error(f'Failed to deploy stack {stackid} due to {str(process.stderr)}')
                 AlarmService().trigger_stack_deployment_failure_alarm(stack=stack)
@@ -205,6 +218,73 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
             raise e
 
 
+def _run_cdk_command(args, env, cwd):
+    cmd = ['' '. ~/.nvm/nvm.sh &&', 'cdk', *args]
+    logger.info(f"Running command : \n {' '.join(cmd)}")
+
+    # This command is too complex to be executed as a list of commands. We need to run it with shell=True
+    # However, the input arguments have to be sanitized with the CommandSanitizer
+
+    return subprocess.run(  # nosemgrep
+        ' '.join(cmd),  # nosemgrep
+        text=True,  # nosemgrep
+        shell=True,  # nosec  # nosemgrep
+        encoding='utf-8',  # nosemgrep
+        env=env,  # nosemgrep
+        cwd=cwd,  # nosemgrep
+    )
+
+
+def synth_cdk_stack(stack, context_args, app_path, assembly_dir, env, cwd, in_process=False):
+    """Synthesizes the stack into assembly_dir and returns the hash of the cloud assembly, None if synth failed"""
+    if in_process:
+        from dataall.base.cdkproxy import synth_worker
+
+        try:
+            if synth_worker.synth(stack, assembly_dir):
+                return hash_cloud_assembly(assembly_dir)
+        except Exception as e:
+            logger.warning(f'Failed to synthesize stack {stack.name} in process due to {e}')
+        logger.info(f'Synthesizing stack {stack.name} with the cdk cli')
+        shutil.rmtree(assembly_dir, ignore_errors=True)
+        os.makedirs(assembly_dir)
+
+    process = _run_cdk_command(
+        ['synth', '--quiet', *context_args, '--app', f'"{sys.executable} {app_path}"', '--output', assembly_dir],
+        env,
+        cwd,
+    )
+    if process.returncode != 0:
+        logger.warning(f'Failed to synthesize the stack due to {process.stderr}, deploying without synth')
+        return None
+    return hash_cloud_assembly(assembly_dir)
+
+
+def hash_cloud_assembly(assembly_dir):
+    """
+    Hashes the CloudFormation templates and the asset manifests of a cloud assembly.
+    Asset manifests reference the assets by the hash of their content, so any change of an asset changes the hash
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(assembly_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('asset.'))
+        for name in sorted(files):
+            if name.endswith('.template.json') or name.endswith('.assets.json'):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, assembly_dir).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def is_stack_up_to_date(stack):
+    try:
+        return describe_stack(stack)['StackStatus'] in UP_TO_DATE_STATUSES
+    except Exception as e:
+        logger.warning(f'Failed to describe stack {stack.name} due to: {e}')
+        return False
+
+
 def describe_stack(stack, engine: Engine = None, stackid: str = None):
     if not stack:
         with engine.scoped_session() as session:
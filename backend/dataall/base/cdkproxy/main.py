@@ -47,6 +47,14 @@ def connect():
 app = FastAPI()
 
 
+@app.on_event('startup')
+def warm_up_synth_worker():
+    if wrapper.SYNTH_IN_PROCESS:
+        from dataall.base.cdkproxy import synth_worker
+
+        synth_worker.warm_up()
+
+
 @app.get('/', status_code=status.HTTP_200_OK)
 def up(response: Response):
     logger.info('GET /')
@@ -0,0 +1,70 @@
+"""
+Synthesizes the data.all CDK app inside the running interpreter.
+The CDK libraries and the data.all modules are imported once and reused for every stack,
+only the deployment of the synthesized cloud assembly is left to the cdk cli
+"""
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger('cdksass')
+
+# the jsii runtime behind aws_cdk is not thread safe, apps are synthesized one at a time
+_lock = threading.Lock()
+_loaded = False
+
+
+def warm_up():
+    """Imports the CDK libraries and the stacks of the data.all modules"""
+    global _loaded
+    with _lock:
+        if not _loaded:
+            from dataall.base.loader import load_modules, ImportMode
+
+            load_modules(modes={ImportMode.CDK})
+            _loaded = True
+
+
+def synth(stack, assembly_dir) -> bool:
+    """
+    Synthesizes the stack into assembly_dir.
+    Returns False if the app needs context lookups, only the cdk cli can run them and synthesize again
+    """
+    warm_up()
+    from aws_cdk import App, Environment
+    from dataall.base.cdkproxy.stacks import instanciate_stack
+
+    context = {
+        **_project_context(),
+        'appid': stack.name,
+        'account': stack.accountid,
+        'region': stack.region,
+        'stack': stack.stack,
+        'target_uri': stack.targetUri,
+        'data': '{}',
+    }
+    with _lock:
+        logger.info(f'Synthesizing stack {stack.name} in process')
+        app = App(outdir=assembly_dir, context=context)
+        instanciate_stack(
+            stack.stack,
+            app,
+            stack.name,
+            env=Environment(account=stack.accountid, region=stack.region),
+            target_uri=stack.targetUri,
+        )
+        app.synth()
+
+    with open(os.path.join(assembly_dir, 'manifest.json')) as f:
+        missing = json.load(f).get('missing')
+    if missing:
+        logger.info(f'Stack {stack.name} needs context lookups {[m.get("key") for m in missing]}')
+        return False
+    return True
+
+
+def _project_context():
+    """The feature flags of cdk.json, that the cdk cli passes to the app"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cdk.json')) as f:
+        return json.load(f).get('context', {})
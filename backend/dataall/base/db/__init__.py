@@ -2,6 +2,7 @@ from .base import Base, Resource
 from . import exceptions
 from .connection import (
     Engine,
+    PoolConfig,
     get_engine,
     create_schema_if_not_exists,
     create_schema_and_tables,
@@ -10,4 +11,4 @@ from .connection import (
     drop_schema_if_exists,
 )
 from .dbconfig import DbConfig
-from .paginator import paginate
+from .paginator import paginate, paginate_by_cursor
@@ -1,11 +1,15 @@
 import json
 import logging
 import os
+import threading
 from contextlib import contextmanager
+from time import perf_counter
 
 import sqlalchemy
+from sqlalchemy import event
 from sqlalchemy.engine import reflection
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 
 from dataall.base.aws.secrets_manager import SecretsManager
 from dataall.base.db import Base
@@ -22,13 +26,56 @@ log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
 
 
+class PoolConfig:
+    """Connection pool settings, can be overwritten with environment variables of the deployment"""
+
+    def __init__(self, size: int = None, max_overflow: int = None, pre_ping: bool = None, recycle: int = None,
+                 timeout: int = None):
+        self.size = size if size is not None else int(os.getenv('db_pool_size', '1'))
+        self.max_overflow = max_overflow if max_overflow is not None else int(os.getenv('db_pool_max_overflow', '10'))
+        self.pre_ping = pre_ping if pre_ping is not None else os.getenv('db_pool_pre_ping', 'true').lower() == 'true'
+        self.recycle = recycle if recycle is not None else int(os.getenv('db_pool_recycle', '1800'))
+        self.timeout = timeout if timeout is not None else int(os.getenv('db_pool_timeout', '30'))
+
+
+class _MeteredQueuePool(QueuePool):
+    """QueuePool that counts the checkouts which had to wait for a free connection"""
+
+    def __init__(self, *args, max_overflow=10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # the PoolConfig.max_overflow handed over by Engine, kept instead of reading the private QueuePool state
+        self.max_overflow = max_overflow
+        self._metrics_lock = threading.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _do_get(self):
+        exhausted = self.max_overflow > -1 and self.checkedin() == 0 and self.overflow() >= self.max_overflow
+        if not exhausted:
+            return super()._do_get()
+
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            with self._metrics_lock:
+                self.waits += 1
+                self.wait_time += perf_counter() - start
+
+
 class Engine:
-    def __init__(self, dbconfig: DbConfig):
+    def __init__(self, dbconfig: DbConfig, pool_config: PoolConfig = None):
         self.dbconfig = dbconfig
+        self.pool_config = pool_config or PoolConfig()
         self.engine = sqlalchemy.create_engine(
             dbconfig.url,
             echo=False,
-            pool_size=1,
+            poolclass=_MeteredQueuePool,
+            pool_size=self.pool_config.size,
+            max_overflow=self.pool_config.max_overflow,
+            pool_pre_ping=self.pool_config.pre_ping,
+            pool_recycle=self.pool_config.recycle,
+            pool_timeout=self.pool_config.timeout,
             connect_args={'options': f"-csearch_path={dbconfig.schema}"},
         )
         try:
@@ -45,16 +92,17 @@ class Engine:
         except Exception as e:
             log.error(f'Could not create schema: {e}')
 
-        self.sessions = {}
-        self._session = None
+        self._checkouts = 0
+        self._checkouts_lock = threading.Lock()
+        event.listen(self.engine, 'checkout', self._on_checkout)
 
-    def session(self):
-        if self._session is None:
-            self._session = sessionmaker(
-                bind=self.engine, autoflush=True, expire_on_commit=False
-            )()
+        # every thread (request) gets its own session, nested scoped_session() calls in the same thread share it
+        self._sessions = scoped_session(
+            sessionmaker(bind=self.engine, autoflush=True, expire_on_commit=False)
+        )
 
-        return self._session
+    def session(self):
+        return self._sessions()
 
     @contextmanager
     def scoped_session(self):
@@ -68,9 +116,32 @@ class Engine:
         finally:
             s.close()
 
+    def remove_session(self):
+        """Closes and discards the session of the current thread. Should be called at the end of a request"""
+        self._sessions.remove()
+
+    def pool_metrics(self) -> dict:
+        """Returns the state of the connection pool for monitoring"""
+        pool = self.engine.pool
+        return {
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'checkouts': self._checkouts,
+            'waits': getattr(pool, 'waits', 0),
+            'wait_time': round(getattr(pool, 'wait_time', 0.0), 3),
+        }
+
     def dispose(self):
+        self.remove_session()
         self.engine.dispose()
 
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        # checkouts happen from the request threads of the local server and the worker thread pools
+        with self._checkouts_lock:
+            self._checkouts += 1
+
 
 def create_schema_if_not_exists(engine, envname):
     print(f'Creating schema {envname}...')
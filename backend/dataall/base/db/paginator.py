@@ -1,10 +1,15 @@
+import base64
+import json
 import math
+from datetime import datetime
 
-__version__ = '0.0.2'
+from sqlalchemy import tuple_
+
+__version__ = '0.0.3'
 
 
 class Page(object):
-    def __init__(self, items, page, page_size, total):
+    def __init__(self, items, page, page_size, total, has_next=None):
         self.page_size = page_size
         self.page = page
         self.items = items
@@ -14,11 +19,13 @@ class Page(object):
         if self.has_previous:
             self.previous_page = page - 1
         previous_items = (page - 1) * page_size
-        self.has_next = previous_items + len(items) < total
+        if has_next is None:
+            has_next = previous_items + len(items) < total
+        self.has_next = has_next
         if self.has_next:
             self.next_page = page + 1
         self.total = total
-        self.pages = int(math.ceil(total / float(page_size)))
+        self.pages = int(math.ceil(total / float(page_size))) if total is not None else None
 
     def to_dict(self):
         return {
@@ -34,11 +41,86 @@ class Page(object):
         }
 
 
-def paginate(query, page, page_size):
+class CursorPage(object):
+    """
+    Page of a keyset pagination. The cursor is an opaque string that encodes the ordering key of the last item.
+    The dictionary has the same shape as Page.to_dict(), plus the cursor of the next page
+    """
+
+    def __init__(self, items, page_size, total, has_next, next_cursor, cursor=None):
+        self.items = items
+        self.page_size = page_size
+        self.total = total
+        self.has_next = has_next
+        self.has_previous = cursor is not None
+        self.next_cursor = next_cursor
+
+    def to_dict(self):
+        return {
+            'count': self.total,
+            'pages': int(math.ceil(self.total / float(self.page_size))) if self.total is not None else None,
+            'page': None,
+            'pageSize': self.page_size,
+            'nodes': self.items,
+            'hasNext': self.has_next,
+            'hasPrevious': self.has_previous,
+            'nextPage': None,
+            'previousPage': None,
+            'nextCursor': self.next_cursor,
+        }
+
+
+def paginate(query, page, page_size, with_count=True):
     if page <= 0:
         raise AttributeError('page needs to be >= 1')
     if page_size <= 0:
         raise AttributeError('page_size needs to be >= 1')
+    if not with_count:
+        items = query.limit(page_size + 1).offset((page - 1) * page_size).all()
+        return Page(items[:page_size], page, page_size, None, has_next=len(items) > page_size)
+
     items = query.limit(page_size).offset((page - 1) * page_size).all()
     total = query.order_by(None).count()
     return Page(items, page, page_size, total)
+
+
+def paginate_by_cursor(query, order_by, page_size, cursor=None, with_count=None):
+    """
+    Keyset pagination: seeks past the ordering key of the last item of the previous page
+    instead of scanning and discarding the rows of all previous pages.
+    order_by is a list of columns that uniquely identify a row, ideally covered by an index.
+    By default the total count is computed for the first page only, the client keeps it for the next pages
+    """
+    if page_size <= 0:
+        raise AttributeError('page_size needs to be >= 1')
+    if with_count is None:
+        with_count = cursor is None
+
+    total = query.order_by(None).count() if with_count else None
+
+    ordered = query.order_by(None).order_by(*order_by)
+    if cursor:
+        ordered = ordered.filter(tuple_(*order_by) > tuple_(*_decode_cursor(cursor)))
+    items = ordered.limit(page_size + 1).all()
+
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = _encode_cursor([getattr(last, column.key) for column in order_by])
+
+    return CursorPage(items, page_size, total, has_next, next_cursor, cursor)
+
+
+def _encode_cursor(values):
+    encoded = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(encoded).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise AttributeError('cursor is invalid')
+    return [datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v for v in values]
@@ -1,20 +1,33 @@
 import json
 import logging
 import os
+import threading
+import time
 
 import boto3
 from botocore.exceptions import ClientError
 
 log = logging.getLogger('utils:Parameter')
 
+# seconds a parameter value, or the absence of a parameter, is kept in memory
+CACHE_TTL = int(os.getenv('ssm_parameter_cache_ttl', '300'))
+MISSING_CACHE_TTL = int(os.getenv('ssm_parameter_missing_cache_ttl', '60'))
+
 
 class Parameter:
     prefix = 'dataall'
+    _client = None
+    _lock = threading.RLock()
+    # parameter name -> (value or None if the parameter doesn't exist, expiration time)
+    _cache = {}
+    # path prefix -> expiration time of a prefetch that loaded all the parameters under it
+    _prefetched = {}
 
     @classmethod
     def ssm(cls):
-        client = boto3.client('ssm', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
-        return client
+        if cls._client is None:
+            cls._client = boto3.client('ssm', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
+        return cls._client
 
     @classmethod
     def get_parameter_name(cls, env, path=''):
@@ -34,33 +47,79 @@ class Parameter:
             Type='String',
             Overwrite=True,
         )
+        cls.invalidate(env, path)
         return Parameter.get_parameter(env, path)
 
     @classmethod
     def get_parameter(cls, env, path=''):
         pname = cls.get_parameter_name(env, path)
+        return cls.get_parameter_by_name(pname)
+
+    @classmethod
+    def get_parameter_by_name(cls, pname):
+        """Returns the value of the parameter, or None if it doesn't exist, from the cache if it is fresh"""
+        now = time.time()
+        with cls._lock:
+            cached = cls._cache.get(pname)
+            if cached and cached[1] > now:
+                return cached[0]
+            if any(pname.startswith(prefix) and expires > now for prefix, expires in cls._prefetched.items()):
+                return None
+
         ssm = cls.ssm()
         try:
             param_value = ssm.get_parameter(Name=pname)['Parameter']['Value']
+            cls._store(pname, param_value)
             return param_value
         except ClientError as e:
             if e.response['Error']['Code'] == 'ParameterNotFound':
-                log.warning(
-                    'Parameter `{}` not found for env `{}`, defaulting to None'.format(
-                        path, env
-                    )
-                )
+                log.warning(f'Parameter `{pname}` not found, defaulting to None')
+                cls._store(pname, None)
                 return None
             else:
                 log.error('Error trying to retrieve parameter from SSM')
                 raise e
 
+    @classmethod
+    def prefetch(cls, env, prefixes=None):
+        """
+        Loads all the parameters under the prefixes with get_parameters_by_path,
+        a parameter missing under a prefetched prefix is not looked up again until the prefetch expires
+        """
+        for prefix in prefixes or ['']:
+            pname = cls.get_parameter_name(env, prefix).rstrip('/')
+            paginator = cls.ssm().get_paginator('get_parameters_by_path')
+            for page in paginator.paginate(Path=pname, Recursive=True):
+                for p in page['Parameters']:
+                    cls._store(p['Name'], p['Value'])
+            with cls._lock:
+                cls._prefetched[f'{pname}/'] = time.time() + MISSING_CACHE_TTL
+
+    @classmethod
+    def invalidate(cls, env=None, path=None):
+        """Forgets one cached parameter, or all of them if no env is given"""
+        with cls._lock:
+            if env is None:
+                cls._cache.clear()
+                cls._prefetched.clear()
+                return
+            pname = cls.get_parameter_name(env, path or '')
+            cls._cache.pop(pname, None)
+            cls._prefetched = {k: v for k, v in cls._prefetched.items() if not pname.startswith(k)}
+
+    @classmethod
+    def _store(cls, pname, value):
+        ttl = CACHE_TTL if value is not None else MISSING_CACHE_TTL
+        with cls._lock:
+            cls._cache[pname] = (value, time.time() + ttl)
+
     @classmethod
     def clean_environment(cls, env):
         params = cls.get_parameters(env=env)
         for p in params[env]:
             pname = Parameter.get_parameter_name(env=env, path=p['Name'])
             cls.ssm().delete_parameter(Name=pname)
+        cls.invalidate()
 
     @classmethod
     def get_parameters(cls, env, prefix=None):
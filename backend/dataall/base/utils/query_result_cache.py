@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+# seconds a query result is served from memory
+CACHE_TTL = int(os.getenv('query_result_cache_ttl', '300'))
+# number of results kept, the least recently used result is evicted first
+CACHE_MAX_ENTRIES = int(os.getenv('query_result_cache_max_entries', '100'))
+# results bigger than this, in bytes of their json representation, are not cached
+CACHE_MAX_RESULT_SIZE = int(os.getenv('query_result_cache_max_result_size', str(1024 * 1024)))
+
+
+# quoted literals and identifiers, comments and whitespaces, in the order they are matched
+_SQL_TOKENS = re.compile(
+    r"(?P<literal>'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")"
+    r"|(?P<comment>--[^\n]*\n?|/\*.*?\*/)"
+    r"|(?P<space>\s+)",
+    re.DOTALL,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapses the whitespaces outside of quoted literals and comments and drops the trailing semicolon,
+    so that equivalent queries share a cache entry
+    """
+    normalized = _SQL_TOKENS.sub(lambda m: ' ' if m.lastgroup == 'space' else m.group(0), sql or '')
+    return normalized.strip().rstrip(';').strip()
+
+
+_READ_ONLY_STATEMENTS = {'select', 'with'}
+_NON_DETERMINISTIC_FUNCTIONS = re.compile(
+    r'\b(rand|random|uuid|shuffle|now|current_date|current_time|current_timestamp|localtime|localtimestamp)\b',
+    re.IGNORECASE,
+)
+
+
+def is_cacheable_query(sql: str) -> bool:
+    """
+    Only the results of deterministic read-only queries can be cached.
+    Running again a statement that writes (INSERT, CTAS, DROP, MSCK REPAIR...) must not be skipped
+    """
+    # literals and comments are not part of the statement structure
+    code = _SQL_TOKENS.sub(lambda m: ' ' if m.lastgroup == 'space' else ' ? ', sql or '').lstrip(' (?')
+    keyword = code.split(' ', 1)[0].lower()
+    return keyword in _READ_ONLY_STATEMENTS and not _NON_DETERMINISTIC_FUNCTIONS.search(code)
+
+
+class QueryResultCache:
+    """In memory LRU cache of query results with a time to live"""
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, max_result_size=CACHE_MAX_RESULT_SIZE):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_result_size = max_result_size
+        self._lock = threading.Lock()
+        # key -> (result, expiration time)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return
+        size = len(json.dumps(result, default=str))
+        if size > self._max_result_size:
+            log.info(f'Query result of {size} bytes is too big to be cached')
+            return
+        with self._lock:
+            self._entries[key] = (result, time.time() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_run(self, key, run):
+        """Returns the cached result of key, or runs the query and caches its result"""
+        result = self.get(key)
+        if result is None:
+            result = run()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -508,10 +508,7 @@ def generate_environment_access_token(
 
 
 def get_environment_stack(context: Context, source: Environment, **kwargs):
-    return stack_helper.get_stack_with_cfn_resources(
-        targetUri=source.environmentUri,
-        environmentUri=source.environmentUri,
-    )
+    return stack_helper.load_stack_with_cfn_resources(context.loaders, source, target_key='environmentUri')
 
 
 def delete_environment(
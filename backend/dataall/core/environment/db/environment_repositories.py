@@ -36,6 +36,12 @@ class EnvironmentParameterRepository:
 
 
 class EnvironmentRepository:
+    @staticmethod
+    def get_environments_by_uris(session, uris) -> dict:
+        """Returns the environments of the uris by uri, in a single query"""
+        environments = session.query(Environment).filter(Environment.environmentUri.in_(uris)).all()
+        return {environment.environmentUri: environment for environment in environments}
+
     @staticmethod
     def get_environment_by_uri(session, uri):
         if not uri:
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import List
+from typing import Dict, List
 
 
 class StackFinder(ABC):
@@ -15,3 +15,10 @@ class StackFinder(ABC):
     def find_stack_uris(self, session) -> List[str]:
         """Finds stacks to update"""
         raise NotImplementedError("find_stack_uris is not implemented")
+
+    def find_stacks(self, session) -> Dict[str, List[str]]:
+        """
+        Finds stacks to update with the target uris of the stacks they depend on.
+        The stacks they depend on are updated first
+        """
+        return {uri: [] for uri in self.find_stack_uris(session)}
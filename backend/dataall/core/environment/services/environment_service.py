@@ -14,7 +14,8 @@ from dataall.core.environment.services.environment_resource_manager import Envir
 from dataall.core.permissions.db.permission_repositories import Permission
 from dataall.core.permissions.db.permission_models import PermissionType
 from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
-from dataall.core.permissions.permission_checker import has_resource_permission, has_tenant_permission
+from dataall.core.permissions.permission_checker import has_resource_permission, has_tenant_permission, \
+    filter_authorized_resources
 from dataall.core.vpc.db.vpc_models import Vpc
 from dataall.base.db.paginator import paginate
 from dataall.base.utils.naming_convention import (
@@ -530,11 +531,17 @@ class EnvironmentService:
     @staticmethod
     def paginated_user_environments(session, data=None) -> dict:
         context = get_context()
-        return paginate(
+        page = paginate(
             query=EnvironmentService.query_user_environments(session, context.username, context.groups, data),
             page=data.get('page', 1),
             page_size=data.get('pageSize', 5),
         ).to_dict()
+        # the organization of every environment is resolved by OrganizationService.get_organization, that checks
+        # GET_ORGANIZATION. Checking the page at once caches the decisions read by these checks
+        filter_authorized_resources(
+            session, list({env.organizationUri for env in page['nodes']}), permissions.GET_ORGANIZATION
+        )
+        return page
 
     @staticmethod
     def list_valid_user_environments(session, data=None) -> dict:
@@ -18,49 +18,127 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
-RETRIES = 30
+# maximum number of cdkproxy tasks running at the same time
+MAX_RUNNING_TASKS = int(os.getenv('stack_updater_max_tasks', '10'))
+# stacks that depend on a stack still updating after this time are updated anyway
+TASK_TIMEOUT = int(os.getenv('stack_updater_task_timeout', '900'))
 SLEEP_TIME = 30
 
 
 def update_stacks(engine, envname):
     with engine.scoped_session() as session:
         all_environments: [Environment] = EnvironmentService.list_all_active_environments(session)
-        additional_stacks = []
+        additional_stacks = {}
         for finder in StackFinder.all():
-            additional_stacks.extend(finder.find_stack_uris(session))
+            additional_stacks.update(finder.find_stacks(session))
 
         log.info(f'Found {len(all_environments)} environments, triggering update stack tasks...')
-        environment: Environment
-        for environment in all_environments:
-            update_stack(session=session, envname=envname, target_uri=environment.environmentUri, wait=True)
+        stacks = {environment.environmentUri: [] for environment in all_environments}
+        stacks.update(additional_stacks)
 
-        for stack_uri in additional_stacks:
-            update_stack(session=session, envname=envname, target_uri=stack_uri, wait=False)
+        scheduler = StackUpdateScheduler(session, envname)
+        scheduler.run(stacks)
+        log.info(f'Stacks update report: {scheduler.report()}')
 
         return len(all_environments), len(additional_stacks)
 
 
-def update_stack(session, envname, target_uri, wait=False):
+class StackUpdateScheduler:
+    """
+    Keeps up to max_running cdkproxy tasks running. A stack is updated once all the stacks it depends on finished,
+    the running tasks are polled together with a single describe_tasks loop
+    """
+
+    def __init__(self, session, envname, max_running=MAX_RUNNING_TASKS, timeout=TASK_TIMEOUT, sleep_time=SLEEP_TIME):
+        self._session = session
+        self._envname = envname
+        self._max_running = max_running
+        self._timeout = timeout
+        self._sleep_time = sleep_time
+        self._running = {}
+        self._finished = set()
+        self._timings = {}
+        self._failed = []
+        self._started = None
+
+    def run(self, stacks):
+        """Updates the stacks, a dictionary of target uri to the target uris of the stacks it depends on"""
+        self._started = time.monotonic()
+        pending = dict(stacks)
+        while pending or self._running:
+            started = 0
+            for target_uri in [uri for uri, depends_on in pending.items() if self._is_ready(depends_on, stacks)]:
+                if len(self._running) >= self._max_running:
+                    break
+                del pending[target_uri]
+                self._start(target_uri)
+                started += 1
+
+            if self._running:
+                time.sleep(self._sleep_time)
+                self._poll()
+            elif pending and not started:
+                log.error(f'Stacks {list(pending)} have circular dependencies, skipping them')
+                self._failed.extend(pending)
+                break
+
+    def report(self):
+        return {
+            'seconds': round(time.monotonic() - self._started, 2) if self._started else 0,
+            'stacks': len(self._timings),
+            'failed': self._failed,
+            'timings': self._timings,
+        }
+
+    def _is_ready(self, depends_on, stacks):
+        return all(uri in self._finished or uri not in stacks for uri in depends_on)
+
+    def _start(self, target_uri):
+        try:
+            task_arn = update_stack(session=self._session, envname=self._envname, target_uri=target_uri)
+        except Exception as e:
+            log.error(f'Failed to update stack of {target_uri} due to: {e}')
+            task_arn = None
+            self._failed.append(target_uri)
+
+        if task_arn:
+            self._running[task_arn] = (target_uri, time.monotonic())
+        else:
+            self._finished.add(target_uri)
+
+    def _poll(self):
+        cluster_name = Parameter().get_parameter(env=self._envname, path='ecs/cluster/name')
+        tasks = Ecs.describe_tasks(cluster_name=cluster_name, task_arns=list(self._running.keys()))
+        now = time.monotonic()
+        for task_arn, (target_uri, started) in list(self._running.items()):
+            task = tasks.get(task_arn, {})
+            if task.get('lastStatus') == 'STOPPED':
+                if any(container.get('exitCode') for container in task.get('containers', [])):
+                    self._failed.append(target_uri)
+                log.info(f'Update of stack {target_uri} COMPLETE in {round(now - started)} seconds')
+            elif now - started > self._timeout:
+                log.info(f'Update of stack {target_uri} is not complete after {self._timeout} seconds, continuing...')
+            else:
+                continue
+            del self._running[task_arn]
+            self._finished.add(target_uri)
+            self._timings[target_uri] = round(now - started, 2)
+
+
+def update_stack(session, envname, target_uri):
+    """Starts the cdkproxy task that updates the stack and returns its arn, None if an update is already running"""
     stack = Stack.get_stack_by_target_uri(
         session, target_uri=target_uri
     )
     cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
     if not Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
         stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack_uri=stack.stackUri)
-        if wait:
-            retries = 1
-            while Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
-                log.info(f"Update for {stack.name}//{stack.stackUri} is not complete, waiting for {SLEEP_TIME} seconds...")
-                time.sleep(SLEEP_TIME)
-                retries = retries + 1
-                if retries > RETRIES:
-                    log.info(f"Maximum number of retries exceeded ({RETRIES} retries), continuing task...")
-                    break
-            log.info(f"Update for {stack.name}//{stack.stackUri} COMPLETE or maximum number of retries exceeded ({RETRIES} retries)")
+        return stack.EcsTaskArn
     else:
         log.info(
             f'Stack update is already running... Skipping stack {stack.name}//{stack.stackUri}'
         )
+        return None
 
 
 if __name__ == '__main__':
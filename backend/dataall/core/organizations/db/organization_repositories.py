@@ -25,6 +25,16 @@ class OrganizationRepository:
     def find_organization_by_uri(session, uri) -> models.Organization:
         return session.query(models.Organization).get(uri)
 
+    @staticmethod
+    def find_organizations_by_uris(session, uris) -> dict:
+        """Returns the organizations of the uris by uri, in a single query"""
+        organizations = (
+            session.query(models.Organization)
+            .filter(models.Organization.organizationUri.in_(uris))
+            .all()
+        )
+        return {organization.organizationUri: organization for organization in organizations}
+
     @staticmethod
     def query_user_organizations(session, username, groups, filter) -> Query:
         query = (
@@ -1,7 +1,7 @@
 import datetime
 import enum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as DBEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as DBEnum
 from sqlalchemy.orm import relationship
 
 from dataall.base.db import Base, utils
@@ -76,6 +76,10 @@ class ResourcePolicy(Base):
     created = Column(DateTime, default=datetime.datetime.now)
     updated = Column(DateTime, onupdate=datetime.datetime.now)
 
+    __table_args__ = (
+        Index('ix_resource_policy_resourceUri_principalId', 'resourceUri', 'principalId'),
+    )
+
 
 class ResourcePolicyPermission(Base):
     __tablename__ = 'resource_policy_permission'
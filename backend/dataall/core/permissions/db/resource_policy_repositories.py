@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.sql import and_
 
@@ -7,6 +7,7 @@ from dataall.core.permissions.db.permission_repositories import Permission
 from dataall.core.permissions.db.permission_models import PermissionType
 from dataall.base.db import exceptions
 from dataall.core.permissions.db import permission_models as models
+from dataall.core.permissions.permission_cache import PermissionCache
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +68,64 @@ class ResourcePolicy:
         else:
             return policy
 
+    @staticmethod
+    def filter_authorized_resources(
+        session, groups: [str], resource_uris: [str], permission_name: str
+    ) -> List[str]:
+        """Returns the subset of resource_uris the groups have the permission for, using a single query"""
+        if not groups or not resource_uris or not permission_name:
+            return []
+
+        authorized = (
+            session.query(models.ResourcePolicy.resourceUri)
+            .join(
+                models.ResourcePolicyPermission,
+                models.ResourcePolicy.sid == models.ResourcePolicyPermission.sid,
+            )
+            .join(
+                models.Permission,
+                models.Permission.permissionUri
+                == models.ResourcePolicyPermission.permissionUri,
+            )
+            .filter(
+                and_(
+                    models.ResourcePolicy.principalId.in_(groups),
+                    models.ResourcePolicy.principalType == 'GROUP',
+                    models.Permission.name == permission_name,
+                    models.ResourcePolicy.resourceUri.in_(set(resource_uris)),
+                )
+            )
+            .distinct()
+            .all()
+        )
+        return [row.resourceUri for row in authorized]
+
+    @staticmethod
+    def get_user_resource_permissions(session, groups: [str]) -> List[Tuple[str, str]]:
+        """Returns all (resourceUri, permission name) pairs granted to the groups"""
+        if not groups:
+            return []
+
+        return (
+            session.query(models.ResourcePolicy.resourceUri, models.Permission.name)
+            .join(
+                models.ResourcePolicyPermission,
+                models.ResourcePolicy.sid == models.ResourcePolicyPermission.sid,
+            )
+            .join(
+                models.Permission,
+                models.Permission.permissionUri
+                == models.ResourcePolicyPermission.permissionUri,
+            )
+            .filter(
+                and_(
+                    models.ResourcePolicy.principalId.in_(groups),
+                    models.ResourcePolicy.principalType == 'GROUP',
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def has_group_resource_permission(
         session, group_uri: str, resource_uri: str, permission_name: str
@@ -185,6 +244,7 @@ class ResourcePolicy:
                 session.delete(permission)
             session.delete(policy)
             session.commit()
+            PermissionCache.invalidate()
 
         return True
 
@@ -280,6 +340,7 @@ class ResourcePolicy:
         )
         session.add(policy_permission)
         session.commit()
+        PermissionCache.invalidate()
 
     @staticmethod
     def get_resource_policy_permissions(session, group_uri, resource_uri):
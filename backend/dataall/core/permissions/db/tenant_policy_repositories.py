@@ -8,6 +8,7 @@ from dataall.core.permissions import permissions
 from dataall.core.permissions.db import permission_models as models
 from dataall.core.permissions.db.permission_repositories import Permission
 from dataall.core.permissions.db.tenant_repositories import Tenant as TenantService
+from dataall.core.permissions.permission_cache import PermissionCache
 
 logger = logging.getLogger(__name__)
 
@@ -239,6 +240,7 @@ class TenantPolicy:
         )
         session.add(policy_permission)
         session.commit()
+        PermissionCache.invalidate()
 
     @staticmethod
     def get_tenant_policy_permissions(session, group_uri, tenant_name):
@@ -271,6 +273,7 @@ class TenantPolicy:
                 session.delete(permission)
             session.delete(policy)
             session.commit()
+            PermissionCache.invalidate()
 
         return True
 
@@ -0,0 +1,108 @@
+"""
+Request-scoped cache of permission decisions.
+The cache lives in RequestContext.permission_cache, so it is created with the request and disposed with it.
+Decorated services and nested resolvers that check the same permission again are answered from memory.
+Any change of resource or tenant policies invalidates the cache of the current request.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from dataall.base.context import find_context
+
+log = logging.getLogger(__name__)
+
+_RESOURCE_DECISIONS = 'resource'
+_TENANT_DECISIONS = 'tenant'
+_PRELOADED = 'preloaded'
+_MISSES = 'misses'
+
+# After this number of resource permission lookups that missed the cache,
+# all resource policies of the user groups are loaded in one query
+PRELOAD_THRESHOLD = 10
+
+
+def _storage() -> Optional[dict]:
+    context = find_context()
+    return context.permission_cache if context else None
+
+
+def _groups_key(groups: List[str]) -> Tuple[str, ...]:
+    return tuple(sorted(groups or []))
+
+
+class PermissionCache:
+    """Stores decisions made for the groups of the current request"""
+
+    @staticmethod
+    def get_resource_decision(groups: List[str], resource_uri: str, permission_name: str) -> Optional[bool]:
+        storage = _storage()
+        if storage is None:
+            return None
+
+        groups_key = _groups_key(groups)
+        preloaded = storage.get(_PRELOADED, {}).get(groups_key)
+        if preloaded is not None:
+            return (resource_uri, permission_name) in preloaded
+
+        return storage.get(_RESOURCE_DECISIONS, {}).get((groups_key, resource_uri, permission_name))
+
+    @staticmethod
+    def set_resource_decision(groups: List[str], resource_uri: str, permission_name: str, decision: bool):
+        storage = _storage()
+        if storage is None:
+            return
+
+        key = (_groups_key(groups), resource_uri, permission_name)
+        storage.setdefault(_RESOURCE_DECISIONS, {})[key] = decision
+        storage[_MISSES] = storage.get(_MISSES, 0) + 1
+
+    @staticmethod
+    def set_resource_decisions(groups: List[str], permission_name: str, decisions: Dict[str, bool]):
+        """Saves decisions made in bulk. They don't count towards the preload threshold"""
+        storage = _storage()
+        if storage is None:
+            return
+
+        groups_key = _groups_key(groups)
+        cached = storage.setdefault(_RESOURCE_DECISIONS, {})
+        for resource_uri, decision in decisions.items():
+            cached[(groups_key, resource_uri, permission_name)] = decision
+
+    @staticmethod
+    def get_tenant_decision(groups: List[str], permission_name: str) -> Optional[bool]:
+        storage = _storage()
+        if storage is None:
+            return None
+        return storage.get(_TENANT_DECISIONS, {}).get((_groups_key(groups), permission_name))
+
+    @staticmethod
+    def set_tenant_decision(groups: List[str], permission_name: str, decision: bool):
+        storage = _storage()
+        if storage is None:
+            return
+        storage.setdefault(_TENANT_DECISIONS, {})[(_groups_key(groups), permission_name)] = decision
+
+    @staticmethod
+    def should_preload(groups: List[str]) -> bool:
+        """Returns True when the request checked enough distinct resources to make a bulk load cheaper"""
+        storage = _storage()
+        if storage is None:
+            return False
+        if _groups_key(groups) in storage.get(_PRELOADED, {}):
+            return False
+        return storage.get(_MISSES, 0) >= PRELOAD_THRESHOLD
+
+    @staticmethod
+    def set_preloaded(groups: List[str], permissions: List[Tuple[str, str]]):
+        """Saves all (resourceUri, permission name) pairs granted to the groups"""
+        storage = _storage()
+        if storage is None:
+            return
+        storage.setdefault(_PRELOADED, {})[_groups_key(groups)] = set(permissions)
+
+    @staticmethod
+    def invalidate():
+        storage = _storage()
+        if storage:
+            log.debug('Invalidating request permission cache')
+            storage.clear()
@@ -2,10 +2,12 @@
 Contains decorators that check if user has a permission to access
 and interact with resources or do some actions in the app
 """
-from typing import Protocol, Callable
+from typing import Protocol, Callable, List
 
 from dataall.base.context import RequestContext, get_context
+from dataall.base.db import exceptions
 from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
+from dataall.core.permissions.permission_cache import PermissionCache
 from dataall.core.permissions.db.tenant_policy_repositories import TenantPolicy
 from dataall.base.utils.decorator_utls import process_func
 
@@ -18,23 +20,95 @@ class Identifiable(Protocol):
 
 def _check_tenant_permission(session, permission):
     context: RequestContext = get_context()
-    TenantPolicy.check_user_tenant_permission(
-        session=session,
-        username=context.username,
-        groups=context.groups,
-        tenant_name='dataall',
-        permission_name=permission
-    )
+    decision = PermissionCache.get_tenant_decision(context.groups, permission)
+    if decision is None:
+        decision = bool(TenantPolicy.is_tenant_admin(context.groups) or TenantPolicy.has_user_tenant_permission(
+            session=session,
+            username=context.username,
+            groups=context.groups,
+            tenant_name='dataall',
+            permission_name=permission
+        ))
+        PermissionCache.set_tenant_decision(context.groups, permission, decision)
+
+    if not decision:
+        raise exceptions.TenantUnauthorized(
+            username=context.username,
+            action=permission,
+            tenant_name='dataall',
+        )
 
 
 def _check_resource_permission(session, uri, permission):
     context: RequestContext = get_context()
-    ResourcePolicy.check_user_resource_permission(
-        session=session,
-        username=context.username,
-        groups=context.groups,
-        resource_uri=uri,
-        permission_name=permission,
+    decision = PermissionCache.get_resource_decision(context.groups, uri, permission)
+    if decision is None:
+        if PermissionCache.should_preload(context.groups):
+            preload_resource_permissions(session)
+            decision = PermissionCache.get_resource_decision(context.groups, uri, permission)
+        else:
+            decision = bool(ResourcePolicy.has_user_resource_permission(
+                session=session,
+                username=context.username,
+                groups=context.groups,
+                resource_uri=uri,
+                permission_name=permission,
+            ))
+            PermissionCache.set_resource_decision(context.groups, uri, permission, decision)
+
+    if not decision:
+        raise exceptions.ResourceUnauthorized(
+            username=context.username,
+            action=permission,
+            resource_uri=uri,
+        )
+
+
+def filter_authorized_resources(session, uris: List[str], permission: str) -> List[str]:
+    """
+    Returns the resources from uris the user has the permission for.
+    Resources unknown to the request cache are checked in a single query and the decisions are cached,
+    so the decorated services called for every item of a list don't query the database again.
+    """
+    context: RequestContext = get_context()
+    unknown = {
+        uri for uri in uris
+        if PermissionCache.get_resource_decision(context.groups, uri, permission) is None
+    }
+    if unknown:
+        authorized = set(ResourcePolicy.filter_authorized_resources(
+            session=session,
+            groups=context.groups,
+            resource_uris=list(unknown),
+            permission_name=permission,
+        ))
+        PermissionCache.set_resource_decisions(
+            context.groups, permission, {uri: uri in authorized for uri in unknown}
+        )
+
+    return [uri for uri in uris if PermissionCache.get_resource_decision(context.groups, uri, permission)]
+
+
+def _check_resource_permissions(session, uris, permission):
+    authorized = set(filter_authorized_resources(session, uris, permission))
+    for uri in uris:
+        if uri not in authorized:
+            raise exceptions.ResourceUnauthorized(
+                username=get_context().username,
+                action=permission,
+                resource_uri=uri,
+            )
+
+
+def preload_resource_permissions(session):
+    """
+    Loads all resource permissions of the user groups into the request cache in a single query.
+    Useful for resolvers that fan out over many resources, subsequent checks are served from memory.
+    """
+    context: RequestContext = get_context()
+    PermissionCache.set_preloaded(
+        context.groups,
+        ResourcePolicy.get_user_resource_permissions(session, context.groups)
     )
 
 
@@ -49,6 +123,7 @@ def has_resource_permission(
     The method or function decorated with this decorator must have a URI of accessing resource
     Good rule of thumb: if there is a URI that accesses a specific resource,
     hence it has URI - it must be decorated with this decorator
+    If the parameter holds a list of URIs, all of them are checked in a single query
     """
     if not param_name:
         param_name = "uri"
@@ -73,7 +148,10 @@ def has_resource_permission(
                     except TypeError:
                         uri = parent_resource.__func__(session, uri)
 
-                _check_resource_permission(session, uri, permission)
+                if isinstance(uri, (list, tuple, set)):
+                    _check_resource_permissions(session, list(uri), permission)
+                else:
+                    _check_resource_permission(session, uri, permission)
 
             return fn(*args, **kwargs)
 
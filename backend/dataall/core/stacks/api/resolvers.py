@@ -6,7 +6,6 @@ from dataall.base.api.context import Context
 from dataall.core.environment.db.environment_models import Environment
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.core.stacks.api import stack_helper
-from dataall.core.stacks.aws.cloudformation import CloudFormation
 from dataall.core.stacks.aws.cloudwatch import CloudWatch
 from dataall.core.stacks.db.stack_models import Stack as StackModel
 from dataall.core.stacks.db.keyvaluetag_repositories import KeyValueTag
@@ -23,8 +22,7 @@ def get_stack(
     with context.engine.scoped_session() as session:
         env: Environment = session.query(Environment).get(environmentUri)
         stack: StackModel = session.query(StackModel).get(stackUri)
-        cfn_task = stack_helper.save_describe_stack_task(session, env, stack, None)
-        CloudFormation.describe_stack_resources(engine=context.engine, task=cfn_task)
+        stack_helper.refresh_stack_status(session, env, stack)
         return EnvironmentService.get_stack(
             session=session,
             uri=environmentUri,
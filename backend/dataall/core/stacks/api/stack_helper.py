@@ -1,4 +1,5 @@
 import os
+from datetime import datetime, timedelta
 
 import requests
 
@@ -6,12 +7,19 @@ from dataall.core.tasks.service_handlers import Worker
 from dataall.base.config import config
 from dataall.base.context import get_context
 from dataall.core.environment.db.environment_models import Environment
+from dataall.core.environment.db.environment_repositories import EnvironmentRepository
 from dataall.core.stacks.aws.ecs import Ecs
 from dataall.core.stacks.db.stack_repositories import Stack
 from dataall.core.stacks.db.stack_models import Stack as StackModel
 from dataall.core.tasks.db.task_models import Task
 from dataall.base.utils import Parameter
 
+DESCRIBE_STACK_ACTION = 'cloudformation.stack.describe_resources'
+# the stack is read from CloudFormation at most once per interval, reads are served from the stack table
+STACK_REFRESH_INTERVAL = int(os.getenv('stack_status_refresh_seconds', '60'))
+# a refresh task that was not processed after this time doesn't prevent queueing a new one
+PENDING_REFRESH_TIMEOUT = 300
+
 
 def get_stack_with_cfn_resources(targetUri: str, environmentUri: str):
     context = get_context()
@@ -33,15 +41,68 @@ def get_stack_with_cfn_resources(targetUri: str, environmentUri: str):
             )
             return stack
 
-        cfn_task = save_describe_stack_task(session, env, stack, targetUri)
-        Worker.queue(engine=context.db_engine, task_ids=[cfn_task.taskUri])
+        refresh_stack_status(session, env, stack, targetUri)
+    return stack
+
+
+def load_stack_with_cfn_resources(loaders, source, target_key: str, environment_key: str = 'environmentUri'):
+    """
+    Same as get_stack_with_cfn_resources for the target `source`, with the stacks and the environments
+    of a list of targets loaded together by the request data loaders
+    """
+    stack: StackModel = loaders.load('stack', source, target_key, Stack.find_stacks_by_target_uris)
+    env: Environment = loaders.load(
+        'environment', source, environment_key, EnvironmentRepository.get_environments_by_uris
+    )
+    if not stack:
+        return StackModel(
+            stack='environment',
+            payload={},
+            targetUri=getattr(source, target_key),
+            accountid=env.AwsAccountId if env else 'UNKNOWN',
+            region=env.region if env else 'UNKNOWN',
+            resources=str({}),
+            error=str({}),
+            outputs=str({}),
+        )
+
+    with get_context().db_engine.scoped_session() as session:
+        refresh_stack_status(session, env, stack, getattr(source, target_key))
     return stack
 
 
+def refresh_stack_status(session, environment, stack, target_uri=None):
+    """
+    Queues a background refresh of the stack from CloudFormation.
+    Nothing is queued if the stack was refreshed recently or if a refresh of the stack is already queued
+    """
+    now = datetime.now()
+    if stack.refreshed and now - stack.refreshed < timedelta(seconds=STACK_REFRESH_INTERVAL):
+        return None
+
+    queued = (
+        session.query(Task)
+        .filter(
+            Task.targetUri == stack.stackUri,
+            Task.action == DESCRIBE_STACK_ACTION,
+            Task.status == 'pending',
+            Task.created > now - timedelta(seconds=PENDING_REFRESH_TIMEOUT),
+        )
+        .first()
+    )
+    if queued:
+        return None
+
+    cfn_task = save_describe_stack_task(session, environment, stack, target_uri)
+    Worker.queue(engine=get_context().db_engine, task_ids=[cfn_task.taskUri])
+    return cfn_task
+
+
 def save_describe_stack_task(session, environment, stack, target_uri):
     cfn_task = Task(
         targetUri=stack.stackUri,
-        action='cloudformation.stack.describe_resources',
+        created=datetime.now(),
+        action=DESCRIBE_STACK_ACTION,
         payload={
             'accountid': environment.AwsAccountId,
             'region': environment.region,
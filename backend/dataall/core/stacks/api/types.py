@@ -22,6 +22,7 @@ Stack = gql.ObjectType(
         gql.Field(name='events', type=gql.String, resolver=resolve_events),
         gql.Field(name='EcsTaskArn', type=gql.String),
         gql.Field(name='EcsTaskId', type=gql.String, resolver=resolve_task_id),
+        gql.Field(name='refreshed', type=gql.String),
     ],
 )
 
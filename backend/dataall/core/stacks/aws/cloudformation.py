@@ -1,5 +1,6 @@
 import logging
 import uuid
+from datetime import datetime
 
 from botocore.exceptions import ClientError
 
@@ -128,6 +129,7 @@ class CloudFormation:
                     )
                 stack.events = {'events': filtered_events}
                 stack.error = None
+                stack.refreshed = datetime.now()
                 session.commit()
         except ClientError as e:
             with engine.scoped_session() as session:
@@ -138,6 +140,7 @@ class CloudFormation:
                     stack.error = {
                         'error': json_utils.to_string(e.response['Error']['Message'])
                     }
+                stack.refreshed = datetime.now()
                 session.commit()
 
     @staticmethod
@@ -93,6 +93,20 @@ class Ecs:
             log.error(e)
             raise e
 
+    @staticmethod
+    def describe_tasks(cluster_name, task_arns) -> dict:
+        """Returns the description of the tasks by arn, describing up to 100 tasks per request"""
+        try:
+            client = boto3.client('ecs')
+            tasks = {}
+            for start in range(0, len(task_arns), 100):
+                response = client.describe_tasks(cluster=cluster_name, tasks=task_arns[start : start + 100])
+                tasks.update({task['taskArn']: task for task in response['tasks']})
+            return tasks
+        except ClientError as e:
+            log.error(e)
+            raise e
+
     @staticmethod
     def is_task_running(cluster_name, started_by):
         try:
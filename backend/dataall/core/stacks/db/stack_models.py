@@ -31,6 +31,10 @@ class Stack(Base):
         DateTime, default=lambda: datetime.datetime(year=1900, month=1, day=1)
     )
     EcsTaskArn = Column(String, nullable=True)
+    # hash of the synthesized templates and assets of the last successful deployment
+    templateHash = Column(String, nullable=True)
+    # last time the status, resources and events were read from CloudFormation
+    refreshed = Column(DateTime, nullable=True)
 
 
 class KeyValueTag(Base):
@@ -31,6 +31,12 @@ class Stack:
         )
         return stack
 
+    @staticmethod
+    def find_stacks_by_target_uris(session, target_uris) -> dict:
+        """Returns the stacks of the targets by target uri, in a single query"""
+        stacks = session.query(models.Stack).filter(models.Stack.targetUri.in_(target_uris)).all()
+        return {stack.targetUri: stack for stack in stacks}
+
     @staticmethod
     def get_stack_by_uri(session, stack_uri):
         stack = Stack.find_stack_by_uri(session, stack_uri)
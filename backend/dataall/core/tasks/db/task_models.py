@@ -17,7 +17,7 @@ class Task(Base):
     status = Column(String, nullable=False, default='pending')
     action = Column(String, nullable=False)
     payload = Column(postgresql.JSON, nullable=True)
-    created = Column(DateTime, default=datetime.datetime.now())
+    created = Column(DateTime, default=datetime.datetime.now)
     updated = Column(DateTime, onupdate=datetime.datetime.now())
     response = Column(postgresql.JSON)
     error = Column(postgresql.JSON)
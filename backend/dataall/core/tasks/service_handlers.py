@@ -1,14 +1,55 @@
+import bisect
+import json
 import logging
 import os
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from functools import wraps
 
+from sqlalchemy import and_, tuple_
+
 from dataall.core.tasks.db.task_models import Task
 from dataall.base.utils.json_utils import to_json
 
 log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
 
+# number of threads running the handlers of a batch of tasks
+MAX_WORKERS = int(os.getenv('worker_max_threads', '4'))
+# a task identical to a pending task queued in this time window is not queued again
+COALESCE_WINDOW = int(os.getenv('task_coalesce_window', '60'))
+
+
+class TaskMetrics:
+    """Histograms of the task handlers latency, by task action"""
+
+    BUCKETS = [0.1, 0.5, 1, 5, 30, 60, 300, float('inf')]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(lambda: [0] * len(TaskMetrics.BUCKETS))
+        self._failures = defaultdict(int)
+
+    def record(self, action, seconds, status):
+        with self._lock:
+            self._histograms[action][bisect.bisect_left(TaskMetrics.BUCKETS, seconds)] += 1
+            if status == 'failed':
+                self._failures[action] += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                action: {
+                    'count': sum(histogram),
+                    'failed': self._failures[action],
+                    'latency': {f'le_{bucket}': count for bucket, count in zip(TaskMetrics.BUCKETS, histogram)},
+                }
+                for action, histogram in self._histograms.items()
+            }
+
 
 class WorkerHandler:
     _instance = None
@@ -22,10 +63,62 @@ class WorkerHandler:
     def __init__(self):
         self.handlers = {}
         self.enabled = True
+        self.metrics = TaskMetrics()
 
     def queue(self, engine, task_ids: [str]):
         log.info(f'Queuing Task Ids: {task_ids}')
 
+    def coalesced(self, send):
+        """Returns a queue function that drops duplicated tasks before sending the others with send"""
+
+        def queue(engine, task_ids: [str]):
+            task_ids = self.coalesce(engine, task_ids)
+            if task_ids:
+                return send(engine, task_ids)
+            return None
+
+        return queue
+
+    @staticmethod
+    def coalesce(engine, task_ids: [str]) -> [str]:
+        """
+        Marks as coalesced the tasks with the same action, target and payload as a pending task
+        created in the last COALESCE_WINDOW seconds. Returns the ids of the tasks to send
+        """
+        if not task_ids:
+            return task_ids
+        with engine.scoped_session() as session:
+            tasks = session.query(Task).filter(Task.taskUri.in_(task_ids)).all()
+            if not tasks:
+                return task_ids
+            pending = (
+                session.query(Task)
+                .filter(
+                    and_(
+                        tuple_(Task.action, Task.targetUri).in_({(t.action, t.targetUri) for t in tasks}),
+                        Task.status == 'pending',
+                        Task.created > datetime.now() - timedelta(seconds=COALESCE_WINDOW),
+                        Task.taskUri.notin_(task_ids),
+                    )
+                )
+                .all()
+            )
+            queued = {}
+            for task in pending:
+                queued.setdefault((task.action, task.targetUri, _payload_key(task.payload)), task)
+
+            coalesced = set()
+            for task in sorted(tasks, key=lambda t: task_ids.index(t.taskUri)):
+                key = (task.action, task.targetUri, _payload_key(task.payload))
+                if key in queued:
+                    log.info(f'Task {task.taskUri} is coalesced with the pending task {queued[key].taskUri}')
+                    task.status = 'coalesced'
+                    task.response = {'coalescedWith': queued[key].taskUri}
+                    coalesced.add(task.taskUri)
+                else:
+                    queued[key] = task
+        return [task_id for task_id in task_ids if task_id not in coalesced]
+
     def handler(self, path):
         def decorator(fn):
             self.handlers[path] = fn
@@ -34,52 +127,83 @@ class WorkerHandler:
         return decorator
 
     def process(self, engine, task_ids: [str], save_response=True):
-        tasks_responses = []
-        if self.enabled:
-            for taskid in task_ids:
-                try:
-                    log.info(f'Processing Task: {taskid}')
-                    handler, task = self.get_task_handler(engine, taskid)
+        """
+        Claims the pending tasks and runs their handlers on a pool of threads.
+        Tasks of the same target are run one after the other, in the order of task_ids
+        """
+        if not self.enabled:
+            log.info(f'Worker disabled, tasks {task_ids} wont be processed')
+            return []
 
-                    error, response, status = self.handle_task(engine, task, handler)
-                    if save_response:
-                        WorkerHandler.update_task(
-                            engine, taskid, error, to_json(response), status
-                        )
-
-                    else:
-                        WorkerHandler.update_task(engine, taskid, error, {}, status)
-                    tasks_responses.append(
-                        {
-                            'taskUri': taskid,
-                            'response': response,
-                            'error': error,
-                            'status': status,
-                        }
-                    )
-                    return tasks_responses
-                except Exception as e:
-                    log.exception('Error in process')
-                    log.error(f'Task processing failed {e} : {taskid}')
+        tasks = self.claim_tasks(engine, task_ids)
+        by_target = defaultdict(list)
+        for task in tasks:
+            by_target[task.targetUri].append(task)
+
+        workers = min(MAX_WORKERS, len(by_target))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(lambda target_tasks: self._run_tasks(engine, target_tasks), by_target.values())
+                tasks_responses = [response for responses in results for response in responses]
         else:
-            log.info(f'Worker disabled, tasks {task_ids} wont be processed')
+            tasks_responses = [
+                response
+                for target_tasks in by_target.values()
+                for response in self._run_tasks(engine, target_tasks, remove_session=False)
+            ]
+
+        WorkerHandler.update_tasks(engine, tasks_responses, save_response)
+        return tasks_responses
 
-    def get_task_handler(self, engine, taskid):
+    def claim_tasks(self, engine, task_ids: [str]) -> [Task]:
+        """Marks the pending tasks as started with a single UPDATE ... RETURNING and returns them"""
+        if not task_ids:
+            return []
         with engine.scoped_session() as session:
-            task = session.query(Task).get(taskid)
-            handler = self.handlers.get(task.action)
-            log.info(
-                f' found handler {handler} for task action {task.action}|{task.taskUri}'
-            )
-            if task.status != 'pending':
-                raise Exception(
-                    f'Could not start task {task.taskUri} as its status is {task.status}'
+            claimed = {
+                row[0]
+                for row in session.execute(
+                    Task.__table__.update()
+                    .where(and_(Task.taskUri.in_(task_ids), Task.status == 'pending'))
+                    .values(status='started')
+                    .returning(Task.taskUri)
                 )
-            if not handler:
-                raise Exception(f'No handler defined for {task.action}')
-            task.status = 'started'
-            session.commit()
-        return handler, task
+            }
+            tasks = session.query(Task).filter(Task.taskUri.in_(list(claimed))).all() if claimed else []
+            for task in tasks:
+                session.expunge(task)
+
+        for taskid in set(task_ids) - claimed:
+            log.error(f'Could not start task {taskid} as it does not exist or is not pending')
+        tasks = sorted(tasks, key=lambda t: task_ids.index(t.taskUri))
+        return tasks
+
+    def _run_tasks(self, engine, tasks: [Task], remove_session=True):
+        responses = []
+        try:
+            for task in tasks:
+                log.info(f'Processing Task: {task.taskUri}')
+                handler = self.handlers.get(task.action)
+                started = time.monotonic()
+                if not handler:
+                    log.error(f'No handler defined for {task.action}')
+                    error, response, status = {'message': f'No handler defined for {task.action}'}, {}, 'failed'
+                else:
+                    error, response, status = self.handle_task(engine, task, handler)
+                self.metrics.record(task.action, time.monotonic() - started, status)
+                responses.append(
+                    {
+                        'taskUri': task.taskUri,
+                        'response': response,
+                        'error': error,
+                        'status': status,
+                    }
+                )
+        finally:
+            if remove_session:
+                # the handlers ran in a thread of the pool, its session is not reused
+                engine.remove_session()
+        return responses
 
     @staticmethod
     def handle_task(engine, task: Task, handler):
@@ -97,14 +221,23 @@ class WorkerHandler:
         return error, response, status
 
     @staticmethod
-    def update_task(engine, taskid, error, response, status):
+    def update_tasks(engine, tasks_responses, save_response=True):
+        """Saves the status of all the processed tasks in one bulk update"""
+        if not tasks_responses:
+            return
         with engine.scoped_session() as session:
-            task = session.query(Task).get(taskid)
-            task.status = status
-            task.error = error
-            task.response = response
-            session.commit()
-            return task
+            session.bulk_update_mappings(
+                Task,
+                [
+                    {
+                        'taskUri': r['taskUri'],
+                        'status': r['status'],
+                        'error': r['error'],
+                        'response': to_json(r['response']) if save_response else {},
+                    }
+                    for r in tasks_responses
+                ],
+            )
 
     @classmethod
     def retry(cls, exception, tries=4, delay=3, backoff=2, logger=None):
@@ -148,3 +281,7 @@ class WorkerHandler:
 
 
 Worker = WorkerHandler.get_instance()
+
+
+def _payload_key(payload):
+    return json.dumps(payload, sort_keys=True, default=str)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+
+from dataall.base.db import Base
+
+
+class CatalogIndexerWatermark(Base):
+    """The high-water mark of the last successful run of the catalog indexer"""
+    __tablename__ = 'catalog_indexer_watermark'
+    name = Column(String, primary_key=True)
+    since = Column(DateTime, nullable=False)
+    lastFullRun = Column(DateTime, nullable=True)
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from dataall.modules.catalog.db.catalog_indexer_models import CatalogIndexerWatermark
+
+CATALOG_WATERMARK = 'catalog'
+
+
+class CatalogIndexerRepository:
+
+    @staticmethod
+    def get_watermark(session) -> CatalogIndexerWatermark:
+        return session.query(CatalogIndexerWatermark).get(CATALOG_WATERMARK)
+
+    @staticmethod
+    def save_watermark(session, started: datetime, full: bool):
+        watermark = CatalogIndexerRepository.get_watermark(session)
+        if not watermark:
+            watermark = CatalogIndexerWatermark(name=CATALOG_WATERMARK, since=started)
+            session.add(watermark)
+
+        watermark.since = started
+        if full:
+            watermark.lastFullRun = started
+        session.commit()
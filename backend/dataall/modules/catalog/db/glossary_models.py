@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, String, DateTime, Enum
+from sqlalchemy import Boolean, Column, String, DateTime, Enum, Index
 from sqlalchemy.orm import query_expression
 
 from dataall.base.db import Base
@@ -51,3 +51,7 @@ class TermLink(Base):
     path = query_expression()
     label = query_expression()
     readme = query_expression()
+
+    __table_args__ = (
+        Index('ix_term_link_targetUri_targetType', 'targetUri', 'targetType'),
+    )
@@ -448,6 +448,22 @@ class GlossaryRepository:
         for link in term_links:
             session.delete(link)
 
+    @staticmethod
+    def list_link_targets_updated_since(session, since) -> [str]:
+        """Used by the catalog indexer to find the resources whose glossary terms changed"""
+        targets = (
+            session.query(TermLink.targetUri)
+            .filter(
+                or_(
+                    TermLink.created > since,
+                    TermLink.updated > since,
+                )
+            )
+            .distinct()
+            .all()
+        )
+        return [target.targetUri for target in targets]
+
     @staticmethod
     def search_glossary_terms(session, data=None):
         q = session.query(GlossaryNode).filter(
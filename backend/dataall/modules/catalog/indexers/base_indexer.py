@@ -1,9 +1,15 @@
+import json
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from operator import and_
+from time import perf_counter
 
+from opensearchpy import helpers
 from sqlalchemy.orm import with_expression
 
 from dataall.modules.catalog.db.glossary_models import GlossaryNode, TermLink
@@ -11,11 +17,91 @@ from dataall.base.searchproxy import connect
 
 log = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = int(os.getenv('index_batch_size', '500'))
+DEFAULT_BATCH_BYTES = int(os.getenv('index_batch_bytes', str(5 * 1024 * 1024)))
+
+
+class BulkIndexer:
+    """
+    Buffers documents and sends them to OpenSearch with _bulk requests.
+    A document that is indexed several times before a flush is sent only once (the last version wins)
+    """
+
+    def __init__(self, es_provider, index: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_bytes: int = DEFAULT_BATCH_BYTES):
+        self._es_provider = es_provider
+        self._index = index
+        self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._pending = {}
+        self._pending_bytes = 0
+        self._indexed_ids = set()
+        self.batches = 0
+        self.documents = 0
+        self.failures = 0
+        self.elapsed = 0.0
+
+    def add(self, doc_id, doc):
+        size = len(json.dumps(doc, default=str))
+        if doc_id in self._pending:
+            self._pending_bytes -= self._pending[doc_id][1]
+        self._pending[doc_id] = (doc, size)
+        self._pending_bytes += size
+        self._indexed_ids.add(doc_id)
+
+        if len(self._pending) >= self._batch_size or self._pending_bytes >= self._max_bytes:
+            self.flush()
+
+    @property
+    def indexed_ids(self) -> set:
+        return self._indexed_ids
+
+    def is_indexed(self, doc_id) -> bool:
+        """Returns True if the document has already been indexed in this run"""
+        return doc_id in self._indexed_ids
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        body = []
+        for doc_id, (doc, _) in self._pending.items():
+            body.append({'index': {'_index': self._index, '_id': doc_id}})
+            body.append(doc)
+        count = len(self._pending)
+        self._pending = {}
+        self._pending_bytes = 0
+
+        start = perf_counter()
+        response = self._es_provider().bulk(body=body)
+        latency = perf_counter() - start
+
+        failed = [
+            item['index'] for item in response.get('items', [])
+            if item.get('index', {}).get('error')
+        ]
+        self.batches += 1
+        self.documents += count
+        self.failures += len(failed)
+        self.elapsed += latency
+        log.info(f'Bulk batch {self.batches}: {count} documents indexed in {latency:.3f} sec, {len(failed)} failed')
+        for item in failed:
+            log.error(f'Failed to index doc {item.get("_id")}: {item.get("error")}')
+
+    def report(self) -> dict:
+        return {
+            'batches': self.batches,
+            'documents': self.documents,
+            'failures': self.failures,
+            'elapsed': round(self.elapsed, 3),
+        }
+
 
 class BaseIndexer(ABC):
     """API to work with OpenSearch"""
     _INDEX = 'dataall-index'
     _es = None
+    _bulk_storage = threading.local()
 
     @classmethod
     def es(cls):
@@ -40,9 +126,68 @@ class BaseIndexer(ABC):
         return True
 
     @classmethod
-    def _index(cls, doc_id, doc):
+    @contextmanager
+    def bulk_indexing(cls, batch_size: int = DEFAULT_BATCH_SIZE, max_bytes: int = DEFAULT_BATCH_BYTES):
+        """
+        Documents indexed inside the context are sent in _bulk requests.
+        Nested contexts reuse the outer one. Yields the BulkIndexer to get the report of the run
+        """
+        running = BaseIndexer._running_bulk()
+        if running is not None:
+            yield running
+            return
+
+        bulk = BulkIndexer(cls.es, cls._INDEX, batch_size, max_bytes)
+        BaseIndexer._bulk_storage.bulk = bulk
+        try:
+            yield bulk
+            bulk.flush()
+        finally:
+            BaseIndexer._bulk_storage.bulk = None
+
+    @staticmethod
+    def _running_bulk():
+        return getattr(BaseIndexer._bulk_storage, 'bulk', None)
+
+    @staticmethod
+    def is_indexed_in_bulk(doc_id) -> bool:
+        """Returns True if the document has already been indexed by the running bulk indexing"""
+        bulk = BaseIndexer._running_bulk()
+        return bulk is not None and bulk.is_indexed(doc_id)
+
+    @classmethod
+    def purge_orphans(cls, started: datetime, indexed_ids: set, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Deletes the documents that a full reindex of the catalog started at started did not index.
+        Documents indexed since started, by the reindex or by the API while it ran, are kept
+        """
         es = cls.es()
+        query = {'query': {'range': {'_indexed': {'lt': started.isoformat()}}}}
+        purged = 0
+        batch = []
+        for hit in helpers.scan(es, index=cls._INDEX, query=query, _source=False):
+            if hit['_id'] in indexed_ids:
+                continue
+            batch.append({'delete': {'_index': cls._INDEX, '_id': hit['_id']}})
+            if len(batch) >= batch_size:
+                es.bulk(body=batch)
+                purged += len(batch)
+                batch = []
+        if batch:
+            es.bulk(body=batch)
+            purged += len(batch)
+        log.info(f'Purged {purged} orphaned documents')
+        return purged
+
+    @classmethod
+    def _index(cls, doc_id, doc):
         doc['_indexed'] = datetime.now()
+        bulk = BaseIndexer._running_bulk()
+        if bulk is not None:
+            bulk.add(doc_id, doc)
+            return True
+
+        es = cls.es()
         if es:
             res = es.index(index=cls._INDEX, id=doc_id, body=doc)
             log.info(f'doc {doc} for id {doc_id} indexed with response {res}')
@@ -71,3 +216,23 @@ class BaseIndexer(ABC):
             )
         )
         return [t.path for t in q]
+
+    @staticmethod
+    def _get_targets_glossary_terms(session, target_uris) -> dict:
+        """Returns the glossary terms of every target in a single query"""
+        q = (
+            session.query(TermLink.targetUri, GlossaryNode.path)
+            .join(
+                GlossaryNode, GlossaryNode.nodeUri == TermLink.nodeUri
+            )
+            .filter(
+                and_(
+                    TermLink.targetUri.in_(target_uris),
+                    TermLink.approvedBySteward.is_(True),
+                )
+            )
+        )
+        terms = defaultdict(list)
+        for target_uri, path in q:
+            terms[target_uri].append(path)
+        return terms
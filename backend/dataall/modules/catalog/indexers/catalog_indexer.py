@@ -1,5 +1,6 @@
 from abc import ABC
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 
 class CatalogIndexer(ABC):
@@ -12,5 +13,10 @@ class CatalogIndexer(ABC):
     def all():
         return CatalogIndexer._INDEXERS
 
-    def index(self, session) -> int:
+    def index(self, session, since: Optional[datetime] = None) -> int:
+        """
+        Indexes the objects of the catalog and returns the number of indexed objects.
+        If since is provided, only the objects that were created or updated (including their glossary terms)
+        after that moment are indexed
+        """
         raise NotImplementedError("index is not implemented")
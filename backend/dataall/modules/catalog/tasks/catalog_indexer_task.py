@@ -1,7 +1,11 @@
 import logging
 import os
 import sys
+from datetime import datetime, timedelta
 
+from dataall.modules.catalog.db.catalog_indexer_models import CatalogIndexerWatermark
+from dataall.modules.catalog.db.catalog_indexer_repositories import CatalogIndexerRepository
+from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
 from dataall.base.db import get_engine
 from dataall.base.loader import load_modules, ImportMode
@@ -13,24 +17,52 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
+FULL_RECONCILE_DAYS = int(os.getenv('catalog_full_reconcile_days', '7'))
 
-def index_objects(engine):
+
+def index_objects(engine, full_reconcile=False):
     try:
+        started = datetime.now()
         indexed_objects_counter = 0
-        with engine.scoped_session() as session:
+        with engine.scoped_session() as session, BaseIndexer.bulk_indexing() as bulk:
+            watermark = CatalogIndexerRepository.get_watermark(session)
+            since = None if full_reconcile else _incremental_since(watermark, started)
+            log.info(f'Indexing objects updated since {since}' if since else 'Running a full reindex of the catalog')
             for indexer in CatalogIndexer.all():
-                indexed_objects_counter += indexer.index(session)
+                indexed_objects_counter += indexer.index(session, since=since)
+
+        log.info(f'Successfully indexed {indexed_objects_counter} objects, bulk report: {bulk.report()}')
 
-            log.info(f'Successfully indexed {indexed_objects_counter} objects')
+        # never wipe the catalog if the run didn't index anything
+        if since is None and bulk.documents:
+            BaseIndexer.purge_orphans(started, bulk.indexed_ids)
+
+        if bulk.failures:
+            # the failed documents are indexed again by the next run, from the same watermark
+            log.error(f'Failed to index {bulk.failures} documents, the watermark is not advanced')
             return indexed_objects_counter
+
+        with engine.scoped_session() as session:
+            CatalogIndexerRepository.save_watermark(session, started, full=since is None)
+        return indexed_objects_counter
     except Exception as e:
         AlarmService().trigger_catalog_indexing_failure_alarm(error=str(e))
         raise e
 
 
+def _incremental_since(watermark: CatalogIndexerWatermark, now: datetime):
+    """Returns the moment to index from or None if a full reindex is needed"""
+    if not watermark or not watermark.lastFullRun:
+        return None
+
+    if now - watermark.lastFullRun > timedelta(days=FULL_RECONCILE_DAYS):
+        return None
+    return watermark.since
+
+
 if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
 
     load_modules({ImportMode.CATALOG_INDEXER_TASK})
-    index_objects(engine=ENGINE)
+    index_objects(engine=ENGINE, full_reconcile=os.environ.get('full_reconcile', 'false').lower() == 'true')
@@ -2,7 +2,7 @@ from dataall.base.api.context import Context
 from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
 from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.modules.vote.db.vote_repositories import VoteRepository
-from dataall.base.db.exceptions import RequiredParameter
+from dataall.base.db.exceptions import RequiredParameter, ObjectNotFound
 from dataall.modules.dashboards.api.enums import DashboardRole
 from dataall.modules.dashboards.db.dashboard_repositories import DashboardRepository
 from dataall.modules.dashboards.db.dashboard_models import Dashboard
@@ -59,8 +59,12 @@ def resolve_user_role(context: Context, source: Dashboard):
 
 
 def get_dashboard_organization(context: Context, source: Dashboard, **kwargs):
-    with context.engine.scoped_session() as session:
-        return OrganizationRepository.get_organization_by_uri(session, source.organizationUri)
+    organization = context.loaders.load(
+        'organization', source, 'organizationUri', OrganizationRepository.find_organizations_by_uris
+    )
+    if not organization:
+        raise ObjectNotFound('Organization', source.organizationUri)
+    return organization
 
 
 def request_dashboard_share(
@@ -112,10 +116,13 @@ def resolve_glossary_terms(context: Context, source: Dashboard, **kwargs):
 
 
 def resolve_upvotes(context: Context, source: Dashboard, **kwargs):
-    with context.engine.scoped_session() as session:
-        return VoteRepository.count_upvotes(
-            session, source.dashboardUri, target_type='dashboard'
-        )
+    return context.loaders.load(
+        'dashboard.upvotes',
+        source,
+        'dashboardUri',
+        lambda session, uris: VoteRepository.count_upvotes_by_target(session, uris, target_type='dashboard'),
+        default=0,
+    )
 
 
 def get_monitoring_dashboard_id(context, source):
@@ -54,6 +54,20 @@ class DashboardRepository(EnvironmentResource):
             raise exceptions.ObjectNotFound('Dashboard', uri)
         return dashboard
 
+    @staticmethod
+    def list_dashboards_updated_since(session, since, target_uris=None) -> [Dashboard]:
+        return (
+            session.query(Dashboard)
+            .filter(
+                or_(
+                    Dashboard.created > since,
+                    Dashboard.updated > since,
+                    Dashboard.dashboardUri.in_(target_uris or []),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def _query_user_dashboards(session, username, groups, filter) -> Query:
         query = (
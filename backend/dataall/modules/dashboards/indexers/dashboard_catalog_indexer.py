@@ -1,7 +1,10 @@
 import logging
+from datetime import datetime
+from typing import Optional
 
+from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
 from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
-from dataall.modules.dashboards import Dashboard
+from dataall.modules.dashboards import Dashboard, DashboardRepository
 from dataall.modules.dashboards.indexers.dashboard_indexer import DashboardIndexer
 
 log = logging.getLogger(__name__)
@@ -9,8 +12,12 @@ log = logging.getLogger(__name__)
 
 class DashboardCatalogIndexer(CatalogIndexer):
 
-    def index(self, session) -> int:
-        all_dashboards: [Dashboard] = session.query(Dashboard).all()
+    def index(self, session, since: Optional[datetime] = None) -> int:
+        if since:
+            linked = GlossaryRepository.list_link_targets_updated_since(session, since)
+            all_dashboards: [Dashboard] = DashboardRepository.list_dashboards_updated_since(session, since, linked)
+        else:
+            all_dashboards: [Dashboard] = session.query(Dashboard).all()
         log.info(f'Found {len(all_dashboards)} dashboards')
         dashboard: Dashboard
         for dashboard in all_dashboards:
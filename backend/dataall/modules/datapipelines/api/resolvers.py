@@ -108,7 +108,4 @@ def resolve_clone_url_http(context: Context, source: DataPipeline, **kwargs):
 def resolve_stack(context, source: DataPipeline, **kwargs):
     if not source:
         return None
-    return stack_helper.get_stack_with_cfn_resources(
-        targetUri=source.DataPipelineUri,
-        environmentUri=source.environmentUri,
-    )
+    return stack_helper.load_stack_with_cfn_resources(context.loaders, source, target_key='DataPipelineUri')
@@ -3,9 +3,10 @@ import logging
 from dataall.base import utils
 from dataall.base.api.context import Context
 from dataall.core.environment.db.environment_models import Environment
+from dataall.core.environment.db.environment_repositories import EnvironmentRepository
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.core.organizations.db.organization_repositories import OrganizationRepository
-from dataall.base.db.exceptions import RequiredParameter
+from dataall.base.db.exceptions import RequiredParameter, ObjectNotFound
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareObjectPermission
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectItem, ShareObject
 from dataall.modules.dataset_sharing.services.share_item_service import ShareItemService
@@ -88,46 +89,46 @@ def get_share_object(context, source, shareUri: str = None):
 def resolve_user_role(context: Context, source: ShareObject, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        dataset: Dataset = DatasetRepository.get_dataset_by_uri(session, source.datasetUri)
+    dataset: Dataset = context.loaders.load('dataset', source, 'datasetUri', DatasetRepository.find_datasets_by_uris)
 
-        can_approve = True if (
-            dataset and (
-                dataset.stewards in context.groups
-                or dataset.SamlAdminGroupName in context.groups
-                or dataset.owner == context.username
-            )
-        ) else False
+    can_approve = True if (
+        dataset and (
+            dataset.stewards in context.groups
+            or dataset.SamlAdminGroupName in context.groups
+            or dataset.owner == context.username
+        )
+    ) else False
 
-        can_request = True if (
-            source.owner == context.username
-            or source.groupUri in context.groups
-        ) else False
+    can_request = True if (
+        source.owner == context.username
+        or source.groupUri in context.groups
+    ) else False
 
-        return (
-            ShareObjectPermission.ApproversAndRequesters.value if can_approve and can_request
-            else ShareObjectPermission.Approvers.value if can_approve
-            else ShareObjectPermission.Requesters.value if can_request
-            else ShareObjectPermission.NoPermission.value)
+    return (
+        ShareObjectPermission.ApproversAndRequesters.value if can_approve and can_request
+        else ShareObjectPermission.Approvers.value if can_approve
+        else ShareObjectPermission.Requesters.value if can_request
+        else ShareObjectPermission.NoPermission.value)
 
 
 def resolve_dataset(context: Context, source: ShareObject, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        ds: Dataset = DatasetRepository.get_dataset_by_uri(session, source.datasetUri)
-        if ds:
-            env: Environment = EnvironmentService.get_environment_by_uri(session, ds.environmentUri)
-            return {
-                'datasetUri': source.datasetUri,
-                'datasetName': ds.name if ds else 'NotFound',
-                'SamlAdminGroupName': ds.SamlAdminGroupName if ds else 'NotFound',
-                'environmentName': env.label if env else 'NotFound',
-                'AwsAccountId': env.AwsAccountId if env else 'NotFound',
-                'region': env.region if env else 'NotFound',
-                'exists': True if ds else False,
-                'description' : ds.description
-            }
+    ds: Dataset = context.loaders.load('dataset', source, 'datasetUri', DatasetRepository.find_datasets_by_uris)
+    if ds:
+        env: Environment = context.loaders.load(
+            'environment', ds, 'environmentUri', EnvironmentRepository.get_environments_by_uris
+        )
+        return {
+            'datasetUri': source.datasetUri,
+            'datasetName': ds.name if ds else 'NotFound',
+            'SamlAdminGroupName': ds.SamlAdminGroupName if ds else 'NotFound',
+            'environmentName': env.label if env else 'NotFound',
+            'AwsAccountId': env.AwsAccountId if env else 'NotFound',
+            'region': env.region if env else 'NotFound',
+            'exists': True if ds else False,
+            'description' : ds.description
+        }
 
 
 def union_resolver(object, *_):
@@ -143,10 +144,16 @@ def resolve_principal(context: Context, source: ShareObject, **kwargs):
 
     with context.engine.scoped_session() as session:
         if source.principalType in ['Group', 'ConsumptionRole']:
-            environment = EnvironmentService.get_environment_by_uri(session, source.environmentUri)
-            organization = OrganizationRepository.get_organization_by_uri(
-                session, environment.organizationUri
+            environment = context.loaders.load(
+                'environment', source, 'environmentUri', EnvironmentRepository.get_environments_by_uris
             )
+            if not environment:
+                raise ObjectNotFound('Environment', source.environmentUri)
+            organization = context.loaders.load(
+                'organization', environment, 'organizationUri', OrganizationRepository.find_organizations_by_uris
+            )
+            if not organization:
+                raise ObjectNotFound('Organization', environment.organizationUri)
             if source.principalType in ['ConsumptionRole']:
                 principal = EnvironmentService.get_environment_consumption_role(
                     session,
@@ -193,7 +200,9 @@ def resolve_consumption_data(context: Context, source: ShareObject, **kwargs):
 def resolve_share_object_statistics(context: Context, source: ShareObject, **kwargs):
     if not source:
         return None
-    return ShareObjectService.resolve_share_object_statistics(uri=source.shareUri)
+    return context.loaders.load(
+        'share.statistics', source, 'shareUri', ShareObjectService.get_share_objects_statistics
+    )
 
 
 def resolve_existing_shared_items(context: Context, source: ShareObject, **kwargs):
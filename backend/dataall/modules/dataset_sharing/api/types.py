@@ -179,6 +179,7 @@ EnvironmentPublishedItem = gql.ObjectType(
     name='EnvironmentPublishedItem',
     fields=[
         gql.Field(name='shareUri', type=gql.NonNullableType(gql.String)),
+        gql.Field(name='shareItemUri', type=gql.String),
         gql.Field(name='datasetUri', type=gql.NonNullableType(gql.String)),
         gql.Field(name='datasetName', type=gql.NonNullableType(gql.String)),
         gql.Field(name='itemAccess', type=gql.NonNullableType(gql.String)),
@@ -204,6 +205,7 @@ EnvironmentPublishedItemSearchResults = gql.ObjectType(
         gql.Field(name='pages', type=gql.Integer),
         gql.Field(name='hasNext', type=gql.Boolean),
         gql.Field(name='hasPrevious', type=gql.Boolean),
+        gql.Field(name='nextCursor', type=gql.String),
         gql.Field(name='nodes', type=gql.ArrayType(EnvironmentPublishedItem)),
     ],
 )
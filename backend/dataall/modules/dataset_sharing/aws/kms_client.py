@@ -11,7 +11,7 @@ class KmsClient:
 
     def __init__(self, account_id: str, region: str):
         session = SessionHelper.remote_session(accountid=account_id)
-        self._client = session.client('kms', region_name=region)
+        self._client = SessionHelper.get_client(session, 'kms', region_name=region)
         self._account_id = account_id
 
     def put_key_policy(self, key_id: str, policy: str):
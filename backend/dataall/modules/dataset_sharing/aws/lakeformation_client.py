@@ -8,13 +8,17 @@ from dataall.base.aws.sts import SessionHelper
 
 log = logging.getLogger('aws:lakeformation')
 
+# maximum number of entries accepted by a single lakeformation:BatchGrantPermissions/BatchRevokePermissions request
+BATCH_MAX_ENTRIES = 20
+
+# revoke errors of permissions that are already revoked
+_ALREADY_REVOKED_MESSAGES = ['Grantee has no permissions', 'No permissions revoked', 'not found']
+
 
 class LakeFormationClient:
     def __init__(self, account_id, region):
         self._session = SessionHelper.remote_session(accountid=account_id)
-        self._client = self._session.client(
-            'lakeformation', region_name=region
-        )
+        self._client = SessionHelper.get_client(self._session, 'lakeformation', region_name=region)
 
     def grant_permissions_to_database(
         self,
@@ -32,63 +36,6 @@ class LakeFormationClient:
         )
         return True
 
-    def grant_permissions_to_table(
-        self,
-        principals,
-        database_name,
-        table_name,
-        catalog_id,
-        permissions,
-        permissions_with_grant_options=None,
-    ) -> True:
-        resource = {
-            'Table': {
-                'DatabaseName': database_name,
-                'Name': table_name,
-                'CatalogId': catalog_id,
-            }
-        }
-        self._grant_permissions_to_resource(
-            principals=principals,
-            resource=resource,
-            permissions=permissions,
-            permissions_with_grant_options=permissions_with_grant_options
-        )
-        return True
-
-    def grant_permissions_to_table_with_columns(
-            self,
-            principals,
-            database_name,
-            table_name,
-            catalog_id,
-            permissions,
-            permissions_with_grant_options=None,
-    ) -> True:
-        resource = {
-            'TableWithColumns': {
-                'DatabaseName': database_name,
-                'Name': table_name,
-                'ColumnWildcard': {},
-                'CatalogId': catalog_id,
-            }
-        }
-        check_resource = {
-            'Table': {
-                'DatabaseName': database_name,
-                'Name': table_name,
-                'CatalogId': catalog_id,
-            }
-        }
-        self._grant_permissions_to_resource(
-            principals=principals,
-            resource=resource,
-            permissions=permissions,
-            permissions_with_grant_options=permissions_with_grant_options,
-            check_resource=check_resource
-        )
-        return True
-
     def _grant_permissions_to_resource(
         self,
         principals: List,
@@ -160,68 +107,101 @@ class LakeFormationClient:
                 raise e
         return True
 
-    def revoke_permissions_to_database(
-        self,
-        principals,
-        database_name,
-        permissions,
-    ) -> True:
-        resource = {
-            'Database': {'Name': database_name},
-        }
-        self._revoke_permissions_from_resource(
-            principals=principals,
-            resource=resource,
-            permissions=permissions
-        )
-        return True
-
-    def revoke_permissions_from_table(
-        self,
-        principals,
+    @staticmethod
+    def table_permissions_entry(
+        entry_id,
+        principal,
         database_name,
         table_name,
         catalog_id,
         permissions,
-        permissions_with_grant_options=None
-    ) -> True:
-        resource = {
-            'Table': {
-                'DatabaseName': database_name,
-                'Name': table_name,
-                'CatalogId': catalog_id,
-            }
+        permissions_with_grant_options=None,
+        with_columns=False,
+    ) -> dict:
+        """Builds an entry of batch_grant_permissions or batch_revoke_permissions on a table"""
+        table = {
+            'DatabaseName': database_name,
+            'Name': table_name,
+            'CatalogId': catalog_id,
         }
-        self._revoke_permissions_from_resource(
-            principals=principals,
-            resource=resource,
-            permissions=permissions,
-            permissions_with_grant_options=permissions_with_grant_options
+        if with_columns:
+            table['ColumnWildcard'] = {}
+        entry = dict(
+            Id=entry_id,
+            Principal={'DataLakePrincipalIdentifier': principal},
+            Resource={'TableWithColumns' if with_columns else 'Table': table},
+            Permissions=permissions,
         )
-        return True
+        if permissions_with_grant_options:
+            entry['PermissionsWithGrantOption'] = permissions_with_grant_options
+        return entry
 
-    def revoke_permissions_from_table_with_columns(
+    def batch_grant_permissions(self, entries: List[dict]) -> dict:
+        """
+        Grants the permissions of the entries, BATCH_MAX_ENTRIES entries per request
+        :return: the error messages of the failed entries by entry id
+        """
+        failures = {}
+        for start in range(0, len(entries), BATCH_MAX_ENTRIES):
+            chunk = entries[start : start + BATCH_MAX_ENTRIES]
+            log.info(f'Granting {len(chunk)} permissions: {[entry["Id"] for entry in chunk]}...')
+            try:
+                response = self._client.batch_grant_permissions(Entries=chunk)
+            except ClientError as e:
+                log.error(f'Could not grant permissions {[entry["Id"] for entry in chunk]} due to: {e}')
+                failures.update({entry['Id']: str(e) for entry in chunk})
+                continue
+            for failure in response.get('Failures', []):
+                error = failure.get('Error', {})
+                log.error(f'Could not grant permissions {failure["RequestEntry"]} due to: {error}')
+                failures[failure['RequestEntry']['Id']] = error.get('ErrorMessage', str(error))
+        if entries:
+            time.sleep(2)
+        return failures
+
+    def batch_revoke_permissions(self, entries: List[dict]) -> dict:
+        """
+        Revokes the permissions of the entries, BATCH_MAX_ENTRIES entries per request.
+        Permissions that are already revoked are not failures
+        :return: the error messages of the failed entries by entry id
+        """
+        failures = {}
+        for start in range(0, len(entries), BATCH_MAX_ENTRIES):
+            chunk = entries[start : start + BATCH_MAX_ENTRIES]
+            log.info(f'Revoking {len(chunk)} permissions: {[entry["Id"] for entry in chunk]}...')
+            try:
+                response = self._client.batch_revoke_permissions(Entries=chunk)
+            except ClientError as e:
+                log.error(f'Could not revoke permissions {[entry["Id"] for entry in chunk]} due to: {e}')
+                failures.update({entry['Id']: str(e) for entry in chunk})
+                continue
+            for failure in response.get('Failures', []):
+                error = failure.get('Error', {})
+                message = error.get('ErrorMessage', '')
+                if error.get('ErrorCode') == 'InvalidInputException' and any(
+                    m in message for m in _ALREADY_REVOKED_MESSAGES
+                ):
+                    log.warning(f'Permissions {failure["RequestEntry"]} are already revoked: {error}')
+                    continue
+                log.error(f'Could not revoke permissions {failure["RequestEntry"]} due to: {error}')
+                failures[failure['RequestEntry']['Id']] = message or str(error)
+        if entries:
+            time.sleep(2)
+        return failures
+
+    def revoke_permissions_to_database(
         self,
         principals,
         database_name,
-        table_name,
-        catalog_id,
         permissions,
-        permissions_with_grant_options=None
     ) -> True:
         resource = {
-            'TableWithColumns': {
-                'DatabaseName': database_name,
-                'Name': table_name,
-                'ColumnWildcard': {},
-                'CatalogId': catalog_id,
-            }
+            'Database': {'Name': database_name},
         }
         self._revoke_permissions_from_resource(
             principals=principals,
             resource=resource,
-            permissions=permissions,
-            permissions_with_grant_options=permissions_with_grant_options
+            permissions=permissions
         )
         return True
 
@@ -263,11 +243,7 @@ class LakeFormationClient:
                 response = error.response
                 if not (
                         response['Error']['Code'] == 'InvalidInputException'
-                        and (
-                            'Grantee has no permissions' in response['Error']['Message']
-                            or 'No permissions revoked' in response['Error']['Message']
-                            or 'not found' in response['Error']['Message']
-                        )
+                        and any(m in response['Error']['Message'] for m in _ALREADY_REVOKED_MESSAGES)
                 ):
                     log.error(
                         f'Failed revoking principal {principal} '
@@ -11,7 +11,7 @@ log = logging.getLogger('aws:ram')
 class RamClient:
     def __init__(self, account_id, region):
         session = SessionHelper.remote_session(accountid=account_id)
-        self._client = session.client('ram', region_name=region)
+        self._client = SessionHelper.get_client(session, 'ram', region_name=region)
         self._account_id = account_id
 
     def _get_resource_share_invitations(
@@ -64,26 +64,34 @@ class RamClient:
                 raise e
 
     @staticmethod
-    def accept_ram_invitation(source_account_id, source_region, target_account_id, target_region, source_database, source_table):
+    def accept_ram_invitations(source_account_id, source_region, target_account_id, target_region, source_database, source_tables):
         """
-        Accepts RAM invitations on the target account
+        Accepts the RAM invitations of the tables of a share on the target account.
+        The invitations of all the tables are listed and accepted at once
+        :return: the names of the tables to share again because their invitation expired or was rejected,
+        and the failed invitations
         """
-        retry_share_table = False
+        retry_share_tables = set()
         failed_invitations = []
 
         if source_account_id == target_account_id:
             log.debug('Skipping RAM invitation management for same account sharing.')
-            return True
+            return [], failed_invitations
 
         source_ram = RamClient(source_account_id, source_region)
         target_ram = RamClient(target_account_id, target_region)
 
-        resource_arn = (
-            f'arn:aws:glue:{source_region}:{source_account_id}:'
-            f'table/{source_database}/{source_table}'
-        )
-        associations = source_ram._list_resource_share_associations(resource_arn)
-        resource_share_arns = [a['resourceShareArn'] for a in associations]
+        tables_by_resource_share = {}
+        for table_name in source_tables:
+            resource_arn = (
+                f'arn:aws:glue:{source_region}:{source_account_id}:'
+                f'table/{source_database}/{table_name}'
+            )
+            for association in source_ram._list_resource_share_associations(resource_arn):
+                tables_by_resource_share.setdefault(association['resourceShareArn'], set()).add(table_name)
+        resource_share_arns = list(tables_by_resource_share)
+        if not resource_share_arns:
+            return [], failed_invitations
 
         ram_invitations = target_ram._get_resource_share_invitations(
             resource_share_arns, source_account_id, target_account_id
@@ -91,6 +99,7 @@ class RamClient:
         log.info(
             f'Found {len(ram_invitations)} RAM invitations for resourceShareArn: {resource_share_arns}'
         )
+        accepted = False
         for invitation in ram_invitations:
             if 'LakeFormation' in invitation['resourceShareName']:
                 if invitation['status'] == 'PENDING':
@@ -100,8 +109,7 @@ class RamClient:
                     target_ram._accept_resource_share_invitation(
                         invitation['resourceShareInvitationArn']
                     )
-                    # Ram invitation acceptance is slow
-                    time.sleep(5)
+                    accepted = True
                 elif (
                     invitation['status'] == 'EXPIRED'
                     or invitation['status'] == 'REJECTED'
@@ -112,7 +120,7 @@ class RamClient:
                         'Deleting the resource share to reset the invitation... '
                     )
                     failed_invitations.append(invitation)
-                    retry_share_table = True
+                    retry_share_tables.update(tables_by_resource_share.get(invitation['resourceShareArn'], []))
                     source_ram._delete_resource_share(
                         resource_share_arn=invitation['resourceShareArn']
                     )
@@ -126,8 +134,11 @@ class RamClient:
                         f'Invitation is in an unknown status adding {invitation["status"]}. '
                         'Adding it to retry share list ...'
                     )
+        if accepted:
+            # Ram invitation acceptance is slow
+            time.sleep(5)
 
-        return retry_share_table, failed_invitations
+        return sorted(retry_share_tables), failed_invitations
 
     def _list_resource_share_associations(self, resource_arn):
         associations = []
@@ -8,7 +8,7 @@ log = logging.getLogger(__name__)
 class S3ControlClient:
     def __init__(self, account_id: str, region: str):
         session = SessionHelper.remote_session(accountid=account_id)
-        self._client = session.client('s3control', region_name=region)
+        self._client = SessionHelper.get_client(session, 's3control', region_name=region)
         self._account_id = account_id
 
     def get_bucket_access_point_arn(self, access_point_name: str):
@@ -170,7 +170,7 @@ class S3ControlClient:
 class S3Client:
     def __init__(self, account_id, region):
         session = SessionHelper.remote_session(accountid=account_id)
-        self._client = session.client('s3', region_name=region)
+        self._client = SessionHelper.get_client(session, 's3', region_name=region)
         self._account_id = account_id
 
     def create_bucket_policy(self, bucket_name: str, policy: str):
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, String, DateTime
+from sqlalchemy import Boolean, Column, String, DateTime, Index
 from sqlalchemy.orm import query_expression
 
 from dataall.base.db import Base, utils
@@ -58,3 +58,18 @@ class ShareObjectItem(Base):
     S3AccessPointName = Column(String, nullable=True)
     status = Column(String, nullable=False, default=ShareItemStatus.PendingApproval.value)
     action = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index('ix_share_object_item_shareUri_status', 'shareUri', 'status'),
+        Index('ix_share_object_item_itemUri_status', 'itemUri', 'status'),
+    )
+
+
+class ShareItemCheckpoint(Base):
+    """A processing step completed for a share item, a failed or interrupted processing resumes after it"""
+    __tablename__ = 'share_object_item_checkpoint'
+    shareItemUri = Column(String, nullable=False, primary_key=True)
+    shareUri = Column(String, nullable=False, index=True)
+    action = Column(String, nullable=False, primary_key=True)
+    step = Column(String, nullable=False, primary_key=True)
+    created = Column(DateTime, default=datetime.now)
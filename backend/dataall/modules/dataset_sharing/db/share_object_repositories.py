@@ -8,12 +8,13 @@ from sqlalchemy.orm import Query
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.core.environment.services.environment_resource_manager import EnvironmentResource
 from dataall.core.organizations.db.organization_models import Organization
-from dataall.base.db import exceptions, paginate
+from dataall.base.db import exceptions, paginate, paginate_by_cursor
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareObjectActions, ShareObjectStatus, ShareItemActions, \
     ShareItemStatus, ShareableType, PrincipalType
-from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectItem, ShareObject
+from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectItem, ShareObject, ShareItemCheckpoint
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
 from dataall.modules.datasets_base.db.dataset_models import DatasetStorageLocation, DatasetTable, Dataset, DatasetBucket
+from dataall.modules.datasets_base.services.datasets_base_enums import DatasetAccessKind
 
 logger = logging.getLogger(__name__)
 
@@ -227,6 +228,19 @@ class ShareItemSM:
                     ShareItemStatus.Revoke_Failed.value: [ShareItemStatus.Revoke_In_Progress.value],
                 }
             ),
+            ShareItemActions.Retry.value: Transition(
+                name=ShareItemActions.Retry.value,
+                transitions={
+                    ShareItemStatus.Share_Approved.value: [
+                        ShareItemStatus.Share_Failed.value,
+                        ShareItemStatus.Share_In_Progress.value
+                    ],
+                    ShareItemStatus.Revoke_Approved.value: [
+                        ShareItemStatus.Revoke_Failed.value,
+                        ShareItemStatus.Revoke_In_Progress.value
+                    ],
+                }
+            ),
             ShareItemActions.RemoveItem.value: Transition(
                 name=ShareItemActions.RemoveItem.value,
                 transitions={
@@ -298,6 +312,20 @@ class ShareItemSM:
         self._state = new_state
         return True
 
+    def update_state_items(self, session, share_uri, item_uris, new_state):
+        """Updates the items of the share with itemUri in item_uris from the current state to new_state"""
+        logger.info(f"Updating {len(item_uris)} share items in DB from {self._state} to state {new_state}")
+        ShareObjectRepository.update_share_item_status_batch(
+            session=session,
+            share_uri=share_uri,
+            old_status=self._state,
+            new_status=new_state,
+            item_uris=item_uris,
+        )
+        session.commit()
+        self._state = new_state
+        return True
+
     @staticmethod
     def get_share_item_shared_states():
         return [
@@ -379,6 +407,7 @@ class ShareObjectRepository:
 
     @staticmethod
     def remove_share_object_item(session, share_item):
+        ShareItemCheckpointRepository.delete_item_checkpoints(session, [share_item.shareItemUri])
         session.delete(share_item)
         return True
 
@@ -422,6 +451,57 @@ class ShareObjectRepository:
             .first()
         )
 
+    @staticmethod
+    def list_share_item_uris(session, share_uri, status) -> List[str]:
+        return [
+            item_uri
+            for item_uri, in session.query(ShareObjectItem.itemUri).filter(
+                and_(
+                    ShareObjectItem.shareUri == share_uri,
+                    ShareObjectItem.status == status,
+                )
+            )
+        ]
+
+    @staticmethod
+    def get_share_item_uris_by_item(session, share_uri) -> dict:
+        """Returns the shareItemUri of the items of the share by itemUri"""
+        return dict(
+            session.query(ShareObjectItem.itemUri, ShareObjectItem.shareItemUri)
+            .filter(ShareObjectItem.shareUri == share_uri)
+            .all()
+        )
+
+    @staticmethod
+    def find_sharable_items(session, share_uri, item_uris) -> List[ShareObjectItem]:
+        if not item_uris:
+            return []
+        return (
+            session.query(ShareObjectItem)
+            .filter(
+                and_(
+                    ShareObjectItem.itemUri.in_(item_uris),
+                    ShareObjectItem.shareUri == share_uri,
+                )
+            )
+            .all()
+        )
+
+    @staticmethod
+    def count_items_by_share(session, share_uris):
+        """Returns the number of items of the shares by share uri, item type and status in a single query"""
+        return (
+            session.query(
+                ShareObjectItem.shareUri,
+                ShareObjectItem.itemType,
+                ShareObjectItem.status,
+                func.count(ShareObjectItem.shareItemUri),
+            )
+            .filter(ShareObjectItem.shareUri.in_(share_uris))
+            .group_by(ShareObjectItem.shareUri, ShareObjectItem.itemType, ShareObjectItem.status)
+            .all()
+        )
+
     @staticmethod
     def count_items_in_states(session, uri, states):
         return (
@@ -700,7 +780,10 @@ class ShareObjectRepository:
     ) -> ShareObjectItem:
 
         share_item = ShareObjectRepository.get_share_item_by_uri(session, uri)
+        changes_access = ShareObjectRepository._changes_dataset_access(share_item.status, status)
         share_item.status = status
+        if changes_access:
+            ShareObjectRepository.update_share_dataset_access(session, share_item.shareUri)
         session.commit()
         return share_item
 
@@ -710,7 +793,7 @@ class ShareObjectRepository:
         share_uri: str,
         status: str,
     ):
-        (
+        items = (
             session.query(ShareObjectItem)
             .filter(
                 and_(
@@ -718,8 +801,13 @@ class ShareObjectRepository:
                     ShareObjectItem.status == status
                 )
             )
-            .delete()
         )
+        ShareItemCheckpointRepository.delete_item_checkpoints(
+            session, items.with_entities(ShareObjectItem.shareItemUri)
+        )
+        items.delete()
+        if status in ShareItemSM.get_share_item_shared_states():
+            ShareObjectRepository.update_share_dataset_access(session, share_uri)
 
     @staticmethod
     def update_share_item_status_batch(
@@ -727,23 +815,68 @@ class ShareObjectRepository:
         share_uri: str,
         old_status: str,
         new_status: str,
+        item_uris: List[str] = None,
     ) -> bool:
+        """Updates the status of the items of the share in old_status, only the items in item_uris if given"""
+        query = session.query(ShareObjectItem).filter(
+            and_(
+                ShareObjectItem.shareUri == share_uri,
+                ShareObjectItem.status == old_status
+            )
+        )
+        if item_uris is not None:
+            if not item_uris:
+                return True
+            query = query.filter(ShareObjectItem.itemUri.in_(item_uris))
+        query.update(
+            {
+                ShareObjectItem.status: new_status,
+            },
+            synchronize_session='fetch' if item_uris is not None else 'evaluate',
+        )
+        if ShareObjectRepository._changes_dataset_access(old_status, new_status):
+            ShareObjectRepository.update_share_dataset_access(session, share_uri)
+        return True
 
-        (
-            session.query(ShareObjectItem)
+    @staticmethod
+    def _changes_dataset_access(old_status, new_status) -> bool:
+        shared_states = ShareItemSM.get_share_item_shared_states()
+        return (old_status in shared_states) != (new_status in shared_states)
+
+    @staticmethod
+    def update_share_dataset_access(session, share_uri):
+        share = ShareObjectRepository.get_share_by_uri(session, share_uri)
+        ShareObjectRepository.update_dataset_share_access(session, share.datasetUri)
+
+    @staticmethod
+    def update_dataset_share_access(session, dataset_uri):
+        """Rebuilds the access to the dataset of the principals and requesters of its shares with shared items"""
+        DatasetRepository.lock_dataset(session, dataset_uri)
+        shares = (
+            session.query(ShareObject.principalId, ShareObject.owner)
+            .join(
+                ShareObjectItem,
+                ShareObjectItem.shareUri == ShareObject.shareUri,
+            )
             .filter(
                 and_(
-                    ShareObjectItem.shareUri == share_uri,
-                    ShareObjectItem.status == old_status
+                    ShareObject.datasetUri == dataset_uri,
+                    ShareObjectItem.status.in_(ShareItemSM.get_share_item_shared_states()),
                 )
             )
-            .update(
-                {
-                    ShareObjectItem.status: new_status,
-                }
-            )
+            .distinct()
+            .all()
+        )
+        accesses = set()
+        for principal_id, owner in shares:
+            accesses.add((principal_id, DatasetAccessKind.Shared.value))
+            accesses.add((owner, DatasetAccessKind.ShareRequester.value))
+        DatasetRepository.replace_dataset_access(
+            session,
+            dataset_uri,
+            accesses,
+            [DatasetAccessKind.Shared.value, DatasetAccessKind.ShareRequester.value],
         )
-        return True
 
     @staticmethod
     def get_share_data(session, share_uri):
@@ -919,7 +1052,21 @@ class ShareObjectRepository:
 
     @staticmethod
     def delete_shares(session, item_uri: str):
-        session.query(ShareObjectItem).filter(ShareObjectItem.itemUri == item_uri).delete()
+        dataset_uris = [
+            share.datasetUri for share in (
+                session.query(ShareObject.datasetUri)
+                .join(ShareObjectItem, ShareObjectItem.shareUri == ShareObject.shareUri)
+                .filter(ShareObjectItem.itemUri == item_uri)
+                .distinct()
+            )
+        ]
+        items = session.query(ShareObjectItem).filter(ShareObjectItem.itemUri == item_uri)
+        ShareItemCheckpointRepository.delete_item_checkpoints(
+            session, items.with_entities(ShareObjectItem.shareItemUri)
+        )
+        items.delete()
+        for dataset_uri in dataset_uris:
+            ShareObjectRepository.update_dataset_share_access(session, dataset_uri)
 
     @staticmethod
     def delete_shares_with_no_shared_items(session, dataset_uri):
@@ -946,6 +1093,7 @@ class ShareObjectRepository:
             )
             for item in share_items:
                 session.delete(item)
+            ShareItemCheckpointRepository.delete_share_checkpoints(session, share.shareUri)
 
             share_obj = (
                 session.query(ShareObject)
@@ -953,33 +1101,19 @@ class ShareObjectRepository:
                 .first()
             )
             session.delete(share_obj)
+        if shares:
+            session.flush()
+            ShareObjectRepository.update_dataset_share_access(session, dataset_uri)
 
     @staticmethod
     def _query_user_datasets(session, username, groups, filter) -> Query:
-        share_item_shared_states = ShareItemSM.get_share_item_shared_states()
         query = (
             session.query(Dataset)
-            .outerjoin(
-                ShareObject,
-                ShareObject.datasetUri == Dataset.datasetUri,
-            )
-            .outerjoin(
-                ShareObjectItem,
-                ShareObjectItem.shareUri == ShareObject.shareUri
-            )
             .filter(
-                or_(
-                    Dataset.owner == username,
-                    Dataset.SamlAdminGroupName.in_(groups),
-                    Dataset.stewards.in_(groups),
-                    and_(
-                        ShareObject.principalId.in_(groups),
-                        ShareObjectItem.status.in_(share_item_shared_states),
-                    ),
-                    and_(
-                        ShareObject.owner == username,
-                        ShareObjectItem.status.in_(share_item_shared_states),
-                    ),
+                Dataset.datasetUri.in_(
+                    DatasetRepository.query_user_dataset_uris(
+                        session, username, groups, [kind.value for kind in DatasetAccessKind]
+                    )
                 )
             )
         )
@@ -990,7 +1124,7 @@ class ShareObjectRepository:
                     Dataset.label.ilike(filter.get('term') + '%%'),
                 )
             )
-        return query.distinct(Dataset.datasetUri)
+        return query.order_by(Dataset.datasetUri)
 
     @staticmethod
     def paginated_user_datasets(
@@ -1093,7 +1227,11 @@ class ShareObjectRepository:
                 .filter(ShareObjectItem.shareUri == share.shareUri)
                 .delete()
             )
+            ShareItemCheckpointRepository.delete_share_checkpoints(session, share.shareUri)
             session.delete(share)
+        session.flush()
+        for dataset_uri in {share.datasetUri for share in env_shared_with_objects}:
+            ShareObjectRepository.update_dataset_share_access(session, dataset_uri)
 
     @staticmethod
     def paginate_shared_datasets(session, env_uri, data):
@@ -1101,6 +1239,7 @@ class ShareObjectRepository:
         q = (
             session.query(
                 ShareObjectItem.shareUri.label('shareUri'),
+                ShareObjectItem.shareItemUri.label('shareItemUri'),
                 Dataset.datasetUri.label('datasetUri'),
                 Dataset.name.label('datasetName'),
                 Dataset.description.label('datasetDescription'),
@@ -1187,6 +1326,20 @@ class ShareObjectRepository:
             term = data.get('term')
             q = q.filter(ShareObjectItem.itemName.ilike('%' + term + '%'))
 
+        if 'cursor' in data:
+            # keyset pagination, the client opts in by sending the cursor (null for the first page).
+            # The unique shares seek on the share only, the DISTINCT ON applies after the seek
+            order_by = [ShareObject.shareUri]
+            if not data.get("uniqueShares", False):
+                order_by.append(ShareObjectItem.shareItemUri)
+            return paginate_by_cursor(
+                query=q,
+                order_by=order_by,
+                page_size=data.get('pageSize', 10),
+                cursor=data.get('cursor'),
+                with_count=data.get('withCount'),
+            ).to_dict()
+
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
         ).to_dict()
@@ -1307,3 +1460,56 @@ class ShareObjectRepository:
             )
             .count()
         )
+
+
+class ShareItemCheckpointRepository:
+    @staticmethod
+    def list_checkpoints(session, share_uri) -> List[ShareItemCheckpoint]:
+        return (
+            session.query(ShareItemCheckpoint)
+            .filter(ShareItemCheckpoint.shareUri == share_uri)
+            .all()
+        )
+
+    @staticmethod
+    def save_checkpoints(session, share_uri, action, step, share_item_uris):
+        session.add_all(
+            [
+                ShareItemCheckpoint(shareItemUri=share_item_uri, shareUri=share_uri, action=action, step=step)
+                for share_item_uri in share_item_uris
+            ]
+        )
+        session.commit()
+
+    @staticmethod
+    def delete_checkpoints(session, action, share_item_uris):
+        if not share_item_uris:
+            return
+        (
+            session.query(ShareItemCheckpoint)
+            .filter(
+                and_(
+                    ShareItemCheckpoint.action == action,
+                    ShareItemCheckpoint.shareItemUri.in_(share_item_uris),
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        session.commit()
+
+    @staticmethod
+    def delete_item_checkpoints(session, share_item_uris):
+        """Deletes the checkpoints of all actions of the share items, share_item_uris can be a query"""
+        (
+            session.query(ShareItemCheckpoint)
+            .filter(ShareItemCheckpoint.shareItemUri.in_(share_item_uris))
+            .delete(synchronize_session=False)
+        )
+
+    @staticmethod
+    def delete_share_checkpoints(session, share_uri):
+        (
+            session.query(ShareItemCheckpoint)
+            .filter(ShareItemCheckpoint.shareUri == share_uri)
+            .delete(synchronize_session=False)
+        )
@@ -1,18 +1,32 @@
 import logging
+import os
+import time
 
 from dataall.base.db import Engine
 from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectSM, ShareObjectRepository, \
     ShareItemSM
+from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
 from dataall.modules.dataset_sharing.services.share_processors.lakeformation_process_share import \
     ProcessLakeFormationShare
 from dataall.modules.dataset_sharing.services.share_processors.s3_access_point_process_share import \
     ProcessS3AccessPointShare
 from dataall.modules.dataset_sharing.services.share_processors.s3_bucket_process_share import ProcessS3BucketShare
 
-from dataall.modules.dataset_sharing.services.dataset_sharing_enums import (ShareObjectActions, ShareItemStatus, ShareableType)
+from dataall.modules.dataset_sharing.services.dataset_sharing_enums import (
+    ShareObjectActions,
+    ShareItemActions,
+    ShareItemStatus,
+    ShareObjectStatus,
+    ShareableType,
+)
 
 log = logging.getLogger(__name__)
 
+# number of times the items of a share are processed, the failed items resume from their last completed step
+MAX_ATTEMPTS = int(os.getenv('share_max_attempts', '3'))
+# seconds before the first retry of the failed items, doubled for every following retry
+RETRY_DELAY = int(os.getenv('share_retry_delay', '10'))
+
 
 class DataSharingService:
     def __init__(self):
@@ -21,12 +35,16 @@ class DataSharingService:
     @classmethod
     def approve_share(cls, engine: Engine, share_uri: str) -> bool:
         """
-        1) Updates share object State Machine with the Action: Start
+        1) Updates share object State Machine with the Action: Start.
+        If the share is still in progress, its previous processing was interrupted and its items in progress
+        are processed again
         2) Retrieves share data and items in Share_Approved state
         3) Calls sharing folders processor to grant share
         4) Calls sharing buckets processor to grant share
         5) Calls sharing tables processor for same or cross account sharing to grant share
-        6) Updates share object State Machine with the Action: Finish
+        6) Retries 2 to 5 for the failed items, at most MAX_ATTEMPTS times.
+        The processors checkpoint the steps completed by the items and skip them on retry
+        7) Updates share object State Machine with the Action: Finish
 
         Parameters
         ----------
@@ -49,72 +67,97 @@ class DataSharingService:
             ) = ShareObjectRepository.get_share_data(session, share_uri)
 
             share_sm = ShareObjectSM(share.status)
+            interrupted = share.status == ShareObjectStatus.Share_In_Progress.value
             new_share_state = share_sm.run_transition(ShareObjectActions.Start.value)
             share_sm.update_state(session, share, new_share_state)
+            if interrupted:
+                log.info(f'Resuming interrupted processing of share {share_uri}')
+                cls._retry_items(session, share_uri, ShareItemStatus.Share_In_Progress.value)
+
+            checkpoints = ShareCheckpoints(session, share_uri)
+            # the steps of a previous revoke of the items are undone by this share
+            checkpoints.clear(
+                ShareCheckpoints.REVOKE,
+                ShareObjectRepository.list_share_item_uris(session, share_uri, ShareItemStatus.Share_Approved.value),
+            )
 
-            (
-                shared_tables,
-                shared_folders,
-                shared_buckets
-            ) = ShareObjectRepository.get_share_data_items(session, share_uri, ShareItemStatus.Share_Approved.value)
-
-        log.info(f'Granting permissions to folders: {shared_folders}')
-
-        approved_folders_succeed = ProcessS3AccessPointShare.process_approved_shares(
-            session,
-            dataset,
-            share,
-            shared_folders,
-            source_environment,
-            target_environment,
-            source_env_group,
-            env_group
-        )
-        log.info(f'sharing folders succeeded = {approved_folders_succeed}')
-
-        log.info('Granting permissions to S3 buckets')
-
-        approved_s3_buckets_succeed = ProcessS3BucketShare.process_approved_shares(
-            session,
-            dataset,
-            share,
-            shared_buckets,
-            source_environment,
-            target_environment,
-            source_env_group,
-            env_group
-        )
-        log.info(f'sharing s3 buckets succeeded = {approved_s3_buckets_succeed}')
-
-        log.info(f'Granting permissions to tables: {shared_tables}')
-        approved_tables_succeed = ProcessLakeFormationShare(
-            session,
-            dataset,
-            share,
-            shared_tables,
-            [],
-            source_environment,
-            target_environment,
-            env_group,
-        ).process_approved_shares()
-        log.info(f'sharing tables succeeded = {approved_tables_succeed}')
-
-        new_share_state = share_sm.run_transition(ShareObjectActions.Finish.value)
-        share_sm.update_state(session, share, new_share_state)
-
-        return approved_folders_succeed and approved_s3_buckets_succeed and approved_tables_succeed
+            def process(last_attempt):
+                (
+                    shared_tables,
+                    shared_folders,
+                    shared_buckets
+                ) = ShareObjectRepository.get_share_data_items(session, share_uri, ShareItemStatus.Share_Approved.value)
+
+                log.info(f'Granting permissions to folders: {shared_folders}')
+
+                approved_folders_succeed = ProcessS3AccessPointShare.process_approved_shares(
+                    session,
+                    dataset,
+                    share,
+                    shared_folders,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
+                )
+                log.info(f'sharing folders succeeded = {approved_folders_succeed}')
+
+                log.info('Granting permissions to S3 buckets')
+
+                approved_s3_buckets_succeed = ProcessS3BucketShare.process_approved_shares(
+                    session,
+                    dataset,
+                    share,
+                    shared_buckets,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
+                )
+                log.info(f'sharing s3 buckets succeeded = {approved_s3_buckets_succeed}')
+
+                log.info(f'Granting permissions to tables: {shared_tables}')
+                approved_tables_succeed = ProcessLakeFormationShare(
+                    session,
+                    dataset,
+                    share,
+                    shared_tables,
+                    [],
+                    source_environment,
+                    target_environment,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
+                ).process_approved_shares()
+                log.info(f'sharing tables succeeded = {approved_tables_succeed}')
+
+                return approved_folders_succeed and approved_s3_buckets_succeed and approved_tables_succeed
+
+            try:
+                return cls._process_with_retries(session, share_uri, ShareItemStatus.Share_Approved.value, process)
+            finally:
+                new_share_state = share_sm.run_transition(ShareObjectActions.Finish.value)
+                share_sm.update_state(session, share, new_share_state)
 
     @classmethod
     def revoke_share(cls, engine: Engine, share_uri: str):
         """
-        1) Updates share object State Machine with the Action: Start
+        1) Updates share object State Machine with the Action: Start.
+        If the share is still in progress, its previous processing was interrupted and its items in progress
+        are processed again
         2) Retrieves share data and items in Revoke_Approved state
         3) Calls sharing folders processor to revoke share
         4) Checks if remaining folders are shared and effectuates clean up with folders processor
         5) Calls sharing tables processor for same or cross account sharing to revoke share
         6) Checks if remaining tables are shared and effectuates clean up with tables processor
         7) Calls sharing buckets processor to revoke share
-        8) Updates share object State Machine with the Action: Finish
+        8) Retries 2 to 7 for the failed items, at most MAX_ATTEMPTS times.
+        The processors checkpoint the steps completed by the items and skip them on retry
+        9) Updates share object State Machine with the Action: Finish
 
         Parameters
         ----------
@@ -138,91 +181,161 @@ class DataSharingService:
             ) = ShareObjectRepository.get_share_data(session, share_uri)
 
             share_sm = ShareObjectSM(share.status)
+            interrupted = share.status == ShareObjectStatus.Revoke_In_Progress.value
             new_share_state = share_sm.run_transition(ShareObjectActions.Start.value)
             share_sm.update_state(session, share, new_share_state)
+            if interrupted:
+                log.info(f'Resuming interrupted processing of share {share_uri}')
+                cls._retry_items(session, share_uri, ShareItemStatus.Revoke_In_Progress.value)
+
+            checkpoints = ShareCheckpoints(session, share_uri)
+            # the steps of a previous share of the items are undone by this revoke
+            checkpoints.clear(
+                ShareCheckpoints.SHARE,
+                ShareObjectRepository.list_share_item_uris(session, share_uri, ShareItemStatus.Revoke_Approved.value),
+            )
 
-            revoked_item_sm = ShareItemSM(ShareItemStatus.Revoke_Approved.value)
+            def process(last_attempt):
+                revoked_item_sm = ShareItemSM(ShareItemStatus.Revoke_Approved.value)
 
-            (
-                revoked_tables,
-                revoked_folders,
-                revoked_buckets
-            ) = ShareObjectRepository.get_share_data_items(session, share_uri, ShareItemStatus.Revoke_Approved.value)
+                (
+                    revoked_tables,
+                    revoked_folders,
+                    revoked_buckets
+                ) = ShareObjectRepository.get_share_data_items(session, share_uri, ShareItemStatus.Revoke_Approved.value)
 
-            new_state = revoked_item_sm.run_transition(ShareObjectActions.Start.value)
-            revoked_item_sm.update_state(session, share_uri, new_state)
+                new_state = revoked_item_sm.run_transition(ShareObjectActions.Start.value)
+                revoked_item_sm.update_state(session, share_uri, new_state)
 
-            log.info(f'Revoking permissions to folders: {revoked_folders}')
+                log.info(f'Revoking permissions to folders: {revoked_folders}')
 
-            revoked_folders_succeed = ProcessS3AccessPointShare.process_revoked_shares(
-                session,
-                dataset,
-                share,
-                revoked_folders,
-                source_environment,
-                target_environment,
-                source_env_group,
-                env_group,
-            )
-            log.info(f'revoking folders succeeded = {revoked_folders_succeed}')
-            existing_shared_folders = ShareObjectRepository.check_existing_shared_items_of_type(
-                session,
-                share_uri,
-                ShareableType.StorageLocation.value
-            )
-            existing_shared_buckets = ShareObjectRepository.check_existing_shared_items_of_type(
-                session,
-                share_uri,
-                ShareableType.S3Bucket.value
-            )
-            existing_shared_items = existing_shared_folders or existing_shared_buckets
-            log.info(f'Still remaining S3 resources shared = {existing_shared_items}')
-            if not existing_shared_folders and revoked_folders:
-                log.info("Clean up S3 access points...")
-                clean_up_folders = ProcessS3AccessPointShare.clean_up_share(
+                revoked_folders_succeed = ProcessS3AccessPointShare.process_revoked_shares(
                     session,
-                    dataset=dataset,
-                    share=share,
-                    folder=revoked_folders[0],
-                    source_environment=source_environment,
-                    target_environment=target_environment,
-                    source_env_group=source_env_group,
-                    env_group=env_group
+                    dataset,
+                    share,
+                    revoked_folders,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
                 )
-                log.info(f"Clean up S3 successful = {clean_up_folders}")
-
-            log.info('Revoking permissions to S3 buckets')
-
-            revoked_s3_buckets_succeed = ProcessS3BucketShare.process_revoked_shares(
-                session,
-                dataset,
-                share,
-                revoked_buckets,
-                source_environment,
-                target_environment,
-                source_env_group,
-                env_group
-            )
-            log.info(f'revoking s3 buckets succeeded = {revoked_s3_buckets_succeed}')
-
-            log.info(f'Revoking permissions to tables: {revoked_tables}')
-            revoked_tables_succeed = ProcessLakeFormationShare(
-                session,
-                dataset,
-                share,
-                [],
-                revoked_tables,
-                source_environment,
-                target_environment,
-                env_group,
-            ).process_revoked_shares()
-            log.info(f'revoking tables succeeded = {revoked_tables_succeed}')
+                log.info(f'revoking folders succeeded = {revoked_folders_succeed}')
+                existing_shared_folders = ShareObjectRepository.check_existing_shared_items_of_type(
+                    session,
+                    share_uri,
+                    ShareableType.StorageLocation.value
+                )
+                existing_shared_buckets = ShareObjectRepository.check_existing_shared_items_of_type(
+                    session,
+                    share_uri,
+                    ShareableType.S3Bucket.value
+                )
+                existing_shared_items = existing_shared_folders or existing_shared_buckets
+                log.info(f'Still remaining S3 resources shared = {existing_shared_items}')
+                if not existing_shared_folders and revoked_folders:
+                    log.info("Clean up S3 access points...")
+                    clean_up_folders = ProcessS3AccessPointShare.clean_up_share(
+                        session,
+                        dataset=dataset,
+                        share=share,
+                        folder=revoked_folders[0],
+                        source_environment=source_environment,
+                        target_environment=target_environment,
+                        source_env_group=source_env_group,
+                        env_group=env_group
+                    )
+                    log.info(f"Clean up S3 successful = {clean_up_folders}")
+
+                log.info('Revoking permissions to S3 buckets')
+
+                revoked_s3_buckets_succeed = ProcessS3BucketShare.process_revoked_shares(
+                    session,
+                    dataset,
+                    share,
+                    revoked_buckets,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
+                )
+                log.info(f'revoking s3 buckets succeeded = {revoked_s3_buckets_succeed}')
 
-            existing_pending_items = ShareObjectRepository.check_pending_share_items(session, share_uri)
-            if existing_pending_items:
-                new_share_state = share_sm.run_transition(ShareObjectActions.FinishPending.value)
-            else:
-                new_share_state = share_sm.run_transition(ShareObjectActions.Finish.value)
-            share_sm.update_state(session, share, new_share_state)
+                log.info(f'Revoking permissions to tables: {revoked_tables}')
+                revoked_tables_succeed = ProcessLakeFormationShare(
+                    session,
+                    dataset,
+                    share,
+                    [],
+                    revoked_tables,
+                    source_environment,
+                    target_environment,
+                    env_group,
+                    checkpoints=checkpoints,
+                    raise_alarms=last_attempt,
+                ).process_revoked_shares()
+                log.info(f'revoking tables succeeded = {revoked_tables_succeed}')
+
+                return revoked_folders_succeed and revoked_s3_buckets_succeed and revoked_tables_succeed
+
+            try:
+                return cls._process_with_retries(session, share_uri, ShareItemStatus.Revoke_Approved.value, process)
+            finally:
+                existing_pending_items = ShareObjectRepository.check_pending_share_items(session, share_uri)
+                if existing_pending_items:
+                    new_share_state = share_sm.run_transition(ShareObjectActions.FinishPending.value)
+                else:
+                    new_share_state = share_sm.run_transition(ShareObjectActions.Finish.value)
+                share_sm.update_state(session, share, new_share_state)
 
-            return revoked_folders_succeed and revoked_s3_buckets_succeed and revoked_tables_succeed
+    @classmethod
+    def _process_with_retries(cls, session, share_uri, approved_state, process) -> bool:
+        """
+        Runs process for the items of the share in approved_state.
+        The items of this run that failed, or that an error left in progress, go back to approved_state
+        and are processed again, at most MAX_ATTEMPTS times with an exponential backoff.
+        Items still in progress after the last attempt are failed, and the error of the last attempt is raised.
+        process is called with True on the last attempt, the processors raise the failure alarms only then
+        """
+        item_uris = ShareObjectRepository.list_share_item_uris(session, share_uri, approved_state)
+        in_progress_state = ShareItemSM(approved_state).run_transition(ShareObjectActions.Start.value)
+        failed_state = ShareItemSM(in_progress_state).run_transition(ShareItemActions.Failure.value)
+
+        error = None
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                if process(attempt == MAX_ATTEMPTS):
+                    return True
+                error = None
+            except Exception as e:
+                log.error(f'Processing of share {share_uri} failed on attempt {attempt} due to: {e}')
+                error = e
+            if attempt == MAX_ATTEMPTS:
+                break
+            delay = RETRY_DELAY * 2 ** (attempt - 1)
+            log.info(f'Retrying the failed items of share {share_uri} in {delay} seconds...')
+            time.sleep(delay)
+            cls._retry_items(session, share_uri, failed_state, item_uris)
+            cls._retry_items(session, share_uri, in_progress_state, item_uris)
+
+        item_SM = ShareItemSM(in_progress_state)
+        item_SM.update_state_items(
+            session, share_uri, item_uris, item_SM.run_transition(ShareItemActions.Failure.value)
+        )
+        if error:
+            raise error
+        return False
+
+    @staticmethod
+    def _retry_items(session, share_uri, state, item_uris=None):
+        """Moves the items of the share in state back to their approved state, only the items in item_uris if given"""
+        item_SM = ShareItemSM(state)
+        new_state = item_SM.run_transition(ShareItemActions.Retry.value)
+        if item_uris is None:
+            item_SM.update_state(session, share_uri, new_state)
+            session.commit()
+        else:
+            item_SM.update_state_items(session, share_uri, item_uris, new_state)
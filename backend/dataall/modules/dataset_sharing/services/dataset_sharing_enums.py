@@ -58,6 +58,7 @@ class ShareItemActions(GraphQLEnumMapper):
     RemoveItem = 'RemoveItem'
     Failure = 'Failure'
     Success = 'Success'
+    Retry = 'Retry'
 
 
 class PrincipalType(GraphQLEnumMapper):
@@ -0,0 +1,71 @@
+import logging
+from collections import defaultdict
+
+from dataall.modules.dataset_sharing.db.share_object_repositories import ShareItemCheckpointRepository, \
+    ShareObjectRepository
+
+log = logging.getLogger(__name__)
+
+
+class ShareCheckpoints:
+    """
+    The processing steps completed by the items of a share.
+    A step is saved once it completed for an item, the processors skip the completed steps of the items when
+    a failed or interrupted share is processed again. The checkpoints of an item are deleted once it succeeded,
+    when the opposite action starts and with the item.
+    The processors refer to the items by itemUri, the checkpoints belong to the share item so that an item removed
+    and added again to the share is processed from the start
+    """
+
+    SHARE = 'share'
+    REVOKE = 'revoke'
+
+    def __init__(self, session, share_uri):
+        self._session = session
+        self._share_uri = share_uri
+        self._share_item_uris = ShareObjectRepository.get_share_item_uris_by_item(session, share_uri)
+        self._completed = defaultdict(set)
+        for checkpoint in ShareItemCheckpointRepository.list_checkpoints(session, share_uri):
+            self._completed[(checkpoint.action, checkpoint.shareItemUri)].add(checkpoint.step)
+
+    def _share_item_uri(self, item_uri):
+        if item_uri not in self._share_item_uris:
+            self._share_item_uris = ShareObjectRepository.get_share_item_uris_by_item(self._session, self._share_uri)
+        return self._share_item_uris.get(item_uri)
+
+    def is_completed(self, action, step, item_uri) -> bool:
+        return step in self._completed[(action, self._share_item_uri(item_uri))]
+
+    def pending(self, action, step, item_uris) -> list:
+        """Returns the item uris for which step did not complete yet"""
+        return [item_uri for item_uri in item_uris if not self.is_completed(action, step, item_uri)]
+
+    def complete(self, action, step, item_uris):
+        item_uris = [item_uri for item_uri in self.pending(action, step, item_uris) if self._share_item_uri(item_uri)]
+        if not item_uris:
+            return
+        log.info(f'Step {action}/{step} completed for items {item_uris} of share {self._share_uri}')
+        share_item_uris = [self._share_item_uri(item_uri) for item_uri in item_uris]
+        ShareItemCheckpointRepository.save_checkpoints(self._session, self._share_uri, action, step, share_item_uris)
+        for share_item_uri in share_item_uris:
+            self._completed[(action, share_item_uri)].add(step)
+
+    def run(self, action, step, item_uris, function):
+        """Runs function, a step common to the items, unless it already completed for all of them"""
+        if not self.pending(action, step, item_uris):
+            log.info(f'Skipping step {action}/{step} already completed for items {item_uris}')
+            return None
+        result = function()
+        self.complete(action, step, item_uris)
+        return result
+
+    def clear(self, action, item_uris):
+        share_item_uris = [
+            share_item_uri for share_item_uri in map(self._share_item_uri, item_uris)
+            if self._completed.get((action, share_item_uri))
+        ]
+        if not share_item_uris:
+            return
+        ShareItemCheckpointRepository.delete_checkpoints(self._session, action, share_item_uris)
+        for share_item_uri in share_item_uris:
+            self._completed.pop((action, share_item_uri), None)
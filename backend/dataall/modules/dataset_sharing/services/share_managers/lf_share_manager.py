@@ -1,12 +1,14 @@
 import abc
 import logging
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from warnings import warn
 
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.modules.dataset_sharing.aws.glue_client import GlueClient
 from dataall.modules.dataset_sharing.aws.lakeformation_client import LakeFormationClient
+from dataall.modules.dataset_sharing.aws.ram_client import RamClient
 from dataall.base.aws.quicksight import QuicksightClient
 from dataall.base.aws.iam import IAM
 from dataall.base.aws.sts import SessionHelper
@@ -17,6 +19,9 @@ from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectIt
 
 logger = logging.getLogger(__name__)
 
+# number of Glue requests, such as resource link creations, sent at the same time for the tables of a share
+MAX_WORKERS = int(os.getenv('lf_share_max_workers', '5'))
+
 
 class LFShareManager:
     def __init__(
@@ -107,30 +112,6 @@ class LFShareManager:
             return old_shared_db_name, False
         return self.dataset.GlueDatabaseName + '_shared', True
 
-    def check_table_exists_in_source_database(
-        self, share_item: ShareObjectItem, table: DatasetTable
-    ) -> True:
-        """
-        Checks if the table to be shared exists on the Glue catalog in the source account
-        :param share_item: request share item
-        :param table: DatasetTable
-        :return: True or raise exceptions.AWSResourceNotFound
-        """
-        glue_client = GlueClient(
-            account_id=self.source_environment.AwsAccountId,
-            region=self.source_environment.region,
-            database=table.GlueDatabaseName,
-        )
-        if not glue_client.table_exists(table.GlueTableName):
-            raise exceptions.AWSResourceNotFound(
-                action='ProcessShare',
-                message=(
-                    f'Share Item {share_item.itemUri} found on share request'
-                    f' but its correspondent Glue table {table.GlueTableName} does not exist.'
-                ),
-            )
-        return True
-
     def check_resource_link_table_exists_in_target_database(
         self, table: DatasetTable
     ) -> bool:
@@ -152,22 +133,6 @@ class LFShareManager:
         )
         return False
 
-    def revoke_iam_allowed_principals_from_table(self, table: DatasetTable) -> True:
-        """
-        Revoke ALL permissions to IAMAllowedPrincipal to the original table in source account.
-        Needed for cross-account permissions. Unless this is revoked the table cannot be shared using LakeFormation
-        :param table: DatasetTable
-        :return: True if it is successful
-        """
-        self.lf_client_in_source.revoke_permissions_from_table(
-            principals=['EVERYONE'],
-            database_name=table.GlueDatabaseName,
-            table_name=table.GlueTableName,
-            catalog_id=self.source_environment.AwsAccountId,
-            permissions=['ALL']
-        )
-        return True
-
     def grant_pivot_role_all_database_permissions_to_source_database(self) -> True:
         """
         Grants 'ALL' Lake Formation permissions to data.all PivotRole to the original database in source account
@@ -214,164 +179,306 @@ class LFShareManager:
         )
         return True
 
-    def grant_target_account_permissions_to_source_table(self, table: DatasetTable) -> True:
+    def revoke_principals_database_permissions_to_shared_database(self) -> True:
         """
-        Grants 'DESCRIBE' 'SELECT' Lake Formation permissions to target account to the original table in source account
-        :param table: DatasetTable
+        Revokes 'DESCRIBE' Lake Formation permissions to share principals to the shared database in target account
+        At the moment there is one single Quicksight group per environment. Permissions for the Quicksight group
+        are removed when the database is deleted.
         :return: True if it is successful
         """
-        self.lf_client_in_source.grant_permissions_to_table(
-            principals=[self.target_environment.AwsAccountId],
-            database_name=table.GlueDatabaseName,
-            table_name=table.GlueTableName,
-            catalog_id=self.source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT'],
-            permissions_with_grant_options=['DESCRIBE', 'SELECT']
+        principals = [p for p in self.principals if "arn:aws:quicksight" not in p]
+
+        self.lf_client_in_target.revoke_permissions_to_database(
+            principals=principals,
+            database_name=self.shared_db_name,
+            permissions=['DESCRIBE'],
         )
-        time.sleep(2)
         return True
 
-    def check_if_exists_and_create_resource_link_table_in_shared_database(self, table: DatasetTable) -> True:
+    def delete_resource_link_table_in_shared_database(self, table: DatasetTable) -> True:
         """
-        Checks if resource link to the source shared Glue table exists in target account
-        Creates a resource link if it does not exist
+        Checks if resource link table from shared database in target account exists
+        Deletes it if it exists
         :param table: DatasetTable
         :return: True if it is successful
         """
+        glue_client = self.glue_client_in_target
+        if not glue_client.table_exists(table.GlueTableName):
+            return True
 
-        if not self.check_resource_link_table_exists_in_target_database(table):
-            self.glue_client_in_target.create_resource_link(
-                resource_link_name=table.GlueTableName,
-                table=table,
-                catalog_id=self.source_environment.AwsAccountId
-            )
+        glue_client.delete_table(table.GlueTableName)
         return True
 
-    def grant_principals_permissions_to_resource_link_table(self, table: DatasetTable) -> True:
+    def delete_shared_database_in_target(self) -> True:
         """
-        Grants 'DESCRIBE' Lake Formation permissions to share principals to the resource link table in target account
-        :param table: DatasetTable
+        Checks if shared database in target account exists
+        Deletes it if it exists
         :return: True if it is successful
         """
-        self.lf_client_in_target.grant_permissions_to_table(
-            principals=self.principals,
-            database_name=self.shared_db_name,
-            table_name=table.GlueTableName,
-            catalog_id=self.target_environment.AwsAccountId,
-            permissions=['DESCRIBE']
-        )
+        logger.info(f'Deleting shared database {self.shared_db_name}')
+        self.glue_client_in_target.delete_database()
         return True
 
-    def grant_principals_permissions_to_table_in_target(self, table: DatasetTable) -> True:
+    def check_tables_exist_in_source_database(self, tables: [DatasetTable]) -> dict:
         """
-        Grants 'DESCRIBE', 'SELECT' Lake Formation permissions to share principals to the table shared in target account
-        :param table: DatasetTable
-        :return: True if it is successful
+        Checks if the tables to be shared exist on the Glue catalog in the source account
+        :param tables: list of DatasetTable
+        :return: exceptions.AWSResourceNotFound of the missing tables by tableUri
         """
-        self.lf_client_in_target.grant_permissions_to_table_with_columns(
-            principals=self.principals,
-            database_name=table.GlueDatabaseName,
-            table_name=table.GlueTableName,
+        glue_client = GlueClient(
+            account_id=self.source_environment.AwsAccountId,
+            region=self.source_environment.region,
+            database=self.dataset.GlueDatabaseName,
+        )
+
+        def check(table):
+            if not glue_client.table_exists(table.GlueTableName):
+                raise exceptions.AWSResourceNotFound(
+                    action='ProcessShare',
+                    message=(
+                        f'Share Item {table.tableUri} found on share request'
+                        f' but its correspondent Glue table {table.GlueTableName} does not exist.'
+                    ),
+                )
+
+        return self._run_for_tables(check, tables)
+
+    def batch_revoke_iam_allowed_principals_from_tables(self, tables: [DatasetTable]) -> dict:
+        """
+        Revoke ALL permissions to IAMAllowedPrincipal to the original tables in source account, in batches
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
+        """
+        return self._batch_table_permissions(
+            self.lf_client_in_source,
+            grant=False,
+            tables=tables,
+            principals=lambda table: ['EVERYONE'],
             catalog_id=self.source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT']
+            permissions=['ALL'],
         )
-        return True
 
-    def revoke_principals_permissions_to_resource_link_table(self, table: DatasetTable) -> True:
+    def batch_grant_target_account_permissions_to_source_tables(self, tables: [DatasetTable]) -> dict:
         """
-        Revokes 'DESCRIBE' Lake Formation permissions to share principals to the resource link table in target account
-        At the moment there is one single Quicksight group per environment. Permissions for the Quicksight group
-        are removed when the resource link table is deleted.
-        :param table: DatasetTable
-        :return: True if it is successful
+        Grants 'DESCRIBE' 'SELECT' Lake Formation permissions to target account to the original tables
+        in source account, in batches
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        principals = [p for p in self.principals if "arn:aws:quicksight" not in p]
+        return self._batch_table_permissions(
+            self.lf_client_in_source,
+            grant=True,
+            tables=tables,
+            principals=lambda table: [self.target_environment.AwsAccountId],
+            catalog_id=self.source_environment.AwsAccountId,
+            permissions=['DESCRIBE', 'SELECT'],
+            permissions_with_grant_options=['DESCRIBE', 'SELECT'],
+        )
 
-        self.lf_client_in_target.revoke_permissions_from_table(
-            principals=principals,
-            database_name=self.shared_db_name,
-            table_name=table.GlueTableName,
-            catalog_id=self.target_environment.AwsAccountId,
-            permissions=['DESCRIBE']
+    def accept_ram_invitations(self, tables: [DatasetTable]) -> [str]:
+        """
+        Accepts the pending RAM invitations of the tables in target account, once for all the tables
+        :param tables: list of DatasetTable
+        :return: names of the tables whose invitation expired or was rejected and that need to be granted again
+        """
+        retry_share_tables, failed_invitations = RamClient.accept_ram_invitations(
+            source_account_id=self.source_environment.AwsAccountId,
+            source_region=self.source_environment.region,
+            target_account_id=self.target_environment.AwsAccountId,
+            target_region=self.target_environment.region,
+            source_database=self.dataset.GlueDatabaseName,
+            source_tables=[table.GlueTableName for table in tables],
         )
-        return True
+        return retry_share_tables
 
-    def revoke_principals_permissions_to_table_in_target(self, table: DatasetTable, other_table_shares_in_env) -> True:
+    def create_resource_link_tables_in_shared_database(self, tables: [DatasetTable]) -> dict:
         """
-        Revokes 'DESCRIBE', 'SELECT' Lake Formation permissions to share principals to the table shared in target account
-        If there are no more shares for this table in the environment then revoke to Quicksight group
-        :param table: DatasetTable
-        :param other_table_shares_in_env: Boolean. Other table shares in this environment for this table
-        :return: True if it is successful
+        Creates the resource links to the source shared Glue tables that do not exist in target account,
+        MAX_WORKERS at the same time
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        principals = self.principals if not other_table_shares_in_env else [p for p in self.principals if "arn:aws:quicksight" not in p]
+        return self._run_for_tables(
+            lambda table: self.glue_client_in_target.create_resource_link(
+                resource_link_name=table.GlueTableName,
+                table=table,
+                catalog_id=self.source_environment.AwsAccountId,
+            ),
+            tables,
+        )
 
-        self.lf_client_in_target.revoke_permissions_from_table_with_columns(
-            principals=principals,
-            database_name=table.GlueDatabaseName,
-            table_name=table.GlueTableName,
+    def batch_grant_principals_permissions_to_tables_in_target(self, tables: [DatasetTable]) -> dict:
+        """
+        Grants 'DESCRIBE', 'SELECT' Lake Formation permissions to share principals to the tables shared
+        in target account, in batches
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
+        """
+        return self._batch_table_permissions(
+            self.lf_client_in_target,
+            grant=True,
+            tables=tables,
+            principals=lambda table: self.principals,
             catalog_id=self.source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT']
+            permissions=['DESCRIBE', 'SELECT'],
+            with_columns=True,
         )
-        return True
 
-    def revoke_principals_database_permissions_to_shared_database(self) -> True:
+    def batch_grant_principals_permissions_to_resource_link_tables(self, tables: [DatasetTable]) -> dict:
         """
-        Revokes 'DESCRIBE' Lake Formation permissions to share principals to the shared database in target account
-        At the moment there is one single Quicksight group per environment. Permissions for the Quicksight group
-        are removed when the database is deleted.
-        :return: True if it is successful
+        Grants 'DESCRIBE' Lake Formation permissions to share principals to the resource link tables
+        in target account, in batches
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        principals = [p for p in self.principals if "arn:aws:quicksight" not in p]
-
-        self.lf_client_in_target.revoke_permissions_to_database(
-            principals=principals,
-            database_name=self.shared_db_name,
+        return self._batch_table_permissions(
+            self.lf_client_in_target,
+            grant=True,
+            tables=tables,
+            principals=lambda table: self.principals,
+            catalog_id=self.target_environment.AwsAccountId,
             permissions=['DESCRIBE'],
+            database_name=self.shared_db_name,
         )
-        return True
 
-    def delete_resource_link_table_in_shared_database(self, table: DatasetTable) -> True:
+    def batch_revoke_principals_permissions_to_resource_link_tables(self, tables: [DatasetTable]) -> dict:
         """
-        Checks if resource link table from shared database in target account exists
-        Deletes it if it exists
-        :param table: DatasetTable
-        :return: True if it is successful
+        Revokes 'DESCRIBE' Lake Formation permissions to share principals to the resource link tables
+        in target account, in batches. Permissions of the Quicksight group are removed with the resource links
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        glue_client = self.glue_client_in_target
-        if not glue_client.table_exists(table.GlueTableName):
-            return True
+        principals = [p for p in self.principals if "arn:aws:quicksight" not in p]
+        return self._batch_table_permissions(
+            self.lf_client_in_target,
+            grant=False,
+            tables=tables,
+            principals=lambda table: principals,
+            catalog_id=self.target_environment.AwsAccountId,
+            permissions=['DESCRIBE'],
+            database_name=self.shared_db_name,
+        )
 
-        glue_client.delete_table(table.GlueTableName)
-        return True
+    def batch_revoke_principals_permissions_to_tables_in_target(
+        self, tables: [DatasetTable], other_table_shares_in_env: dict
+    ) -> dict:
+        """
+        Revokes 'DESCRIBE', 'SELECT' Lake Formation permissions to share principals to the tables shared
+        in target account, in batches.
+        The Quicksight group keeps its permissions to the tables that are shared in other shares of the environment
+        :param tables: list of DatasetTable
+        :param other_table_shares_in_env: Boolean by tableUri. Other table shares in this environment for the table
+        :return: errors by tableUri
+        """
+        principals = [p for p in self.principals if "arn:aws:quicksight" not in p]
+        return self._batch_table_permissions(
+            self.lf_client_in_target,
+            grant=False,
+            tables=tables,
+            principals=lambda table: principals if other_table_shares_in_env.get(table.tableUri) else self.principals,
+            catalog_id=self.source_environment.AwsAccountId,
+            permissions=['DESCRIBE', 'SELECT'],
+            with_columns=True,
+        )
 
-    def delete_shared_database_in_target(self) -> True:
+    def delete_resource_link_tables_in_shared_database(self, tables: [DatasetTable]) -> dict:
         """
-        Checks if shared database in target account exists
-        Deletes it if it exists
-        :return: True if it is successful
+        Deletes the resource link tables that exist in the shared database in target account,
+        MAX_WORKERS at the same time
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        logger.info(f'Deleting shared database {self.shared_db_name}')
-        self.glue_client_in_target.delete_database()
-        return True
+        return self._run_for_tables(self.delete_resource_link_table_in_shared_database, tables)
 
-    def revoke_external_account_access_on_source_account(self, table: DatasetTable) -> True:
+    def batch_revoke_external_account_access_on_source_account(self, tables: [DatasetTable]) -> dict:
         """
-        Revokes 'DESCRIBE' 'SELECT' Lake Formation permissions to target account to the original table in source account
-        If the table is not shared with any other team in the environment,
-        it deletes resource_shares on RAM associated to revoked table
-        :param table: DatasetTable
-        :return: True if it is successful
+        Revokes 'DESCRIBE' 'SELECT' Lake Formation permissions to target account to the original tables
+        in source account, in batches
+        :param tables: list of DatasetTable
+        :return: errors by tableUri
         """
-        self.lf_client_in_source.revoke_permissions_from_table_with_columns(
-            principals=[self.target_environment.AwsAccountId],
-            database_name=table.GlueDatabaseName,
-            table_name=table.GlueTableName,
+        return self._batch_table_permissions(
+            self.lf_client_in_source,
+            grant=False,
+            tables=tables,
+            principals=lambda table: [self.target_environment.AwsAccountId],
             catalog_id=self.source_environment.AwsAccountId,
             permissions=['DESCRIBE', 'SELECT'],
-            permissions_with_grant_options=['DESCRIBE', 'SELECT']
+            permissions_with_grant_options=['DESCRIBE', 'SELECT'],
+            with_columns=True,
         )
-        return True
+
+    @staticmethod
+    def _batch_table_permissions(
+        lf_client: LakeFormationClient,
+        grant: bool,
+        tables: [DatasetTable],
+        principals,
+        catalog_id,
+        permissions,
+        permissions_with_grant_options=None,
+        with_columns=False,
+        database_name=None,
+    ) -> dict:
+        """
+        Grants or revokes the permissions on the tables to principals(table) with batch requests.
+        The tables are looked up in database_name, or in their own Glue database if not given
+        :return: errors by tableUri
+        """
+        entries = []
+        tables_by_entry = {}
+        for i, table in enumerate(tables):
+            for j, principal in enumerate(principals(table)):
+                entry_id = f'{i}-{j}'
+                tables_by_entry[entry_id] = table
+                entries.append(
+                    LakeFormationClient.table_permissions_entry(
+                        entry_id=entry_id,
+                        principal=principal,
+                        database_name=database_name or table.GlueDatabaseName,
+                        table_name=table.GlueTableName,
+                        catalog_id=catalog_id,
+                        permissions=permissions,
+                        permissions_with_grant_options=permissions_with_grant_options,
+                        with_columns=with_columns,
+                    )
+                )
+        if not entries:
+            return {}
+        if grant:
+            failures = lf_client.batch_grant_permissions(entries)
+        else:
+            failures = lf_client.batch_revoke_permissions(entries)
+
+        errors = {}
+        for entry_id, message in failures.items():
+            table = tables_by_entry[entry_id]
+            errors.setdefault(
+                table.tableUri,
+                Exception(
+                    f'Failed to {"grant" if grant else "revoke"} permissions {permissions} '
+                    f'on table {table.GlueTableName} due to: {message}'
+                ),
+            )
+        return errors
+
+    @staticmethod
+    def _run_for_tables(function, tables: [DatasetTable]) -> dict:
+        """
+        Runs function(table) for the tables, MAX_WORKERS at the same time
+        :return: exceptions raised by tableUri
+        """
+        errors = {}
+        if not tables:
+            return errors
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(function, table): table for table in tables}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[futures[future].tableUri] = e
+        return errors
 
     def handle_share_failure(
         self,
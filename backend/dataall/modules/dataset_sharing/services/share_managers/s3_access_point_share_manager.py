@@ -239,10 +239,13 @@ class S3AccessPointShareManager:
             json.dumps(policy),
         )
 
-    def manage_access_point_and_policy(self):
+    def manage_access_point_and_policy(self, s3_prefixes: [str] = None):
         """
+        Creates the access point if needed and grants the requester access to the prefixes of the shared folders,
+        by default the prefix of the target folder, with a single update of the access point policy
         :return:
         """
+        s3_prefixes = s3_prefixes or [self.s3_prefix]
 
         s3_client = S3ControlClient(self.source_account_id, self.source_environment.region)
         access_point_arn = s3_client.get_bucket_access_point_arn(self.access_point_name)
@@ -271,24 +274,19 @@ class S3AccessPointShareManager:
             existing_policy = json.loads(existing_policy)
             statements = {item["Sid"]: item for item in existing_policy["Statement"]}
             if f"{target_requester_id}0" in statements.keys():
-                prefix_list = statements[f"{target_requester_id}0"]["Condition"]["StringLike"]["s3:prefix"]
-                if isinstance(prefix_list, str):
-                    prefix_list = [prefix_list]
-                if f"{self.s3_prefix}/*" not in prefix_list:
-                    prefix_list.append(f"{self.s3_prefix}/*")
-                    statements[f"{target_requester_id}0"]["Condition"]["StringLike"]["s3:prefix"] = prefix_list
-                resource_list = statements[f"{target_requester_id}1"]["Resource"]
-                if isinstance(resource_list, str):
-                    resource_list = [resource_list]
-                if f"{access_point_arn}/object/{self.s3_prefix}/*" not in resource_list:
-                    resource_list.append(f"{access_point_arn}/object/{self.s3_prefix}/*")
-                    statements[f"{target_requester_id}1"]["Resource"] = resource_list
+                self._add_prefixes_to_statements(statements, target_requester_id, access_point_arn, s3_prefixes)
                 existing_policy["Statement"] = list(statements.values())
             else:
                 additional_policy = S3ControlClient.generate_access_point_policy_template(
                     target_requester_id,
                     access_point_arn,
-                    self.s3_prefix,
+                    s3_prefixes[0],
+                )
+                self._add_prefixes_to_statements(
+                    {item["Sid"]: item for item in additional_policy["Statement"]},
+                    target_requester_id,
+                    access_point_arn,
+                    s3_prefixes[1:],
                 )
                 existing_policy["Statement"].extend(additional_policy["Statement"])
             access_point_policy = existing_policy
@@ -300,7 +298,13 @@ class S3AccessPointShareManager:
             access_point_policy = S3ControlClient.generate_access_point_policy_template(
                 target_requester_id,
                 access_point_arn,
-                self.s3_prefix,
+                s3_prefixes[0],
+            )
+            self._add_prefixes_to_statements(
+                {item["Sid"]: item for item in access_point_policy["Statement"]},
+                target_requester_id,
+                access_point_arn,
+                s3_prefixes[1:],
             )
             exceptions_roleId = [f'{item}:*' for item in SessionHelper.get_role_ids(
                 self.source_account_id,
@@ -326,6 +330,22 @@ class S3AccessPointShareManager:
             access_point_name=self.access_point_name, policy=json.dumps(access_point_policy)
         )
 
+    @staticmethod
+    def _add_prefixes_to_statements(statements, target_requester_id, access_point_arn, s3_prefixes):
+        prefix_list = statements[f"{target_requester_id}0"]["Condition"]["StringLike"]["s3:prefix"]
+        if isinstance(prefix_list, str):
+            prefix_list = [prefix_list]
+        resource_list = statements[f"{target_requester_id}1"]["Resource"]
+        if isinstance(resource_list, str):
+            resource_list = [resource_list]
+        for s3_prefix in s3_prefixes:
+            if f"{s3_prefix}/*" not in prefix_list:
+                prefix_list.append(f"{s3_prefix}/*")
+            if f"{access_point_arn}/object/{s3_prefix}/*" not in resource_list:
+                resource_list.append(f"{access_point_arn}/object/{s3_prefix}/*")
+        statements[f"{target_requester_id}0"]["Condition"]["StringLike"]["s3:prefix"] = prefix_list
+        statements[f"{target_requester_id}1"]["Resource"] = resource_list
+
     def update_dataset_bucket_key_policy(self):
         logger.info(
             'Updating dataset Bucket KMS key policy...'
@@ -380,7 +400,9 @@ class S3AccessPointShareManager:
             json.dumps(existing_policy)
         )
 
-    def delete_access_point_policy(self):
+    def delete_access_point_policy(self, s3_prefixes: [str] = None):
+        """Revokes the access to the prefixes, by default the prefix of the target folder, with a single update"""
+        s3_prefixes = s3_prefixes or [self.s3_prefix]
         logger.info(
             f'Deleting access point policy for access point {self.access_point_name}...'
         )
@@ -391,9 +413,11 @@ class S3AccessPointShareManager:
         statements = {item["Sid"]: item for item in access_point_policy["Statement"]}
         if f"{target_requester_id}0" in statements.keys():
             prefix_list = statements[f"{target_requester_id}0"]["Condition"]["StringLike"]["s3:prefix"]
-            if isinstance(prefix_list, list) and f"{self.s3_prefix}/*" in prefix_list:
-                prefix_list.remove(f"{self.s3_prefix}/*")
-                statements[f"{target_requester_id}1"]["Resource"].remove(f"{access_point_arn}/object/{self.s3_prefix}/*")
+            revoked = [p for p in s3_prefixes if isinstance(prefix_list, list) and f"{p}/*" in prefix_list]
+            if revoked and len(revoked) < len(prefix_list):
+                for s3_prefix in revoked:
+                    prefix_list.remove(f"{s3_prefix}/*")
+                    statements[f"{target_requester_id}1"]["Resource"].remove(f"{access_point_arn}/object/{s3_prefix}/*")
                 access_point_policy["Statement"] = list(statements.values())
             else:
                 access_point_policy["Statement"].remove(statements[f"{target_requester_id}0"])
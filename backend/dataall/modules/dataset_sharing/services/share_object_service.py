@@ -14,7 +14,8 @@ from dataall.base.db.exceptions import UnauthorizedOperation
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareObjectActions, ShareableType, ShareItemStatus, \
     ShareObjectStatus, PrincipalType
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectItem, ShareObject
-from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository, ShareObjectSM, ShareItemSM
+from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository, ShareObjectSM, ShareItemSM, \
+    ShareItemCheckpointRepository
 from dataall.modules.dataset_sharing.services.share_exceptions import ShareItemsFound
 from dataall.modules.dataset_sharing.services.share_notification_service import ShareNotificationService
 from dataall.modules.dataset_sharing.services.share_permissions import REJECT_SHARE_OBJECT, APPROVE_SHARE_OBJECT, \
@@ -328,6 +329,7 @@ class ShareObjectService:
                     )
 
                 # Delete share
+                ShareItemCheckpointRepository.delete_share_checkpoints(session, share.shareUri)
                 session.delete(share)
 
             return True
@@ -335,26 +337,36 @@ class ShareObjectService:
     @staticmethod
     def resolve_share_object_statistics(uri):
         with get_context().db_engine.scoped_session() as session:
-            tables = ShareObjectRepository.count_sharable_items(session, uri, 'DatasetTable')
-            locations = ShareObjectRepository.count_sharable_items(session, uri, 'DatasetStorageLocation')
-            shared_items = ShareObjectRepository.count_items_in_states(
-                session, uri, ShareItemSM.get_share_item_shared_states()
-            )
-            revoked_items = ShareObjectRepository.count_items_in_states(
-                session, uri, [ShareItemStatus.Revoke_Succeeded.value]
-            )
-            failed_states = [
-                ShareItemStatus.Share_Failed.value,
-                ShareItemStatus.Revoke_Failed.value
-            ]
-            failed_items = ShareObjectRepository.count_items_in_states(
-                session, uri, failed_states
-            )
-            pending_items = ShareObjectRepository.count_items_in_states(
-                session, uri, [ShareItemStatus.PendingApproval.value]
-            )
-            return {'tables': tables, 'locations': locations, 'sharedItems': shared_items, 'revokedItems': revoked_items,
-                    'failedItems': failed_items, 'pendingItems': pending_items}
+            return ShareObjectService.get_share_objects_statistics(session, [uri])[uri]
+
+    @staticmethod
+    def get_share_objects_statistics(session, uris) -> dict:
+        """Returns the items statistics of the shares by share uri"""
+        shared_states = ShareItemSM.get_share_item_shared_states()
+        failed_states = [
+            ShareItemStatus.Share_Failed.value,
+            ShareItemStatus.Revoke_Failed.value
+        ]
+        statistics = {
+            uri: {'tables': 0, 'locations': 0, 'sharedItems': 0, 'revokedItems': 0, 'failedItems': 0, 'pendingItems': 0}
+            for uri in uris
+        }
+        for share_uri, item_type, status, count in ShareObjectRepository.count_items_by_share(session, uris):
+            share_statistics = statistics[share_uri]
+            if item_type == 'DatasetTable':
+                share_statistics['tables'] += count
+            elif item_type == 'DatasetStorageLocation':
+                share_statistics['locations'] += count
+
+            if status in shared_states:
+                share_statistics['sharedItems'] += count
+            if status == ShareItemStatus.Revoke_Succeeded.value:
+                share_statistics['revokedItems'] += count
+            if status in failed_states:
+                share_statistics['failedItems'] += count
+            if status == ShareItemStatus.PendingApproval.value:
+                share_statistics['pendingItems'] += count
+        return statistics
 
     @staticmethod
     def resolve_share_object_consumption_data(uri, datasetUri, principalId, environmentUri):
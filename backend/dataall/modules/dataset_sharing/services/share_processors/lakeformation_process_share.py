@@ -3,7 +3,7 @@ from warnings import warn
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareObjectActions, ShareItemActions, ShareableType
 from dataall.modules.dataset_sharing.services.share_managers import LFShareManager
-from dataall.modules.dataset_sharing.aws.ram_client import RamClient
+from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
 from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject
 from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository, ShareItemSM
@@ -22,6 +22,8 @@ class ProcessLakeFormationShare(LFShareManager):
         source_environment: Environment,
         target_environment: Environment,
         env_group: EnvironmentGroup,
+        checkpoints: ShareCheckpoints = None,
+        raise_alarms: bool = True,
     ):
         super().__init__(
             session,
@@ -33,23 +35,30 @@ class ProcessLakeFormationShare(LFShareManager):
             target_environment,
             env_group,
         )
+        self.checkpoints = checkpoints or ShareCheckpoints(session, share.shareUri)
+        self.raise_alarms = raise_alarms
 
     def process_approved_shares(self) -> bool:
         """
         1) Grant ALL permissions to pivotRole for source database in source account
         2) Create the shared database in target account if it doesn't exist
         3) Grant permissions to pivotRole and principals to "shared" database
-        4) For each shared table:
-            a) Update its status to SHARE_IN_PROGRESS with Action Start
-            b) Check if table exists on glue catalog raise error if not and flag share item status to failed
+        4) For all the shared tables at once:
+            a) Update their status to SHARE_IN_PROGRESS with Action Start
+            b) Check if the tables exist on glue catalog and flag the share items of missing tables to failed
             c) If it is a cross-account share:
-                c.1) Revoke iamallowedgroups permissions from table
-                c.2) Grant target account permissions to original table -> create RAM invitation
-                c.3) Accept pending RAM invitation
-            d) Create resource link for table in target account
-            e) If it is a cross-account share: grant permission to principals to RAM-shared table in target account
-            f) grant permission to principals to resource link table
-            g) update share item status to SHARE_SUCCESSFUL with Action Success
+                c.1) Revoke iamallowedgroups permissions from tables
+                c.2) Grant target account permissions to original tables -> create RAM invitations
+                c.3) Accept pending RAM invitations, once for all the tables
+            d) Create resource links for tables in target account
+            e) grant permission to principals to RAM-shared tables in target account
+            f) grant permission to principals to resource link tables
+            g) update share items status to SHARE_SUCCESSFUL with Action Success, or SHARE_FAILED for the tables
+            that failed any step
+
+        Lake Formation permissions are granted with batch requests and the resource links are created
+        by a pool of workers. A table that fails a step is skipped by the following steps, and the steps
+        completed by a table are checkpointed so that a retry of a failed table resumes after them.
 
         Returns
         -------
@@ -60,89 +69,54 @@ class ProcessLakeFormationShare(LFShareManager):
         log.info(
             '##### Starting Sharing tables #######'
         )
-        success = True
         if not self.shared_tables:
             log.info("No tables to share. Skipping...")
-        else:
-            self.grant_pivot_role_all_database_permissions_to_source_database()
-            self.check_if_exists_and_create_shared_database_in_target()
-            self.grant_pivot_role_all_database_permissions_to_shared_database()
-            self.grant_principals_database_permissions_to_shared_database()
+            return True
 
-            for table in self.shared_tables:
-                log.info(f"Sharing table {table.GlueTableName}...")
+        self.grant_pivot_role_all_database_permissions_to_source_database()
+        self.check_if_exists_and_create_shared_database_in_target()
+        self.grant_pivot_role_all_database_permissions_to_shared_database()
+        self.grant_principals_database_permissions_to_shared_database()
 
-                share_item = ShareObjectRepository.find_sharable_item(
-                    self.session, self.share.shareUri, table.tableUri
-                )
+        tables, in_progress_state = self._start_items(ShareItemStatus.Share_Approved.value)
+        log.info(f"Sharing tables {[table.GlueTableName for table in tables]}...")
+        errors = {}
+        self._run_step(self.check_tables_exist_in_source_database, tables, errors)
+        steps = []
+        if self.cross_account:
+            steps += [
+                ('iam_allowed_principals_revoke', self.batch_revoke_iam_allowed_principals_from_tables),
+                ('target_account_grant', self.batch_grant_target_account_permissions_to_source_tables),
+                ('ram_invitation', self._accept_ram_invitations),
+            ]
+        steps += [
+            ('resource_link', self.create_resource_link_tables_in_shared_database),
+            ('principals_table_grant', self.batch_grant_principals_permissions_to_tables_in_target),
+            ('principals_resource_link_grant', self.batch_grant_principals_permissions_to_resource_link_tables),
+        ]
+        for name, step in steps:
+            self._run_step(step, tables, errors, checkpoint=(ShareCheckpoints.SHARE, name))
 
-                if not share_item:
-                    log.info(
-                        f'Share Item not found for {self.share.shareUri} '
-                        f'and Dataset Table {table.GlueTableName} continuing loop...'
-                    )
-                    continue
-
-                shared_item_SM = ShareItemSM(ShareItemStatus.Share_Approved.value)
-                new_state = shared_item_SM.run_transition(ShareObjectActions.Start.value)
-                shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-                try:
-                    self.check_table_exists_in_source_database(share_item, table)
-
-                    if self.cross_account:
-                        log.info(f'Processing cross-account permissions for table {table.GlueTableName}...')
-                        self.revoke_iam_allowed_principals_from_table(table)
-                        self.grant_target_account_permissions_to_source_table(table)
-                        (
-                            retry_share_table,
-                            failed_invitations,
-                        ) = RamClient.accept_ram_invitation(
-                            source_account_id=self.source_environment.AwsAccountId,
-                            source_region=self.source_environment.region,
-                            target_account_id=self.target_environment.AwsAccountId,
-                            target_region=self.target_environment.region,
-                            source_database=self.dataset.GlueDatabaseName,
-                            source_table=table
-                        )
-                        if retry_share_table:
-                            self.grant_target_account_permissions_to_source_table(table)
-                            RamClient.accept_ram_invitation(
-                                source_account_id=self.source_environment.AwsAccountId,
-                                source_region=self.source_environment.region,
-                                target_account_id=self.target_environment.AwsAccountId,
-                                target_region=self.target_environment.region,
-                                source_database=self.dataset.GlueDatabaseName,
-                                source_table=table
-                            )
-                    self.check_if_exists_and_create_resource_link_table_in_shared_database(table)
-                    self.grant_principals_permissions_to_table_in_target(table)
-                    self.grant_principals_permissions_to_resource_link_table(table)
-
-                    new_state = shared_item_SM.run_transition(ShareItemActions.Success.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-                except Exception as e:
-                    new_state = shared_item_SM.run_transition(ShareItemActions.Failure.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-                    success = False
-
-                    self.handle_share_failure(table=table, error=e)
+        self._finish_items(in_progress_state, tables, errors)
+        for table in tables:
+            if table.tableUri in errors and self.raise_alarms:
+                self.handle_share_failure(table=table, error=errors[table.tableUri])
 
-        return success
+        return not errors
 
     def process_revoked_shares(self) -> bool:
         """
-        1) For each revoked table:
-            a) Update its status to REVOKE_IN_PROGRESS with Action Start
-            b) Check if table exists on glue catalog raise error if not and flag share item status to failed
-            c) Check if resource link table exists in target account
-            d) Check if the table is shared in other share requests to this target account
-            e) If c is True (resource link table exists), revoke permission to principals to resource link table
-            f) If c is True (resource link table exists), revoke permission to principals to table (and for QS Group if no other shares present for table)
-            g) If c is True and (old-share or (new-share and d is True, no other shares of this table)) then delete resource link table
-            g) If d is True (no other shares of this table with target), revoke permissions to target account to the original table
-            h) update share item status to REVOKE_SUCCESSFUL with Action Success
+        1) For all the revoked tables at once:
+            a) Update their status to REVOKE_IN_PROGRESS with Action Start
+            b) Check if the tables exist on glue catalog and flag the share items of missing tables to failed
+            c) Check if resource link tables exist in target account
+            d) Check if the tables are shared in other share requests to this target account
+            e) For the tables with a resource link, revoke permission to principals to resource link tables
+            f) For the tables with a resource link, revoke permission to principals to tables (and for QS Group if no other shares present for table)
+            g) For the tables with a resource link and (old-share or (new-share and no other shares of this table)) delete resource link tables
+            g) For the tables with no other shares with target, revoke permissions to target account to the original tables
+            h) update share items status to REVOKE_SUCCESSFUL with Action Success, or REVOKE_FAILED for the tables
+            that failed any step
         2) Check if there are existing_shared_tables for this dataset with target environment
         3) If no existing_shared_tables, delete shared database
 
@@ -155,47 +129,8 @@ class ProcessLakeFormationShare(LFShareManager):
             '##### Starting Revoking tables #######'
         )
         success = True
-        for table in self.revoked_tables:
-            share_item = ShareObjectRepository.find_sharable_item(
-                self.session, self.share.shareUri, table.tableUri
-            )
-
-            revoked_item_SM = ShareItemSM(ShareItemStatus.Revoke_Approved.value)
-            new_state = revoked_item_SM.run_transition(ShareObjectActions.Start.value)
-            revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            try:
-                log.info(f'Revoking access to table: {table.GlueTableName} ')
-                self.check_table_exists_in_source_database(share_item, table)
-
-                resource_link_table_exists = self.check_resource_link_table_exists_in_target_database(table)
-                other_table_shares_in_env = True if ShareObjectRepository.other_approved_share_item_table_exists(
-                    self.session,
-                    self.target_environment.environmentUri,
-                    share_item.itemUri,
-                    share_item.shareItemUri
-                ) else False
-
-                if resource_link_table_exists:
-                    self.revoke_principals_permissions_to_resource_link_table(table)
-                    self.revoke_principals_permissions_to_table_in_target(table, other_table_shares_in_env)
-
-                    if (self.is_new_share and not other_table_shares_in_env) or not self.is_new_share:
-                        warn('self.is_new_share will be deprecated in v2.6.0', DeprecationWarning, stacklevel=2)
-                        self.delete_resource_link_table_in_shared_database(table)
-
-                if not other_table_shares_in_env:
-                    self.revoke_external_account_access_on_source_account(table)
-
-                new_state = revoked_item_SM.run_transition(ShareItemActions.Success.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            except Exception as e:
-                new_state = revoked_item_SM.run_transition(ShareItemActions.Failure.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-                success = False
-
-                self.handle_revoke_failure(table=table, error=e)
+        if self.revoked_tables:
+            success = self._revoke_tables()
 
         try:
             if self.revoked_tables:
@@ -239,3 +174,150 @@ class ProcessLakeFormationShare(LFShareManager):
             )
             success = False
         return success
+
+    def _revoke_tables(self) -> bool:
+        tables, in_progress_state = self._start_items(ShareItemStatus.Revoke_Approved.value)
+        log.info(f'Revoking access to tables: {[table.GlueTableName for table in tables]}')
+        errors = {}
+        self._run_step(self.check_tables_exist_in_source_database, tables, errors)
+
+        share_items = {
+            item.itemUri: item
+            for item in ShareObjectRepository.find_sharable_items(
+                self.session, self.share.shareUri, [table.tableUri for table in tables]
+            )
+        }
+        other_table_shares_in_env = {
+            table.tableUri: bool(
+                ShareObjectRepository.other_approved_share_item_table_exists(
+                    self.session,
+                    self.target_environment.environmentUri,
+                    table.tableUri,
+                    share_items[table.tableUri].shareItemUri
+                )
+            )
+            for table in tables
+        }
+        resource_link_tables = []
+
+        def find_resource_link_tables(remaining_tables):
+            def check(table):
+                if self.check_resource_link_table_exists_in_target_database(table):
+                    resource_link_tables.append(table)
+
+            return self._run_for_tables(check, remaining_tables)
+
+        self._run_step(find_resource_link_tables, tables, errors)
+        self._run_step(
+            self.batch_revoke_principals_permissions_to_resource_link_tables,
+            resource_link_tables,
+            errors,
+            checkpoint=(ShareCheckpoints.REVOKE, 'principals_resource_link_revoke'),
+        )
+        self._run_step(
+            lambda remaining_tables: self.batch_revoke_principals_permissions_to_tables_in_target(
+                remaining_tables, other_table_shares_in_env
+            ),
+            resource_link_tables,
+            errors,
+            checkpoint=(ShareCheckpoints.REVOKE, 'principals_table_revoke'),
+        )
+        warn('self.is_new_share will be deprecated in v2.6.0', DeprecationWarning, stacklevel=2)
+        self._run_step(
+            self.delete_resource_link_tables_in_shared_database,
+            [
+                table for table in resource_link_tables
+                if not self.is_new_share or not other_table_shares_in_env[table.tableUri]
+            ],
+            errors,
+            checkpoint=(ShareCheckpoints.REVOKE, 'resource_link_delete'),
+        )
+        self._run_step(
+            self.batch_revoke_external_account_access_on_source_account,
+            [table for table in tables if not other_table_shares_in_env[table.tableUri]],
+            errors,
+            checkpoint=(ShareCheckpoints.REVOKE, 'target_account_revoke'),
+        )
+
+        self._finish_items(in_progress_state, tables, errors)
+        for table in tables:
+            if table.tableUri in errors and self.raise_alarms:
+                self.handle_revoke_failure(table=table, error=errors[table.tableUri])
+        return not errors
+
+    def _start_items(self, status):
+        """
+        Updates the share items of the tables in status to the in progress state with a single update
+        :return: the tables that have a share item, and the in progress state of their share items
+        """
+        tables = self.shared_tables if status == ShareItemStatus.Share_Approved.value else self.revoked_tables
+        item_uris = {
+            item.itemUri
+            for item in ShareObjectRepository.find_sharable_items(
+                self.session, self.share.shareUri, [table.tableUri for table in tables]
+            )
+        }
+        for table in tables:
+            if table.tableUri not in item_uris:
+                log.info(
+                    f'Share Item not found for {self.share.shareUri} '
+                    f'and Dataset Table {table.GlueTableName} continuing loop...'
+                )
+        tables = [table for table in tables if table.tableUri in item_uris]
+
+        item_SM = ShareItemSM(status)
+        new_state = item_SM.run_transition(ShareObjectActions.Start.value)
+        item_SM.update_state_items(self.session, self.share.shareUri, [table.tableUri for table in tables], new_state)
+        return tables, new_state
+
+    def _finish_items(self, in_progress_state, tables, errors):
+        """
+        Updates the share items of the tables with a single update per final state,
+        the checkpoints of the succeeded tables are deleted
+        """
+        succeeded = [table.tableUri for table in tables if table.tableUri not in errors]
+        self.checkpoints.clear(
+            ShareCheckpoints.SHARE if in_progress_state == ShareItemStatus.Share_In_Progress.value else ShareCheckpoints.REVOKE,
+            succeeded,
+        )
+        for action, item_uris in [
+            (ShareItemActions.Failure.value, [table.tableUri for table in tables if table.tableUri in errors]),
+            (ShareItemActions.Success.value, succeeded),
+        ]:
+            item_SM = ShareItemSM(in_progress_state)
+            new_state = item_SM.run_transition(action)
+            item_SM.update_state_items(self.session, self.share.shareUri, item_uris, new_state)
+
+    def _accept_ram_invitations(self, tables) -> dict:
+        """Accepts the RAM invitations of the tables, the tables with an expired or rejected invitation are shared again"""
+        retry_share_tables = self.accept_ram_invitations(tables)
+        if not retry_share_tables:
+            return {}
+        retry_tables = [table for table in tables if table.GlueTableName in retry_share_tables]
+        errors = self.batch_grant_target_account_permissions_to_source_tables(retry_tables)
+        self.accept_ram_invitations([table for table in retry_tables if table.tableUri not in errors])
+        return errors
+
+    def _run_step(self, step, tables, errors, checkpoint=None):
+        """
+        Runs step on the tables that did not fail yet and records the errors by tableUri.
+        If the step raises, all these tables fail with its exception.
+        With a checkpoint (action, name), the tables that already completed the step are skipped
+        and the tables that complete it are checkpointed
+        """
+        remaining_tables = [table for table in tables if table.tableUri not in errors]
+        if checkpoint:
+            pending = set(self.checkpoints.pending(*checkpoint, [table.tableUri for table in remaining_tables]))
+            remaining_tables = [table for table in remaining_tables if table.tableUri in pending]
+        if not remaining_tables:
+            return
+        try:
+            step_errors = step(remaining_tables)
+        except Exception as e:
+            log.error(f'Failed to run {getattr(step, "__name__", step)} for tables due to: {e}')
+            step_errors = {table.tableUri: e for table in remaining_tables}
+        errors.update(step_errors)
+        if checkpoint:
+            self.checkpoints.complete(
+                *checkpoint, [table.tableUri for table in remaining_tables if table.tableUri not in step_errors]
+            )
@@ -2,6 +2,7 @@ import logging
 
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.modules.dataset_sharing.services.share_managers import S3AccessPointShareManager
+from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
 from dataall.modules.datasets_base.db.dataset_models import DatasetStorageLocation, Dataset
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareObjectActions, ShareItemActions
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject
@@ -46,7 +47,9 @@ class ProcessS3AccessPointShare(S3AccessPointShareManager):
         source_environment: Environment,
         target_environment: Environment,
         source_env_group: EnvironmentGroup,
-        env_group: EnvironmentGroup
+        env_group: EnvironmentGroup,
+        checkpoints: ShareCheckpoints = None,
+        raise_alarms: bool = True,
     ) -> bool:
         """
         1) update_share_item_status with Start action
@@ -56,6 +59,11 @@ class ProcessS3AccessPointShare(S3AccessPointShareManager):
         5) update_dataset_bucket_key_policy
         6) update_share_item_status with Finish action
 
+        The bucket policy, the requester role policy and the KMS key policy are the same for all the folders
+        of the share, and the access point policy only differs by the prefixes of the folders.
+        Every policy is computed for all the folders and written once. The policies written are checkpointed,
+        a retry of the failed folders resumes after them.
+
         Returns
         -------
         True if share is granted successfully
@@ -63,49 +71,65 @@ class ProcessS3AccessPointShare(S3AccessPointShareManager):
         log.info(
             '##### Starting Sharing folders #######'
         )
-        success = True
-        for folder in share_folders:
-            log.info(f'sharing folder: {folder}')
-            sharing_item = ShareObjectRepository.find_sharable_item(
-                session,
-                share.shareUri,
-                folder.locationUri,
-            )
-            shared_item_SM = ShareItemSM(ShareItemStatus.Share_Approved.value)
-            new_state = shared_item_SM.run_transition(ShareObjectActions.Start.value)
-            shared_item_SM.update_state_single_item(session, sharing_item, new_state)
+        if not share_folders:
+            return True
 
-            sharing_folder = cls(
-                session,
-                dataset,
-                share,
-                folder,
-                source_environment,
-                target_environment,
-                source_env_group,
-                env_group,
+        items = cls._start_items(session, share, share_folders, ShareItemStatus.Share_Approved.value)
+        sharing_folders = cls(
+            session,
+            dataset,
+            share,
+            share_folders[0],
+            source_environment,
+            target_environment,
+            source_env_group,
+            env_group,
+        )
+        log.info(f'sharing folders: {[folder.S3Prefix for folder in share_folders]}')
+        checkpoints = checkpoints or ShareCheckpoints(session, share.shareUri)
+        item_uris = [folder.locationUri for folder in share_folders]
+        try:
+            checkpoints.run(ShareCheckpoints.SHARE, 'bucket_policy', item_uris, sharing_folders.manage_bucket_policy)
+            checkpoints.run(
+                ShareCheckpoints.SHARE, 'role_policy', item_uris, sharing_folders.grant_target_role_access_policy
             )
+            checkpoints.run(
+                ShareCheckpoints.SHARE,
+                'access_point',
+                item_uris,
+                lambda: sharing_folders.manage_access_point_and_policy(
+                    s3_prefixes=[folder.S3Prefix for folder in share_folders]
+                ),
+            )
+            if not dataset.imported or dataset.importedKmsKey:
+                checkpoints.run(
+                    ShareCheckpoints.SHARE, 'key_policy', item_uris, sharing_folders.update_dataset_bucket_key_policy
+                )
+            checkpoints.clear(ShareCheckpoints.SHARE, item_uris)
+            error = None
+        except Exception as e:
+            error = e
 
-            try:
-                sharing_folder.manage_bucket_policy()
-                sharing_folder.grant_target_role_access_policy()
-                sharing_folder.manage_access_point_and_policy()
-                if not dataset.imported or dataset.importedKmsKey:
-                    sharing_folder.update_dataset_bucket_key_policy()
-
-                new_state = shared_item_SM.run_transition(ShareItemActions.Success.value)
-                shared_item_SM.update_state_single_item(session, sharing_item, new_state)
-
-            except Exception as e:
-                # must run first to ensure state transitions to failed
-                new_state = shared_item_SM.run_transition(ShareItemActions.Failure.value)
-                shared_item_SM.update_state_single_item(session, sharing_item, new_state)
-                success = False
-
+        for folder, sharing_item, shared_item_SM in items:
+            # must run first to ensure state transitions to failed
+            new_state = shared_item_SM.run_transition(
+                ShareItemActions.Failure.value if error else ShareItemActions.Success.value
+            )
+            shared_item_SM.update_state_single_item(session, sharing_item, new_state)
+            if error and raise_alarms:
                 # statements which can throw exceptions but are not critical
-                sharing_folder.handle_share_failure(e)
+                cls(
+                    session,
+                    dataset,
+                    share,
+                    folder,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                ).handle_share_failure(error)
 
-        return success
+        return error is None
 
     @classmethod
     def process_revoked_shares(
@@ -118,12 +142,16 @@ class ProcessS3AccessPointShare(S3AccessPointShareManager):
             target_environment: Environment,
             source_env_group: EnvironmentGroup,
             env_group: EnvironmentGroup,
+            checkpoints: ShareCheckpoints = None,
+            raise_alarms: bool = True,
     ) -> bool:
         """
         1) update_share_item_status with Start action
-        2) delete_access_point_policy for folder
+        2) delete_access_point_policy for all the folders, with a single update of the policy
         3) update_share_item_status with Finish action
 
+        The policy update is checkpointed, a retry of the failed folders resumes after it.
+
         Returns
         -------
         True if share is revoked successfully
@@ -132,46 +160,73 @@ class ProcessS3AccessPointShare(S3AccessPointShareManager):
         log.info(
             '##### Starting Revoking folders #######'
         )
-        success = True
-        for folder in revoke_folders:
-            log.info(f'revoking access to folder: {folder}')
-            removing_item = ShareObjectRepository.find_sharable_item(
-                session,
-                share.shareUri,
-                folder.locationUri,
+        if not revoke_folders:
+            return True
+
+        items = cls._start_items(session, share, revoke_folders, ShareItemStatus.Revoke_Approved.value)
+        removing_folders = cls(
+            session,
+            dataset,
+            share,
+            revoke_folders[0],
+            source_environment,
+            target_environment,
+            source_env_group,
+            env_group,
+        )
+        log.info(f'revoking access to folders: {[folder.S3Prefix for folder in revoke_folders]}')
+        checkpoints = checkpoints or ShareCheckpoints(session, share.shareUri)
+        item_uris = [folder.locationUri for folder in revoke_folders]
+        try:
+            checkpoints.run(
+                ShareCheckpoints.REVOKE,
+                'access_point_policy',
+                item_uris,
+                lambda: removing_folders.delete_access_point_policy(
+                    s3_prefixes=[folder.S3Prefix for folder in revoke_folders]
+                ),
             )
+            checkpoints.clear(ShareCheckpoints.REVOKE, item_uris)
+            error = None
+        except Exception as e:
+            error = e
 
-            revoked_item_SM = ShareItemSM(ShareItemStatus.Revoke_Approved.value)
-            new_state = revoked_item_SM.run_transition(ShareObjectActions.Start.value)
+        for folder, removing_item, revoked_item_SM in items:
+            # must run first to ensure state transitions to failed
+            new_state = revoked_item_SM.run_transition(
+                ShareItemActions.Failure.value if error else ShareItemActions.Success.value
+            )
             revoked_item_SM.update_state_single_item(session, removing_item, new_state)
+            if error and raise_alarms:
+                # statements which can throw exceptions but are not critical
+                cls(
+                    session,
+                    dataset,
+                    share,
+                    folder,
+                    source_environment,
+                    target_environment,
+                    source_env_group,
+                    env_group,
+                ).handle_revoke_failure(error)
+
+        return error is None
 
-            removing_folder = cls(
+    @staticmethod
+    def _start_items(session, share: ShareObject, folders: [DatasetStorageLocation], status: str):
+        """Moves the share items of the folders to their in progress state"""
+        items = []
+        for folder in folders:
+            item = ShareObjectRepository.find_sharable_item(
                 session,
-                dataset,
-                share,
-                folder,
-                source_environment,
-                target_environment,
-                source_env_group,
-                env_group,
+                share.shareUri,
+                folder.locationUri,
             )
-
-            try:
-                removing_folder.delete_access_point_policy()
-
-                new_state = revoked_item_SM.run_transition(ShareItemActions.Success.value)
-                revoked_item_SM.update_state_single_item(session, removing_item, new_state)
-
-            except Exception as e:
-                # must run first to ensure state transitions to failed
-                new_state = revoked_item_SM.run_transition(ShareItemActions.Failure.value)
-                revoked_item_SM.update_state_single_item(session, removing_item, new_state)
-                success = False
-
-                # statements which can throw exceptions but are not critical
-                removing_folder.handle_revoke_failure(e)
-
-        return success
+            item_SM = ShareItemSM(status)
+            new_state = item_SM.run_transition(ShareObjectActions.Start.value)
+            item_SM.update_state_single_item(session, item, new_state)
+            items.append((folder, item, item_SM))
+        return items
 
     @classmethod
     def clean_up_share(
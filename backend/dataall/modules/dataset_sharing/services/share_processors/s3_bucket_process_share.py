@@ -2,6 +2,7 @@ import logging
 
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.modules.dataset_sharing.services.share_managers import S3BucketShareManager
+from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
 from dataall.modules.datasets_base.db.dataset_models import Dataset, DatasetBucket
 from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareObjectActions, ShareItemActions
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject
@@ -45,7 +46,9 @@ class ProcessS3BucketShare(S3BucketShareManager):
         source_environment: Environment,
         target_environment: Environment,
         source_env_group: EnvironmentGroup,
-        env_group: EnvironmentGroup
+        env_group: EnvironmentGroup,
+        checkpoints: ShareCheckpoints = None,
+        raise_alarms: bool = True,
     ) -> bool:
         """
         1) update_share_item_status with Start action
@@ -54,6 +57,8 @@ class ProcessS3BucketShare(S3BucketShareManager):
         4) update_dataset_bucket_key_policy == done
         5) update_share_item_status with Finish action == done
 
+        Steps 2 to 4 are checkpointed, a retry of a failed bucket resumes after the completed steps
+
         Returns
         -------
         True if share is granted successfully
@@ -62,6 +67,7 @@ class ProcessS3BucketShare(S3BucketShareManager):
             '##### Starting S3 bucket share #######'
         )
         success = True
+        checkpoints = checkpoints or ShareCheckpoints(session, share.shareUri)
         for shared_bucket in shared_buckets:
             sharing_item = ShareObjectRepository.find_sharable_item(
                 session,
@@ -82,11 +88,17 @@ class ProcessS3BucketShare(S3BucketShareManager):
                 source_env_group,
                 env_group
             )
+            item_uris = [shared_bucket.bucketUri]
             try:
-                sharing_bucket.grant_role_bucket_policy()
-                sharing_bucket.grant_s3_iam_access()
+                checkpoints.run(
+                    ShareCheckpoints.SHARE, 'bucket_policy', item_uris, sharing_bucket.grant_role_bucket_policy
+                )
+                checkpoints.run(ShareCheckpoints.SHARE, 'role_policy', item_uris, sharing_bucket.grant_s3_iam_access)
                 if not dataset.imported or dataset.importedKmsKey:
-                    sharing_bucket.grant_dataset_bucket_key_policy()
+                    checkpoints.run(
+                        ShareCheckpoints.SHARE, 'key_policy', item_uris, sharing_bucket.grant_dataset_bucket_key_policy
+                    )
+                checkpoints.clear(ShareCheckpoints.SHARE, item_uris)
                 new_state = shared_item_SM.run_transition(ShareItemActions.Success.value)
                 shared_item_SM.update_state_single_item(session, sharing_item, new_state)
 
@@ -97,7 +109,8 @@ class ProcessS3BucketShare(S3BucketShareManager):
                 success = False
 
                 # statements which can throw exceptions but are not critical
-                sharing_bucket.handle_share_failure(e)
+                if raise_alarms:
+                    sharing_bucket.handle_share_failure(e)
 
         return success
 
@@ -112,6 +125,8 @@ class ProcessS3BucketShare(S3BucketShareManager):
             target_environment: Environment,
             source_env_group: EnvironmentGroup,
             env_group: EnvironmentGroup,
+            checkpoints: ShareCheckpoints = None,
+            raise_alarms: bool = True,
     ) -> bool:
         """
         1) update_share_item_status with Start action
@@ -120,6 +135,8 @@ class ProcessS3BucketShare(S3BucketShareManager):
         4) remove access from IAM role policy
         5) update_share_item_status with Finish action
 
+        Steps 2 to 4 are checkpointed, a retry of a failed bucket resumes after the completed steps
+
         Returns
         -------
         True if share is revoked successfully
@@ -130,6 +147,7 @@ class ProcessS3BucketShare(S3BucketShareManager):
             '##### Starting Revoking S3 bucket share #######'
         )
         success = True
+        checkpoints = checkpoints or ShareCheckpoints(session, share.shareUri)
         for revoked_bucket in revoked_buckets:
             removing_item = ShareObjectRepository.find_sharable_item(
                 session,
@@ -150,17 +168,31 @@ class ProcessS3BucketShare(S3BucketShareManager):
                 source_env_group,
                 env_group
             )
+            item_uris = [revoked_bucket.bucketUri]
             try:
-                removing_bucket.delete_target_role_bucket_policy()
-                removing_bucket.delete_target_role_access_policy(
-                    share=share,
-                    target_bucket=revoked_bucket,
-                    target_environment=target_environment
+                checkpoints.run(
+                    ShareCheckpoints.REVOKE, 'bucket_policy', item_uris, removing_bucket.delete_target_role_bucket_policy
                 )
-                if not dataset.imported or dataset.importedKmsKey:
-                    removing_bucket.delete_target_role_bucket_key_policy(
+                checkpoints.run(
+                    ShareCheckpoints.REVOKE,
+                    'role_policy',
+                    item_uris,
+                    lambda: removing_bucket.delete_target_role_access_policy(
+                        share=share,
                         target_bucket=revoked_bucket,
+                        target_environment=target_environment
+                    ),
+                )
+                if not dataset.imported or dataset.importedKmsKey:
+                    checkpoints.run(
+                        ShareCheckpoints.REVOKE,
+                        'key_policy',
+                        item_uris,
+                        lambda: removing_bucket.delete_target_role_bucket_key_policy(
+                            target_bucket=revoked_bucket,
+                        ),
                     )
+                checkpoints.clear(ShareCheckpoints.REVOKE, item_uris)
                 new_state = revoked_item_SM.run_transition(ShareItemActions.Success.value)
                 revoked_item_SM.update_state_single_item(session, removing_item, new_state)
 
@@ -171,6 +203,7 @@ class ProcessS3BucketShare(S3BucketShareManager):
                 success = False
 
                 # statements which can throw exceptions but are not critical
-                removing_bucket.handle_revoke_failure(e)
+                if raise_alarms:
+                    removing_bucket.handle_revoke_failure(e)
 
         return success
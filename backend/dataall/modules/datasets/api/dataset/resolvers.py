@@ -4,9 +4,9 @@ from dataall.core.stacks.api import stack_helper
 from dataall.base.api.context import Context
 from dataall.base.feature_toggle_checker import is_feature_enabled
 from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
-from dataall.core.environment.services.environment_service import EnvironmentService
+from dataall.core.environment.db.environment_repositories import EnvironmentRepository
 from dataall.core.organizations.db.organization_repositories import OrganizationRepository
-from dataall.base.db.exceptions import RequiredParameter, InvalidInput
+from dataall.base.db.exceptions import RequiredParameter, InvalidInput, ObjectNotFound
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject
 from dataall.modules.datasets_base.db.dataset_models import Dataset
 from dataall.modules.datasets_base.services.datasets_base_enums import DatasetRole
@@ -96,15 +96,23 @@ def list_tables(context, source: Dataset, filter: dict = None):
 def get_dataset_organization(context, source: Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return OrganizationRepository.get_organization_by_uri(session, source.organizationUri)
+    organization = context.loaders.load(
+        'organization', source, 'organizationUri', OrganizationRepository.find_organizations_by_uris
+    )
+    if not organization:
+        raise ObjectNotFound('Organization', source.organizationUri)
+    return organization
 
 
 def get_dataset_environment(context, source: Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return EnvironmentService.get_environment_by_uri(session, source.environmentUri)
+    environment = context.loaders.load(
+        'environment', source, 'environmentUri', EnvironmentRepository.get_environments_by_uris
+    )
+    if not environment:
+        raise ObjectNotFound('Environment', source.environmentUri)
+    return environment
 
 
 def get_dataset_owners_group(context, source: Dataset, **kwargs):
@@ -155,10 +163,7 @@ def generate_dataset_access_token(context, source, datasetUri: str = None):
 def get_dataset_stack(context: Context, source: Dataset, **kwargs):
     if not source:
         return None
-    return stack_helper.get_stack_with_cfn_resources(
-        targetUri=source.datasetUri,
-        environmentUri=source.environmentUri,
-    )
+    return stack_helper.load_stack_with_cfn_resources(context.loaders, source, target_key='datasetUri')
 
 
 def delete_dataset(
@@ -8,10 +8,10 @@ log = logging.getLogger(__name__)
 
 
 class DatasetCrawler:
-    def __init__(self, dataset: Dataset):
-        session = SessionHelper.remote_session(accountid=dataset.AwsAccountId)
+    def __init__(self, dataset: Dataset, aws_session=None):
+        session = aws_session or SessionHelper.remote_session(accountid=dataset.AwsAccountId)
         region = dataset.region if dataset.region else 'eu-west-1'
-        self._client = session.client('glue', region_name=region)
+        self._client = SessionHelper.get_client(session, 'glue', region_name=region)
         self._dataset = dataset
 
     def get_crawler(self, crawler_name=None):
@@ -6,6 +6,9 @@ from dataall.modules.datasets_base.db.dataset_models import DatasetTable
 
 log = logging.getLogger(__name__)
 
+# maximum number of entries accepted by a single lakeformation:BatchGrantPermissions request
+BATCH_GRANT_MAX_ENTRIES = 20
+
 
 class LakeFormationTableClient:
     """Requests to AWS LakeFormation"""
@@ -13,7 +16,7 @@ class LakeFormationTableClient:
     def __init__(self, table: DatasetTable, aws_session=None):
         if not aws_session:
             aws_session = SessionHelper.remote_session(table.AWSAccountId)
-        self._client = aws_session.client('lakeformation', region_name=table.region)
+        self._client = SessionHelper.get_client(aws_session, 'lakeformation', region_name=table.region)
         self._table = table
 
     def grant_pivot_role_all_table_permissions(self):
@@ -39,6 +42,46 @@ class LakeFormationTableClient:
             except ClientError:
                 pass  # ignore the error to continue with other requests
 
+    @staticmethod
+    def batch_grant_principals_all_table_permissions(
+        aws_session, account_id, region, database, table_names: [str], principals: [str]
+    ) -> [dict]:
+        """
+        Grants ALL permissions on the tables of a Glue database to the principals,
+        using one BatchGrantPermissions request for up to 20 principal/table pairs
+        :return: the entries that failed to be granted
+        """
+        client = SessionHelper.get_client(aws_session, 'lakeformation', region_name=region)
+        entries = [
+            dict(
+                Id=str(i),
+                Principal={'DataLakePrincipalIdentifier': principal},
+                Resource={'Table': {'CatalogId': account_id, 'DatabaseName': database, 'Name': table_name}},
+                Permissions=['ALL'],
+            )
+            for i, (table_name, principal) in enumerate(
+                (table_name, principal) for table_name in table_names for principal in principals
+            )
+        ]
+
+        failures = []
+        for start in range(0, len(entries), BATCH_GRANT_MAX_ENTRIES):
+            batch = entries[start : start + BATCH_GRANT_MAX_ENTRIES]
+            try:
+                response = client.batch_grant_permissions(CatalogId=account_id, Entries=batch)
+                failures.extend(response.get('Failures', []))
+            except ClientError as e:
+                log.error(f'Failed to grant table permissions on aws://{account_id}/{database}: {e}')
+                failures.extend({'RequestEntry': entry, 'Error': {'ErrorMessage': str(e)}} for entry in batch)
+
+        for failure in failures:
+            log.error(
+                f'Failed to grant all table permissions on '
+                f'aws://{account_id}/{database}/{failure["RequestEntry"]["Resource"]["Table"]["Name"]} '
+                f'to {failure["RequestEntry"]["Principal"]["DataLakePrincipalIdentifier"]}: {failure.get("Error")}'
+            )
+        return failures
+
     def _grant_permissions_to_table(self, principal, permissions):
         table = self._table
         try:
@@ -1,6 +1,6 @@
 import logging
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 
 from dataall.base.db import paginate, exceptions
 from dataall.modules.datasets_base.db.dataset_models import DatasetStorageLocation, Dataset
@@ -104,6 +104,16 @@ class DatasetLocationRepository:
             .count()
         )
 
+    @staticmethod
+    def count_locations_by_dataset(session, dataset_uris) -> dict:
+        counts = (
+            session.query(DatasetStorageLocation.datasetUri, func.count(DatasetStorageLocation.locationUri))
+            .filter(DatasetStorageLocation.datasetUri.in_(dataset_uris))
+            .group_by(DatasetStorageLocation.datasetUri)
+            .all()
+        )
+        return dict(counts)
+
     @staticmethod
     def delete_dataset_locations(session, dataset_uri) -> bool:
         locations = (
@@ -124,6 +134,30 @@ class DatasetLocationRepository:
             .all()
         )
 
+    @staticmethod
+    def get_folders_of_datasets(session, dataset_uris):
+        """return the folders of all datasets in a single query"""
+        return (
+            session.query(DatasetStorageLocation)
+            .filter(DatasetStorageLocation.datasetUri.in_(dataset_uris))
+            .all()
+        )
+
+    @staticmethod
+    def find_folders_updated_since(session, since, target_uris=None):
+        """return the folders created or updated after since, or listed in target_uris"""
+        return (
+            session.query(DatasetStorageLocation)
+            .filter(
+                or_(
+                    DatasetStorageLocation.created > since,
+                    DatasetStorageLocation.updated > since,
+                    DatasetStorageLocation.locationUri.in_(target_uris or []),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def paginated_dataset_locations(session, uri, data=None) -> dict:
         query = session.query(DatasetStorageLocation).filter(
@@ -114,6 +114,34 @@ class DatasetTableRepository:
             .all()
         )
 
+    @staticmethod
+    def find_all_active_tables_of_datasets(session, dataset_uris):
+        return (
+            session.query(DatasetTable)
+            .filter(
+                and_(
+                    DatasetTable.datasetUri.in_(dataset_uris),
+                    DatasetTable.LastGlueTableStatus != 'Deleted',
+                )
+            )
+            .all()
+        )
+
+    @staticmethod
+    def find_tables_updated_since(session, since, target_uris=None):
+        """Returns the tables (including deleted) created or updated after since, or listed in target_uris"""
+        return (
+            session.query(DatasetTable)
+            .filter(
+                or_(
+                    DatasetTable.created > since,
+                    DatasetTable.updated > since,
+                    DatasetTable.tableUri.in_(target_uris or []),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def find_all_deleted_tables(session, dataset_uri):
         return (
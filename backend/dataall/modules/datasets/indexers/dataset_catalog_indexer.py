@@ -1,5 +1,12 @@
+"""Contains dataset related indexers for OpenSearch"""
 import logging
+from datetime import datetime
+from typing import Optional
 
+from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
+from dataall.modules.datasets.db.dataset_location_repositories import DatasetLocationRepository
+from dataall.modules.datasets.db.dataset_table_repositories import DatasetTableRepository
+from dataall.modules.datasets.indexers.dataset_indexer import DatasetIndexer
 from dataall.modules.datasets.indexers.location_indexer import DatasetLocationIndexer
 from dataall.modules.datasets.indexers.table_indexer import DatasetTableIndexer
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
@@ -8,6 +15,9 @@ from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
 
 log = logging.getLogger(__name__)
 
+# number of datasets whose documents are built together, bounds the size of the IN (...) queries
+DATASETS_BATCH_SIZE = 100
+
 
 class DatasetCatalogIndexer(CatalogIndexer):
     """
@@ -15,12 +25,45 @@ class DatasetCatalogIndexer(CatalogIndexer):
        Register automatically itself when CatalogIndexer instance is created
     """
 
-    def index(self, session) -> int:
+    def index(self, session, since: Optional[datetime] = None) -> int:
+        if since:
+            return self._index_updated(session, since)
+
         all_datasets: [Dataset] = DatasetRepository.list_all_active_datasets(session)
         log.info(f'Found {len(all_datasets)} datasets')
         indexed = 0
-        for dataset in all_datasets:
-            tables = DatasetTableIndexer.upsert_all(session, dataset.datasetUri)
-            folders = DatasetLocationIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
-            indexed += len(tables) + len(folders) + 1
+        for start in range(0, len(all_datasets), DATASETS_BATCH_SIZE):
+            dataset_uris = [dataset.datasetUri for dataset in all_datasets[start : start + DATASETS_BATCH_SIZE]]
+            with DatasetIndexer.bulk_indexing():
+                tables = DatasetTableIndexer.upsert_many(
+                    session, DatasetTableRepository.find_all_active_tables_of_datasets(session, dataset_uris)
+                )
+                folders = DatasetLocationIndexer.upsert_many(
+                    session, DatasetLocationRepository.get_folders_of_datasets(session, dataset_uris)
+                )
+                # datasets without tables and folders
+                DatasetIndexer.upsert_many(session, dataset_uris)
+            indexed += len(tables) + len(folders) + len(dataset_uris)
         return indexed
+
+    @staticmethod
+    def _index_updated(session, since: datetime) -> int:
+        linked = GlossaryRepository.list_link_targets_updated_since(session, since)
+        datasets = DatasetRepository.list_active_datasets_updated_since(session, since, linked)
+        tables = DatasetTableRepository.find_tables_updated_since(session, since, linked)
+        folders = DatasetLocationRepository.find_folders_updated_since(session, since, linked)
+        log.info(f'Found {len(datasets)} datasets, {len(tables)} tables and {len(folders)} folders updated since {since}')
+
+        active_tables = []
+        for table in tables:
+            if table.LastGlueTableStatus == 'Deleted':
+                DatasetTableIndexer.delete_doc(doc_id=table.tableUri)
+            else:
+                active_tables.append(table)
+
+        with DatasetIndexer.bulk_indexing():
+            DatasetTableIndexer.upsert_many(session, active_tables)
+            DatasetLocationIndexer.upsert_many(session, folders)
+            DatasetIndexer.upsert_many(session, [dataset.datasetUri for dataset in datasets])
+
+        return len(active_tables) + len(folders) + len(datasets)
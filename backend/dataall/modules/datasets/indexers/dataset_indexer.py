@@ -1,6 +1,4 @@
 """Indexes Datasets in OpenSearch"""
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.modules.vote.db.vote_repositories import VoteRepository
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
 from dataall.modules.datasets.db.dataset_location_repositories import DatasetLocationRepository
@@ -12,19 +10,27 @@ class DatasetIndexer(BaseIndexer):
     @classmethod
     def upsert(cls, session, dataset_uri: str):
         dataset = DatasetRepository.get_dataset_by_uri(session, dataset_uri)
-        env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-        org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
+        if dataset:
+            cls.upsert_many(session, [dataset_uri])
+        return dataset
+
+    @classmethod
+    def upsert_many(cls, session, dataset_uris: [str]):
+        """Builds the documents of all datasets with a fixed number of queries"""
+        # every table and folder upserts its parent dataset, it's enough to index it once per run
+        dataset_uris = [uri for uri in set(dataset_uris) if not cls.is_indexed_in_bulk(uri)]
+        if not dataset_uris:
+            return []
 
-        count_tables = DatasetRepository.count_dataset_tables(session, dataset_uri)
-        count_folders = DatasetLocationRepository.count_dataset_locations(session, dataset_uri)
-        count_upvotes = VoteRepository.count_upvotes(
-            session, dataset_uri, target_type='dataset'
-        )
+        datasets = DatasetRepository.list_datasets_with_environment(session, dataset_uris)
+        count_tables = DatasetRepository.count_tables_by_dataset(session, dataset_uris)
+        count_folders = DatasetLocationRepository.count_locations_by_dataset(session, dataset_uris)
+        count_upvotes = VoteRepository.count_upvotes_by_target(session, dataset_uris, target_type='dataset')
+        glossary = BaseIndexer._get_targets_glossary_terms(session, dataset_uris)
 
-        if dataset:
-            glossary = BaseIndexer._get_target_glossary_terms(session, dataset_uri)
+        for dataset, env, org in datasets:
             BaseIndexer._index(
-                doc_id=dataset_uri,
+                doc_id=dataset.datasetUri,
                 doc={
                     'name': dataset.name,
                     'owner': dataset.owner,
@@ -45,10 +51,10 @@ class DatasetIndexer(BaseIndexer):
                     'created': dataset.created,
                     'updated': dataset.updated,
                     'deleted': dataset.deleted,
-                    'glossary': glossary,
-                    'tables': count_tables,
-                    'folders': count_folders,
-                    'upvotes': count_upvotes,
+                    'glossary': glossary.get(dataset.datasetUri, []),
+                    'tables': count_tables.get(dataset.datasetUri, 0),
+                    'folders': count_folders.get(dataset.datasetUri, 0),
+                    'upvotes': count_upvotes.get(dataset.datasetUri, 0),
                 },
             )
-        return dataset
+        return [dataset for dataset, _, _ in datasets]
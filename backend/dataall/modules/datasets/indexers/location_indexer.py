@@ -1,6 +1,4 @@
 """Indexes DatasetStorageLocation in OpenSearch"""
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.modules.datasets.db.dataset_location_repositories import DatasetLocationRepository
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
 from dataall.modules.datasets.indexers.dataset_indexer import DatasetIndexer
@@ -14,13 +12,27 @@ class DatasetLocationIndexer(BaseIndexer):
         folder = DatasetLocationRepository.get_location_by_uri(session, folder_uri)
 
         if folder:
-            dataset = DatasetRepository.get_dataset_by_uri(session, folder.datasetUri)
-            env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
-            glossary = BaseIndexer._get_target_glossary_terms(session, folder_uri)
+            cls.upsert_many(session, [folder])
+        return folder
+
+    @classmethod
+    def upsert_many(cls, session, folders):
+        """Builds the documents of the folders and their datasets with a fixed number of queries"""
+        if not folders:
+            return folders
+
+        datasets = {
+            dataset.datasetUri: (dataset, env, org)
+            for dataset, env, org in DatasetRepository.list_datasets_with_environment(
+                session, {folder.datasetUri for folder in folders}
+            )
+        }
+        glossary = BaseIndexer._get_targets_glossary_terms(session, [folder.locationUri for folder in folders])
 
+        for folder in folders:
+            dataset, env, org = datasets[folder.datasetUri]
             BaseIndexer._index(
-                doc_id=folder_uri,
+                doc_id=folder.locationUri,
                 doc={
                     'name': folder.name,
                     'admins': dataset.SamlAdminGroupName,
@@ -41,15 +53,15 @@ class DatasetLocationIndexer(BaseIndexer):
                     'created': folder.created,
                     'updated': folder.updated,
                     'deleted': folder.deleted,
-                    'glossary': glossary,
+                    'glossary': glossary.get(folder.locationUri, []),
                 },
             )
-            DatasetIndexer.upsert(session=session, dataset_uri=folder.datasetUri)
-        return folder
+        DatasetIndexer.upsert_many(session, list(datasets.keys()))
+        return folders
 
     @classmethod
     def upsert_all(cls, session, dataset_uri: str):
         folders = DatasetLocationRepository.get_dataset_folders(session, dataset_uri)
-        for folder in folders:
-            DatasetLocationIndexer.upsert(session=session, folder_uri=folder.locationUri)
+        with cls.bulk_indexing():
+            cls.upsert_many(session, folders)
         return folders
@@ -1,7 +1,5 @@
 """Indexes DatasetTable in OpenSearch"""
 
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.modules.datasets.db.dataset_table_repositories import DatasetTableRepository
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
 from dataall.modules.datasets.indexers.dataset_indexer import DatasetIndexer
@@ -15,14 +13,28 @@ class DatasetTableIndexer(BaseIndexer):
         table = DatasetTableRepository.get_dataset_table_by_uri(session, table_uri)
 
         if table:
-            dataset = DatasetRepository.get_dataset_by_uri(session, table.datasetUri)
-            env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
-            glossary = BaseIndexer._get_target_glossary_terms(session, table_uri)
+            cls.upsert_many(session, [table])
+        return table
+
+    @classmethod
+    def upsert_many(cls, session, tables):
+        """Builds the documents of the tables and their datasets with a fixed number of queries"""
+        if not tables:
+            return tables
+
+        datasets = {
+            dataset.datasetUri: (dataset, env, org)
+            for dataset, env, org in DatasetRepository.list_datasets_with_environment(
+                session, {table.datasetUri for table in tables}
+            )
+        }
+        glossary = BaseIndexer._get_targets_glossary_terms(session, [table.tableUri for table in tables])
 
+        for table in tables:
+            dataset, env, org = datasets[table.datasetUri]
             tags = table.tags if table.tags else []
             BaseIndexer._index(
-                doc_id=table_uri,
+                doc_id=table.tableUri,
                 doc={
                     'name': table.name,
                     'admins': dataset.SamlAdminGroupName,
@@ -44,17 +56,17 @@ class DatasetTableIndexer(BaseIndexer):
                     'created': table.created,
                     'updated': table.updated,
                     'deleted': table.deleted,
-                    'glossary': glossary,
+                    'glossary': glossary.get(table.tableUri, []),
                 },
             )
-            DatasetIndexer.upsert(session=session, dataset_uri=table.datasetUri)
-        return table
+        DatasetIndexer.upsert_many(session, list(datasets.keys()))
+        return tables
 
     @classmethod
     def upsert_all(cls, session, dataset_uri: str):
         tables = DatasetTableRepository.find_all_active_tables(session, dataset_uri)
-        for table in tables:
-            DatasetTableIndexer.upsert(session=session, table_uri=table.tableUri)
+        with cls.bulk_indexing():
+            cls.upsert_many(session, tables)
         return tables
 
     @classmethod
@@ -247,6 +247,7 @@ class DatasetService:
                         DatasetService._transfer_stewardship_to_owners(session, dataset)
                         dataset.stewards = dataset.SamlAdminGroupName
 
+                DatasetRepository.update_dataset_access(session, dataset)
                 ResourcePolicy.attach_resource_policy(
                     session=session,
                     group=dataset.SamlAdminGroupName,
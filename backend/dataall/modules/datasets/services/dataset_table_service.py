@@ -19,9 +19,12 @@ from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Datase
 from dataall.modules.datasets_base.services.permissions import PREVIEW_DATASET_TABLE, DATASET_TABLE_READ, \
     GET_DATASET_TABLE
 from dataall.base.utils import json_utils
+from dataall.base.utils.query_result_cache import QueryResultCache
 
 log = logging.getLogger(__name__)
 
+PREVIEW_CACHE = QueryResultCache()
+
 
 class DatasetTableService:
     @staticmethod
@@ -95,7 +98,17 @@ class DatasetTableService:
                     permission_name=PREVIEW_DATASET_TABLE,
                 )
             env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            return AthenaTableClient(env, table).get_table(dataset_uri=dataset.datasetUri)
+            # the preview is read again once the table changed in Glue, or when the cache expires
+            key = QueryResultCache.key(
+                'preview',
+                table.tableUri,
+                env.EnvironmentDefaultAthenaWorkGroup,
+                table.updated or table.created,
+                table.LastGlueTableStatus,
+            )
+            return PREVIEW_CACHE.get_or_run(
+                key, lambda: AthenaTableClient(env, table).get_table(dataset_uri=dataset.datasetUri)
+            )
 
     @staticmethod
     @has_resource_permission(GET_DATASET_TABLE)
@@ -165,7 +165,7 @@ class DatasetSubscriptionService:
 if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
-    Worker.queue = SqsQueue.send
+    Worker.queue = Worker.coalesced(SqsQueue.send)
     log.info('Polling datasets updates...')
     service = DatasetSubscriptionService(ENGINE)
     queues = service.get_queues(service.get_environments(ENGINE))
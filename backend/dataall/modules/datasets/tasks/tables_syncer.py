@@ -1,6 +1,9 @@
 import logging
 import os
 import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from operator import and_
 
 from dataall.base.aws.sts import SessionHelper
@@ -21,88 +24,152 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
-
-def sync_tables(engine):
-    with engine.scoped_session() as session:
-        processed_tables = []
-        all_datasets: [Dataset] = DatasetRepository.list_all_active_datasets(
-            session
-        )
+# number of concurrent Glue and Lake Formation calls
+MAX_WORKERS = int(os.getenv('tables_syncer_max_workers', '8'))
+
+
+class TablesSyncReport:
+    """Counters of a tables sync run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.datasets = 0
+        self.failed_datasets = 0
+        self.tables = 0
+        self.failed_grants = 0
+
+    def to_dict(self):
+        duration = time.monotonic() - self.started
+        return {
+            'datasets': self.datasets,
+            'failedDatasets': self.failed_datasets,
+            'tables': self.tables,
+            'failedGrants': self.failed_grants,
+            'seconds': round(duration, 2),
+            'tablesPerSecond': round(self.tables / duration, 2) if duration else None,
+        }
+
+
+def sync_tables(engine, max_workers=MAX_WORKERS):
+    """
+    Synchronizes the tables of all active datasets with their Glue databases.
+    Datasets are grouped by AWS account and region so that the pivot role is assumed once per account.
+    Glue listing and Lake Formation grants run in a bounded pool of threads,
+    the metadata database is only used from the calling thread.
+    """
+    report = TablesSyncReport()
+    processed_tables = []
+    with engine.scoped_session() as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        all_datasets: [Dataset] = DatasetRepository.list_all_active_datasets(session)
         log.info(f'Found {len(all_datasets)} datasets for tables sync')
-        dataset: Dataset
+
+        accounts = defaultdict(list)
         for dataset in all_datasets:
-            log.info(
-                f'Synchronizing dataset {dataset.name}|{dataset.datasetUri} tables'
-            )
-            env: Environment = (
-                session.query(Environment)
-                .filter(
-                    and_(
-                        Environment.environmentUri == dataset.environmentUri,
-                        Environment.deleted.is_(None),
+            accounts[(dataset.AwsAccountId, dataset.region)].append(dataset)
+
+        listings = {}
+        principals = {}
+        for (account_id, region), datasets in accounts.items():
+            log.info(f'Synchronizing tables of {len(datasets)} datasets in {account_id}/{region}')
+            aws_session, assumed = None, False
+            for dataset in datasets:
+                report.datasets += 1
+                env: Environment = (
+                    session.query(Environment)
+                    .filter(
+                        and_(
+                            Environment.environmentUri == dataset.environmentUri,
+                            Environment.deleted.is_(None),
+                        )
                     )
+                    .first()
                 )
-                .first()
-            )
-            env_group: EnvironmentGroup = (
-                EnvironmentService.get_environment_group(
-                    session, dataset.SamlAdminGroupName, env.environmentUri
-                )
-            )
-            try:
-                if not env or not is_assumable_pivot_role(env):
-                    log.info(
-                        f'Dataset {dataset.GlueDatabaseName} has an invalid environment'
-                    )
-                else:
-
-                    tables = DatasetCrawler(dataset).list_glue_database_tables(dataset.S3BucketName)
-
-                    log.info(
-                        f'Found {len(tables)} tables on Glue database {dataset.GlueDatabaseName}'
+                if not env:
+                    log.info(f'Dataset {dataset.GlueDatabaseName} has an invalid environment')
+                    continue
+                if not assumed:
+                    aws_session, assumed = assume_pivot_role(env), True
+                if not aws_session:
+                    log.info(f'Dataset {dataset.GlueDatabaseName} has an invalid environment')
+                    continue
+
+                try:
+                    env_group: EnvironmentGroup = EnvironmentService.get_environment_group(
+                        session, dataset.SamlAdminGroupName, env.environmentUri
                     )
+                    principals[dataset.datasetUri] = [
+                        SessionHelper.get_delegation_role_arn(env.AwsAccountId),
+                        env_group.environmentIAMRoleArn,
+                    ]
+                    crawler = DatasetCrawler(dataset, aws_session=aws_session)
+                    listings[pool.submit(_list_glue_tables, crawler, dataset)] = (dataset, aws_session)
+                except Exception as e:
+                    _report_failure(report, dataset, e)
+
+        grants = {}
+        for listing in as_completed(listings):
+            dataset, aws_session = listings[listing]
+            try:
+                tables = listing.result()
+                log.info(f'Found {len(tables)} tables on Glue database {dataset.GlueDatabaseName}')
+
+                DatasetTableService.sync_existing_tables(session, dataset.datasetUri, glue_tables=tables)
+
+                tables = session.query(DatasetTable).filter(DatasetTable.datasetUri == dataset.datasetUri).all()
+                grant = pool.submit(
+                    LakeFormationTableClient.batch_grant_principals_all_table_permissions,
+                    aws_session,
+                    dataset.AwsAccountId,
+                    dataset.region,
+                    dataset.GlueDatabaseName,
+                    [table.name for table in tables],
+                    principals[dataset.datasetUri],
+                )
+                grants[grant] = dataset
+                processed_tables.extend(tables)
+                report.tables += len(tables)
+            except Exception as e:
+                _report_failure(report, dataset, e)
 
-                    DatasetTableService.sync_existing_tables(
-                        session, dataset.datasetUri, glue_tables=tables
-                    )
+        log.info('Updating tables permissions on Lake Formation...')
+        for grant in as_completed(grants):
+            dataset = grants[grant]
+            try:
+                report.failed_grants += len(grant.result())
+                DatasetTableIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
+            except Exception as e:
+                _report_failure(report, dataset, e)
 
-                    tables = (
-                        session.query(DatasetTable)
-                        .filter(DatasetTable.datasetUri == dataset.datasetUri)
-                        .all()
-                    )
+    log.info(f'Tables sync report: {report.to_dict()}')
+    return processed_tables
 
-                    log.info('Updating tables permissions on Lake Formation...')
 
-                    for table in tables:
-                        LakeFormationTableClient(table).grant_principals_all_table_permissions(
-                            principals=[
-                                SessionHelper.get_delegation_role_arn(env.AwsAccountId),
-                                env_group.environmentIAMRoleArn,
-                            ],
-                        )
+def _list_glue_tables(crawler: DatasetCrawler, dataset: Dataset):
+    return crawler.list_glue_database_tables(dataset.S3BucketName)
 
-                    processed_tables.extend(tables)
 
-                    DatasetTableIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
-            except Exception as e:
-                log.error(
-                    f'Failed to sync tables for dataset '
-                    f'{dataset.AwsAccountId}/{dataset.GlueDatabaseName} '
-                    f'due to: {e}'
-                )
-                DatasetAlarmService().trigger_dataset_sync_failure_alarm(dataset, str(e))
-        return processed_tables
+def _report_failure(report: TablesSyncReport, dataset: Dataset, error: Exception):
+    report.failed_datasets += 1
+    log.error(
+        f'Failed to sync tables for dataset '
+        f'{dataset.AwsAccountId}/{dataset.GlueDatabaseName} '
+        f'due to: {error}'
+    )
+    DatasetAlarmService().trigger_dataset_sync_failure_alarm(dataset, str(error))
 
 
-def is_assumable_pivot_role(env: Environment):
-    aws_session = SessionHelper.remote_session(accountid=env.AwsAccountId)
+def assume_pivot_role(env: Environment):
+    """Returns a session of the pivot role of the environment account or None if the role can't be assumed"""
+    try:
+        aws_session = SessionHelper.remote_session(accountid=env.AwsAccountId)
+    except Exception as e:
+        log.error(f'Failed to assume dataall pivot role in environment {env.AwsAccountId}: {e}')
+        return None
     if not aws_session:
         log.error(
             f'Failed to assume dataall pivot role in environment {env.AwsAccountId}'
         )
-        return False
-    return True
+    return aws_session
 
 
 if __name__ == '__main__':
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Text, ForeignKey
+from sqlalchemy import Boolean, Column, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSON, ARRAY
 from sqlalchemy.orm import query_expression
 from dataall.base.db import Base, Resource, utils
@@ -81,6 +81,10 @@ class DatasetTable(Resource, Base):
     topics = Column(ARRAY(String), nullable=True)
     confidentiality = Column(String, nullable=False, default='C1')
 
+    __table_args__ = (
+        Index('ix_dataset_table_datasetUri_LastGlueTableStatus', 'datasetUri', 'LastGlueTableStatus'),
+    )
+
     @classmethod
     def uri(cls):
         return cls.tableUri
@@ -164,3 +168,14 @@ class DatasetBucket(Resource, Base):
     @classmethod
     def uri(cls):
         return cls.bucketUri
+
+
+class DatasetAccess(Base):
+    """
+    The principals that see a dataset in their listings and why, see DatasetAccessKind.
+    Maintained when the owner, admins or stewards of the dataset change and when its shares are granted or revoked
+    """
+    __tablename__ = 'dataset_access'
+    principalId = Column(String, primary_key=True)
+    accessKind = Column(String, primary_key=True)
+    datasetUri = Column(String, primary_key=True, index=True)
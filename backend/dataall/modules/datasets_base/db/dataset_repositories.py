@@ -1,16 +1,18 @@
 import logging
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from sqlalchemy.orm import Query
 from dataall.core.activity.db.activity_models import Activity
 from dataall.core.environment.db.environment_models import Environment
+from dataall.core.organizations.db.organization_models import Organization
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.base.db import paginate
 from dataall.base.db.exceptions import ObjectNotFound
-from dataall.modules.datasets_base.services.datasets_base_enums import ConfidentialityClassification, Language
+from dataall.modules.datasets_base.services.datasets_base_enums import ConfidentialityClassification, Language, \
+    DatasetAccessKind
 from dataall.core.environment.services.environment_resource_manager import EnvironmentResource
-from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
+from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset, DatasetAccess
 from dataall.base.utils.naming_convention import (
     NamingConventionService,
     NamingConventionPattern,
@@ -63,6 +65,12 @@ class DatasetRepository(EnvironmentResource):
             raise ObjectNotFound('Dataset', dataset_uri)
         return dataset
 
+    @staticmethod
+    def find_datasets_by_uris(session, dataset_uris) -> dict:
+        """Returns the datasets of the uris by uri, in a single query"""
+        datasets = session.query(Dataset).filter(Dataset.datasetUri.in_(dataset_uris)).all()
+        return {dataset.datasetUri: dataset for dataset in datasets}
+
     @staticmethod
     def count_resources(session, environment, group_uri) -> int:
         return (
@@ -84,6 +92,7 @@ class DatasetRepository(EnvironmentResource):
         session.commit()
 
         cls._set_dataset_aws_resources(dataset, data, env)
+        cls.update_dataset_access(session, dataset)
 
         activity = Activity(
             action='dataset:create',
@@ -220,9 +229,71 @@ class DatasetRepository(EnvironmentResource):
 
     @staticmethod
     def delete_dataset(session, dataset) -> bool:
+        session.query(DatasetAccess).filter(DatasetAccess.datasetUri == dataset.datasetUri).delete(
+            synchronize_session=False
+        )
         session.delete(dataset)
         return True
 
+    @staticmethod
+    def lock_dataset(session, dataset_uri):
+        """
+        Locks the dataset row until the end of the transaction. The access to the dataset is rebuilt
+        from what the transaction reads, concurrent rebuilds for the same dataset must run one after the other
+        """
+        session.query(Dataset.datasetUri).filter(Dataset.datasetUri == dataset_uri).with_for_update().first()
+
+    @staticmethod
+    def update_dataset_access(session, dataset: Dataset):
+        """Rebuilds the owner, admin and steward access to the dataset"""
+        DatasetRepository.lock_dataset(session, dataset.datasetUri)
+        DatasetRepository.replace_dataset_access(
+            session,
+            dataset.datasetUri,
+            {
+                (dataset.owner, DatasetAccessKind.Owner.value),
+                (dataset.SamlAdminGroupName, DatasetAccessKind.Admin.value),
+                (dataset.stewards, DatasetAccessKind.Steward.value),
+            },
+            [DatasetAccessKind.Owner.value, DatasetAccessKind.Admin.value, DatasetAccessKind.Steward.value],
+        )
+
+    @staticmethod
+    def replace_dataset_access(session, dataset_uri, accesses, access_kinds):
+        """Replaces the access to the dataset of the access_kinds by accesses, a set of (principal, access kind)"""
+        session.query(DatasetAccess).filter(
+            and_(
+                DatasetAccess.datasetUri == dataset_uri,
+                DatasetAccess.accessKind.in_(access_kinds),
+            )
+        ).delete(synchronize_session=False)
+        session.add_all(
+            [
+                DatasetAccess(principalId=principal, accessKind=kind, datasetUri=dataset_uri)
+                for principal, kind in accesses
+                if principal
+            ]
+        )
+        session.flush()
+
+    @staticmethod
+    def query_user_dataset_uris(session, username, groups, access_kinds) -> Query:
+        """The uris of the datasets that the user or its groups access with one of access_kinds"""
+        user_kinds = [kind for kind in access_kinds if kind in DatasetAccessKind.user_kinds()]
+        group_kinds = [kind for kind in access_kinds if kind not in DatasetAccessKind.user_kinds()]
+        return session.query(DatasetAccess.datasetUri).filter(
+            or_(
+                and_(
+                    DatasetAccess.principalId == username,
+                    DatasetAccess.accessKind.in_(user_kinds),
+                ),
+                and_(
+                    DatasetAccess.principalId.in_(groups),
+                    DatasetAccess.accessKind.in_(group_kinds),
+                ),
+            )
+        )
+
     @staticmethod
     def list_all_datasets(session) -> [Dataset]:
         return session.query(Dataset).all()
@@ -233,6 +304,24 @@ class DatasetRepository(EnvironmentResource):
             session.query(Dataset).filter(Dataset.deleted.is_(None)).all()
         )
 
+    @staticmethod
+    def list_active_datasets_updated_since(session, since, target_uris=None) -> [Dataset]:
+        """Returns active datasets created or updated after since, or listed in target_uris"""
+        return (
+            session.query(Dataset)
+            .filter(
+                and_(
+                    Dataset.deleted.is_(None),
+                    or_(
+                        Dataset.created > since,
+                        Dataset.updated > since,
+                        Dataset.datasetUri.in_(target_uris or []),
+                    ),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def get_dataset_by_bucket_name(session, bucket) -> [Dataset]:
         return (
@@ -249,6 +338,27 @@ class DatasetRepository(EnvironmentResource):
             .count()
         )
 
+    @staticmethod
+    def count_tables_by_dataset(session, dataset_uris) -> dict:
+        counts = (
+            session.query(DatasetTable.datasetUri, func.count(DatasetTable.tableUri))
+            .filter(DatasetTable.datasetUri.in_(dataset_uris))
+            .group_by(DatasetTable.datasetUri)
+            .all()
+        )
+        return dict(counts)
+
+    @staticmethod
+    def list_datasets_with_environment(session, dataset_uris) -> [(Dataset, Environment, Organization)]:
+        """Returns the datasets joined with their environment and organization"""
+        return (
+            session.query(Dataset, Environment, Organization)
+            .join(Environment, Environment.environmentUri == Dataset.environmentUri)
+            .join(Organization, Organization.organizationUri == Dataset.organizationUri)
+            .filter(Dataset.datasetUri.in_(dataset_uris))
+            .all()
+        )
+
     @staticmethod
     def query_environment_group_datasets(session, env_uri, group_uri, filter) -> Query:
         query = session.query(Dataset).filter(
@@ -363,10 +473,13 @@ class DatasetRepository(EnvironmentResource):
         query = (
             session.query(Dataset)
             .filter(
-                or_(
-                    Dataset.owner == username,
-                    Dataset.SamlAdminGroupName.in_(groups),
-                    Dataset.stewards.in_(groups),
+                Dataset.datasetUri.in_(
+                    DatasetRepository.query_user_dataset_uris(
+                        session,
+                        username,
+                        groups,
+                        [DatasetAccessKind.Owner.value, DatasetAccessKind.Admin.value, DatasetAccessKind.Steward.value],
+                    )
                 )
             )
         )
@@ -377,7 +490,7 @@ class DatasetRepository(EnvironmentResource):
                     Dataset.label.ilike(filter.get('term') + '%%'),
                 )
             )
-        return query.distinct(Dataset.datasetUri)
+        return query.order_by(Dataset.datasetUri)
 
     @staticmethod
     def _set_import_data(dataset, data):
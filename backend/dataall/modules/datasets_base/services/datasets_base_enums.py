@@ -11,6 +11,19 @@ class DatasetRole(GraphQLEnumMapper):
     NoPermission = '000'
 
 
+class DatasetAccessKind(GraphQLEnumMapper):
+    # Why a principal sees a dataset in its listings, the user kinds apply to usernames and the others to groups
+    Owner = 'Owner'
+    Admin = 'Admin'
+    Steward = 'Steward'
+    Shared = 'Shared'
+    ShareRequester = 'ShareRequester'
+
+    @staticmethod
+    def user_kinds():
+        return [DatasetAccessKind.Owner.value, DatasetAccessKind.ShareRequester.value]
+
+
 class DatasetSortField(GraphQLEnumMapper):
     label = 'label'
     created = 'created'
@@ -127,10 +127,7 @@ def resolve_sagemaker_studio_user_stack(
     """
     if not source:
         return None
-    return stack_helper.get_stack_with_cfn_resources(
-        targetUri=source.sagemakerStudioUserUri,
-        environmentUri=source.environmentUri,
-    )
+    return stack_helper.load_stack_with_cfn_resources(context.loaders, source, target_key='sagemakerStudioUserUri')
 
 
 def resolve_sagemaker_studio_user_applications(context, source: SagemakerStudioUser):
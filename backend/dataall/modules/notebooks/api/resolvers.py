@@ -89,10 +89,7 @@ def resolve_user_role(context: Context, source: SagemakerNotebook):
 def resolve_notebook_stack(context: Context, source: SagemakerNotebook, **kwargs):
     if not source:
         return None
-    return stack_helper.get_stack_with_cfn_resources(
-        targetUri=source.notebookUri,
-        environmentUri=source.environmentUri,
-    )
+    return stack_helper.load_stack_with_cfn_resources(context.loaders, source, target_key='notebookUri')
 
 
 class RequestValidator:
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index, text
 
 from dataall.base.db import Base
 from dataall.base.db import utils
@@ -19,3 +19,13 @@ class Notification(Base):
     created = Column(DateTime, default=datetime.now)
     updated = Column(DateTime, onupdate=datetime.now)
     deleted = Column(DateTime)
+
+    __table_args__ = (
+        Index('ix_notification_recipient_is_read', 'recipient', 'is_read'),
+        # the unread notifications counted for the badge of every page
+        Index(
+            'ix_notification_recipient_unread',
+            'recipient',
+            postgresql_where=text('NOT is_read AND deleted IS NULL'),
+        ),
+    )
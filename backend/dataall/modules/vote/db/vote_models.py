@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 
 from dataall.base.db import Base, utils
 
@@ -15,6 +15,10 @@ class Vote(Base):
     created = Column(DateTime, default=datetime.datetime.now)
     updated = Column(DateTime, onupdate=datetime.datetime.now)
 
+    __table_args__ = (
+        Index('ix_vote_targetUri_targetType', 'targetUri', 'targetType'),
+    )
+
     def __repr__(self):
         if self.upvote:
             vote = 'Up'
@@ -1,6 +1,8 @@
 import logging
 from datetime import datetime
 
+from sqlalchemy import func
+
 from dataall.modules.vote.db import vote_models as models
 from dataall.base.context import get_context
 
@@ -58,6 +60,21 @@ class VoteRepository:
             .count()
         )
 
+    @staticmethod
+    def count_upvotes_by_target(session, target_uris, target_type) -> dict:
+        """Returns the number of upvotes of every target in a single query"""
+        counts = (
+            session.query(models.Vote.targetUri, func.count(models.Vote.voteUri))
+            .filter(
+                models.Vote.targetUri.in_(target_uris),
+                models.Vote.targetType == target_type,
+                models.Vote.upvote == True,
+            )
+            .group_by(models.Vote.targetUri)
+            .all()
+        )
+        return dict(counts)
+
     @staticmethod
     def delete_votes(session, target_uri, target_type) -> [models.Vote]:
         return (
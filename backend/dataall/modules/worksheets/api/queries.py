@@ -28,3 +28,28 @@ runAthenaSqlQuery = gql.QueryField(
     ],
     resolver=run_sql_query,
 )
+
+
+startAthenaSqlQuery = gql.QueryField(
+    name='startAthenaSqlQuery',
+    type=gql.Ref('AthenaQueryResultsPage'),
+    args=[
+        gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='sqlQuery', type=gql.NonNullableType(gql.String)),
+    ],
+    resolver=start_sql_query,
+)
+
+
+getAthenaSqlQueryResults = gql.QueryField(
+    name='getAthenaSqlQueryResults',
+    type=gql.Ref('AthenaQueryResultsPage'),
+    args=[
+        gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='athenaQueryId', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='nextToken', type=gql.String),
+    ],
+    resolver=get_sql_query_results,
+)
@@ -77,6 +77,36 @@ def run_sql_query(
         )
 
 
+def start_sql_query(
+    context: Context, source, environmentUri: str = None, worksheetUri: str = None, sqlQuery: str = None
+):
+    with context.engine.scoped_session() as session:
+        return WorksheetService.start_sql_query(
+            session=session,
+            uri=environmentUri,
+            worksheetUri=worksheetUri,
+            sqlQuery=sqlQuery
+        )
+
+
+def get_sql_query_results(
+    context: Context,
+    source,
+    environmentUri: str = None,
+    worksheetUri: str = None,
+    athenaQueryId: str = None,
+    nextToken: str = None,
+):
+    with context.engine.scoped_session() as session:
+        return WorksheetService.get_sql_query_results(
+            session=session,
+            uri=environmentUri,
+            worksheetUri=worksheetUri,
+            athenaQueryId=athenaQueryId,
+            nextToken=nextToken,
+        )
+
+
 def delete_worksheet(context, source, worksheetUri: str = None):
     with context.engine.scoped_session() as session:
         return WorksheetService.delete_worksheet(
@@ -36,7 +36,7 @@ AthenaQueryResult = gql.ObjectType(
         gql.Field(name='AwsAccountId', type=gql.String),
         gql.Field(name='region', type=gql.String),
         gql.Field(name='ElapsedTimeInMs', type=gql.Integer),
-        gql.Field(name='DataScannedInBytes', type=gql.Integer),
+        gql.Field(name='DataScannedInBytes', type=gql.Number),
         gql.Field(name='Status', type=gql.String),
         gql.Field(
             name='columns', type=gql.ArrayType(gql.Ref('AthenaResultColumnDescriptor'))
@@ -46,6 +46,26 @@ AthenaQueryResult = gql.ObjectType(
 )
 
 
+AthenaQueryResultsPage = gql.ObjectType(
+    name='AthenaQueryResultsPage',
+    fields=[
+        gql.Field(name='AthenaQueryId', type=gql.String),
+        gql.Field(name='Status', type=gql.String),
+        gql.Field(name='Error', type=gql.String),
+        gql.Field(name='OutputLocation', type=gql.String),
+        gql.Field(name='AwsAccountId', type=gql.String),
+        gql.Field(name='region', type=gql.String),
+        gql.Field(name='ElapsedTimeInMs', type=gql.Integer),
+        gql.Field(name='DataScannedInBytes', type=gql.Number),
+        gql.Field(
+            name='columns', type=gql.ArrayType(gql.Ref('AthenaResultColumnDescriptor'))
+        ),
+        gql.Field(name='rows', type=gql.ArrayType(gql.ArrayType(gql.String))),
+        gql.Field(name='nextToken', type=gql.String),
+    ],
+)
+
+
 Worksheet = gql.ObjectType(
     name='Worksheet',
     fields=[
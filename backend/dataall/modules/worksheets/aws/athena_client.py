@@ -1,5 +1,13 @@
+import os
+
 from pyathena import connect
 from dataall.base.aws.sts import SessionHelper
+from dataall.base.db import exceptions
+
+# rows returned per page of query results, athena:GetQueryResults returns at most 1000
+RESULTS_PAGE_SIZE = int(os.getenv('athena_results_page_size', '500'))
+# Athena reuses the results of an identical query run in the last minutes, 0 disables it (needs engine version 3)
+RESULT_REUSE_MINUTES = int(os.getenv('athena_result_reuse_minutes', '0'))
 
 
 class AthenaClient:
@@ -46,3 +54,69 @@ class AthenaClient:
             'rows': rows,
             'columns': columns,
         }
+
+    @staticmethod
+    def start_athena_query(aws_account_id, env_group, s3_staging_dir, region, sql):
+        """Submits the query to the workgroup of the group and returns its query execution id"""
+        client = AthenaClient._client(aws_account_id, env_group, region)
+        params = {
+            'QueryString': sql,
+            'WorkGroup': env_group.environmentAthenaWorkGroup,
+            'ResultConfiguration': {'OutputLocation': s3_staging_dir},
+        }
+        if RESULT_REUSE_MINUTES > 0:
+            params['ResultReuseConfiguration'] = {
+                'ResultReuseByAgeConfiguration': {'Enabled': True, 'MaxAgeInMinutes': RESULT_REUSE_MINUTES}
+            }
+        response = client.start_query_execution(**params)
+        return response['QueryExecutionId']
+
+    @staticmethod
+    def get_athena_query_results(aws_account_id, env_group, region, query_id, next_token=None,
+                                 max_results=RESULTS_PAGE_SIZE):
+        """
+        Returns the status and statistics of the query and, once it succeeded, one page of its results.
+        Rows are lists of values in the order of the columns
+        """
+        client = AthenaClient._client(aws_account_id, env_group, region)
+        execution = client.get_query_execution(QueryExecutionId=query_id)['QueryExecution']
+        if execution.get('WorkGroup') != env_group.environmentAthenaWorkGroup:
+            raise exceptions.ObjectNotFound('AthenaQuery', query_id)
+
+        status = execution['Status']
+        statistics = execution.get('Statistics', {})
+        result = {
+            'AthenaQueryId': query_id,
+            'Status': status['State'],
+            'Error': status.get('StateChangeReason') if status['State'] in ['FAILED', 'CANCELLED'] else None,
+            'OutputLocation': execution.get('ResultConfiguration', {}).get('OutputLocation'),
+            'ElapsedTimeInMs': statistics.get('TotalExecutionTimeInMillis'),
+            'DataScannedInBytes': statistics.get('DataScannedInBytes'),
+            'columns': [],
+            'rows': [],
+            'nextToken': None,
+        }
+        if status['State'] != 'SUCCEEDED':
+            return result
+
+        params = {'QueryExecutionId': query_id, 'MaxResults': min(max_results, 1000)}
+        if next_token:
+            params['NextToken'] = next_token
+        response = client.get_query_results(**params)
+        columns = [
+            {'columnName': column['Name'], 'typeName': column['Type']}
+            for column in response['ResultSet']['ResultSetMetadata']['ColumnInfo']
+        ]
+        rows = [[cell.get('VarCharValue') for cell in row['Data']] for row in response['ResultSet']['Rows']]
+        # the first page of the results of a SELECT starts with the column names
+        if not next_token and rows and rows[0] == [column['columnName'] for column in columns]:
+            rows = rows[1:]
+
+        result.update(columns=columns, rows=rows, nextToken=response.get('NextToken'))
+        return result
+
+    @staticmethod
+    def _client(aws_account_id, env_group, region):
+        base_session = SessionHelper.remote_session(accountid=aws_account_id)
+        boto3_session = SessionHelper.get_session(base_session=base_session, role_arn=env_group.environmentIAMRoleArn)
+        return SessionHelper.get_client(boto3_session, 'athena', region_name=region)
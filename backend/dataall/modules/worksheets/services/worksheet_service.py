@@ -5,6 +5,7 @@ from dataall.core.environment.services.environment_service import EnvironmentSer
 from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
 from dataall.core.permissions.permission_checker import has_tenant_permission, has_resource_permission
 from dataall.base.db import exceptions
+from dataall.base.utils.query_result_cache import QueryResultCache, normalize_sql, is_cacheable_query
 from dataall.modules.worksheets.aws.athena_client import AthenaClient
 from dataall.modules.worksheets.db.worksheet_models import Worksheet
 from dataall.modules.worksheets.db.worksheet_repositories import WorksheetRepository
@@ -14,6 +15,8 @@ from dataall.modules.worksheets.services.worksheet_permissions import MANAGE_WOR
 
 logger = logging.getLogger(__name__)
 
+QUERY_CACHE = QueryResultCache()
+
 
 class WorksheetService:
     @staticmethod
@@ -107,12 +110,66 @@ class WorksheetService:
             session, worksheet.SamlAdminGroupName, environment.environmentUri
         )
 
-        cursor = AthenaClient.run_athena_query(
+        def run():
+            cursor = AthenaClient.run_athena_query(
+                aws_account_id=environment.AwsAccountId,
+                env_group=env_group,
+                s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{env_group.environmentAthenaWorkGroup}/',
+                region=environment.region,
+                sql=sqlQuery
+            )
+            return AthenaClient.convert_query_output(cursor)
+
+        if not is_cacheable_query(sqlQuery):
+            return run()
+
+        # the data version of an arbitrary query is unknown, its result is only kept for the cache time to live
+        key = QueryResultCache.key(
+            'worksheet',
+            normalize_sql(sqlQuery),
+            environment.AwsAccountId,
+            environment.region,
+            env_group.environmentAthenaWorkGroup,
+        )
+        return QUERY_CACHE.get_or_run(key, run)
+
+    @staticmethod
+    @has_resource_permission(RUN_ATHENA_QUERY)
+    def start_sql_query(session, uri, worksheetUri, sqlQuery):
+        environment, env_group = WorksheetService._get_query_context(session, uri, worksheetUri)
+        query_id = AthenaClient.start_athena_query(
             aws_account_id=environment.AwsAccountId,
             env_group=env_group,
             s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{env_group.environmentAthenaWorkGroup}/',
             region=environment.region,
             sql=sqlQuery
         )
+        return {
+            'AthenaQueryId': query_id,
+            'Status': 'QUEUED',
+            'AwsAccountId': environment.AwsAccountId,
+            'region': environment.region,
+        }
+
+    @staticmethod
+    @has_resource_permission(RUN_ATHENA_QUERY)
+    def get_sql_query_results(session, uri, worksheetUri, athenaQueryId, nextToken=None):
+        environment, env_group = WorksheetService._get_query_context(session, uri, worksheetUri)
+        result = AthenaClient.get_athena_query_results(
+            aws_account_id=environment.AwsAccountId,
+            env_group=env_group,
+            region=environment.region,
+            query_id=athenaQueryId,
+            next_token=nextToken,
+        )
+        result.update(AwsAccountId=environment.AwsAccountId, region=environment.region)
+        return result
 
-        return AthenaClient.convert_query_output(cursor)
+    @staticmethod
+    def _get_query_context(session, uri, worksheetUri):
+        environment = EnvironmentService.get_environment_by_uri(session, uri)
+        worksheet = WorksheetService.get_worksheet_by_uri(session, worksheetUri)
+        env_group = EnvironmentService.get_environment_group(
+            session, worksheet.SamlAdminGroupName, environment.environmentUri
+        )
+        return environment, env_group
@@ -155,6 +155,7 @@ def graphql_server():
     )
 
     dispose_context()
+    engine.remove_session()
     status_code = 200 if success else 400
     return jsonify(result), status_code
 
@@ -163,7 +164,7 @@ if __name__ == '__main__':
     logger.info('Starting dataall flask local application')
     app.run(
         debug=True,  # nosec
-        threaded=False,
+        threaded=True,
         host='0.0.0.0',
         port=5000,
     )
@@ -0,0 +1,21 @@
+"""
+Saves the dataall tenant and the permissions of the active modules.
+Runs after `alembic upgrade head` in the database migration of every deployment,
+so that the API handler doesn't need to do it on cold start
+"""
+import logging
+import sys
+
+from dataall.base.db.connection import ENVNAME, get_engine
+from dataall.base.loader import load_modules, ImportMode
+from dataall.core.permissions.db import save_permissions_with_tenant
+
+root = logging.getLogger()
+root.setLevel(logging.INFO)
+if not root.hasHandlers():
+    root.addHandler(logging.StreamHandler(sys.stdout))
+
+if __name__ == '__main__':
+    # the modules add their permissions to the core permissions when they are loaded
+    load_modules(modes={ImportMode.API})
+    save_permissions_with_tenant(get_engine(ENVNAME))
@@ -0,0 +1,31 @@
+"""share_item_checkpoints
+
+Revision ID: 3e8f1a6c2d90
+Revises: 5d2a7c9e1b34
+Create Date: 2024-02-12 10:21:43.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3e8f1a6c2d90'
+down_revision = '5d2a7c9e1b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'share_object_item_checkpoint',
+        sa.Column('shareUri', sa.String(), nullable=False),
+        sa.Column('itemUri', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('step', sa.String(), nullable=False),
+        sa.Column('created', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('shareUri', 'itemUri', 'action', 'step'),
+    )
+
+
+def downgrade():
+    op.drop_table('share_object_item_checkpoint')
@@ -0,0 +1,23 @@
+"""stack_refreshed
+
+Revision ID: 5d2a7c9e1b34
+Revises: 8c4b1f2e9a7d
+Create Date: 2024-02-07 16:03:12.504118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d2a7c9e1b34'
+down_revision = '8c4b1f2e9a7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('stack', sa.Column('refreshed', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('stack', 'refreshed')
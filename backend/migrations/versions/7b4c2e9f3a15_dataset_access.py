@@ -0,0 +1,48 @@
+"""dataset_access
+
+Revision ID: 7b4c2e9f3a15
+Revises: 3e8f1a6c2d90
+Create Date: 2024-02-19 09:42:17.503311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7b4c2e9f3a15'
+down_revision = '3e8f1a6c2d90'
+branch_labels = None
+depends_on = None
+
+SHARED_STATES = "'Share_Succeeded', 'Share_In_Progress', 'Revoke_Failed', 'Revoke_In_Progress', 'Revoke_Approved'"
+
+
+def upgrade():
+    op.create_table(
+        'dataset_access',
+        sa.Column('principalId', sa.String(), nullable=False),
+        sa.Column('accessKind', sa.String(), nullable=False),
+        sa.Column('datasetUri', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('principalId', 'accessKind', 'datasetUri'),
+    )
+    op.create_index(op.f('ix_dataset_access_datasetUri'), 'dataset_access', ['datasetUri'], unique=False)
+
+    print('Back-filling dataset access...')
+    for column, kind in [('owner', 'Owner'), ('"SamlAdminGroupName"', 'Admin'), ('stewards', 'Steward')]:
+        op.execute(
+            f'INSERT INTO dataset_access ("principalId", "accessKind", "datasetUri") '
+            f'SELECT DISTINCT {column}, \'{kind}\', "datasetUri" FROM dataset WHERE {column} IS NOT NULL'
+        )
+    for column, kind in [('"principalId"', 'Shared'), ('owner', 'ShareRequester')]:
+        op.execute(
+            f'INSERT INTO dataset_access ("principalId", "accessKind", "datasetUri") '
+            f'SELECT DISTINCT s.{column}, \'{kind}\', s."datasetUri" FROM share_object s '
+            f'JOIN share_object_item i ON i."shareUri" = s."shareUri" '
+            f'WHERE i.status IN ({SHARED_STATES}) AND s.{column} IS NOT NULL'
+        )
+    print('Back-filling dataset access is complete')
+
+
+def downgrade():
+    op.drop_index(op.f('ix_dataset_access_datasetUri'), table_name='dataset_access')
+    op.drop_table('dataset_access')
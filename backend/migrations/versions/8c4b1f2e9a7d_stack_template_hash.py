@@ -0,0 +1,23 @@
+"""stack_template_hash
+
+Revision ID: 8c4b1f2e9a7d
+Revises: f6cd4ba7dd8d
+Create Date: 2024-02-05 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8c4b1f2e9a7d'
+down_revision = 'f6cd4ba7dd8d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('stack', sa.Column('templateHash', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('stack', 'templateHash')
@@ -0,0 +1,63 @@
+"""hot_path_indexes
+
+Revision ID: 9a6d3f1b7e42
+Revises: 7b4c2e9f3a15
+Create Date: 2024-02-26 14:05:32.871620
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9a6d3f1b7e42'
+down_revision = '7b4c2e9f3a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_share_object_item_shareUri_status', 'share_object_item', ['shareUri', 'status'], unique=False
+    )
+    op.create_index(
+        'ix_share_object_item_itemUri_status', 'share_object_item', ['itemUri', 'status'], unique=False
+    )
+    op.create_index(
+        'ix_term_link_targetUri_targetType', 'term_link', ['targetUri', 'targetType'], unique=False
+    )
+    op.create_index(
+        'ix_dataset_table_datasetUri_LastGlueTableStatus',
+        'dataset_table',
+        ['datasetUri', 'LastGlueTableStatus'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_notification_recipient_is_read', 'notification', ['recipient', 'is_read'], unique=False
+    )
+    op.create_index(
+        'ix_notification_recipient_unread',
+        'notification',
+        ['recipient'],
+        unique=False,
+        postgresql_where=sa.text('NOT is_read AND deleted IS NULL'),
+    )
+    op.create_index(
+        'ix_vote_targetUri_targetType', 'vote', ['targetUri', 'targetType'], unique=False
+    )
+    op.create_index(
+        'ix_resource_policy_resourceUri_principalId',
+        'resource_policy',
+        ['resourceUri', 'principalId'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_resource_policy_resourceUri_principalId', table_name='resource_policy')
+    op.drop_index('ix_vote_targetUri_targetType', table_name='vote')
+    op.drop_index('ix_notification_recipient_unread', table_name='notification')
+    op.drop_index('ix_notification_recipient_is_read', table_name='notification')
+    op.drop_index('ix_dataset_table_datasetUri_LastGlueTableStatus', table_name='dataset_table')
+    op.drop_index('ix_term_link_targetUri_targetType', table_name='term_link')
+    op.drop_index('ix_share_object_item_itemUri_status', table_name='share_object_item')
+    op.drop_index('ix_share_object_item_shareUri_status', table_name='share_object_item')
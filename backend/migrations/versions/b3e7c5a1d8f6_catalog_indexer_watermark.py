@@ -0,0 +1,31 @@
+"""catalog_indexer_watermark
+
+Revision ID: b3e7c5a1d8f6
+Revises: 9a6d3f1b7e42
+Create Date: 2024-03-04 11:17:52.246380
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b3e7c5a1d8f6'
+down_revision = '9a6d3f1b7e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'catalog_indexer_watermark',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('since', sa.DateTime(), nullable=False),
+        sa.Column('lastFullRun', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # the watermark used to be kept in a task record, the next run reindexes the whole catalog
+    op.execute("DELETE FROM task WHERE action = 'catalog.indexer.watermark'")
+
+
+def downgrade():
+    op.drop_table('catalog_indexer_watermark')
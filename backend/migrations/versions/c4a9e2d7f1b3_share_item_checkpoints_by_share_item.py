@@ -0,0 +1,46 @@
+"""share_item_checkpoints_by_share_item
+
+Revision ID: c4a9e2d7f1b3
+Revises: b3e7c5a1d8f6
+Create Date: 2024-03-06 16:48:09.512734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e2d7f1b3'
+down_revision = 'b3e7c5a1d8f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # checkpoints only live while a share is processed, without them a failed share redoes its completed steps
+    op.drop_table('share_object_item_checkpoint')
+    op.create_table(
+        'share_object_item_checkpoint',
+        sa.Column('shareItemUri', sa.String(), nullable=False),
+        sa.Column('shareUri', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('step', sa.String(), nullable=False),
+        sa.Column('created', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('shareItemUri', 'action', 'step'),
+    )
+    op.create_index(
+        op.f('ix_share_object_item_checkpoint_shareUri'), 'share_object_item_checkpoint', ['shareUri'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_share_object_item_checkpoint_shareUri'), table_name='share_object_item_checkpoint')
+    op.drop_table('share_object_item_checkpoint')
+    op.create_table(
+        'share_object_item_checkpoint',
+        sa.Column('shareUri', sa.String(), nullable=False),
+        sa.Column('itemUri', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('step', sa.String(), nullable=False),
+        sa.Column('created', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('shareUri', 'itemUri', 'action', 'step'),
+    )
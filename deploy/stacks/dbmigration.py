@@ -160,6 +160,7 @@ class DBMigrationStack(pyNestedClass):
                                 'export PYTHONPATH=backend',
                                 f'export envname={envname}',
                                 f'alembic -c backend/alembic.ini upgrade head',
+                                'python backend/migrations/seed_permissions.py',
                             ]
                         },
                     },
@@ -0,0 +1,40 @@
+import { gql } from 'apollo-boost';
+
+export const getAthenaSqlQueryResults = ({
+  environmentUri,
+  worksheetUri,
+  athenaQueryId,
+  nextToken
+}) => ({
+  variables: {
+    environmentUri,
+    worksheetUri,
+    athenaQueryId,
+    nextToken
+  },
+  query: gql`
+    query getAthenaSqlQueryResults(
+      $environmentUri: String!
+      $worksheetUri: String!
+      $athenaQueryId: String!
+      $nextToken: String
+    ) {
+      getAthenaSqlQueryResults(
+        environmentUri: $environmentUri
+        worksheetUri: $worksheetUri
+        athenaQueryId: $athenaQueryId
+        nextToken: $nextToken
+      ) {
+        AthenaQueryId
+        Status
+        Error
+        columns {
+          columnName
+          typeName
+        }
+        rows
+        nextToken
+      }
+    }
+  `
+});
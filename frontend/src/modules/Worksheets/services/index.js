@@ -1,6 +1,8 @@
 export * from './createWorksheet';
 export * from './deleteWorksheet';
+export * from './getAthenaSqlQueryResults';
 export * from './getWorksheet';
 export * from './listWorksheets';
 export * from './runAthenaSqlQuery';
+export * from './startAthenaSqlQuery';
 export * from './updateWorksheet';
@@ -0,0 +1,29 @@
+import { gql } from 'apollo-boost';
+
+export const startAthenaSqlQuery = ({
+  sqlQuery,
+  environmentUri,
+  worksheetUri
+}) => ({
+  variables: {
+    sqlQuery,
+    environmentUri,
+    worksheetUri
+  },
+  query: gql`
+    query startAthenaSqlQuery(
+      $environmentUri: String!
+      $worksheetUri: String!
+      $sqlQuery: String!
+    ) {
+      startAthenaSqlQuery(
+        environmentUri: $environmentUri
+        worksheetUri: $worksheetUri
+        sqlQuery: $sqlQuery
+      ) {
+        AthenaQueryId
+        Status
+      }
+    }
+  `
+});
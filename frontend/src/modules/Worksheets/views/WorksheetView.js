@@ -40,10 +40,17 @@ import {
 } from 'services';
 import {
   deleteWorksheet,
+  getAthenaSqlQueryResults,
   getWorksheet,
-  runAthenaSqlQuery,
+  startAthenaSqlQuery,
   updateWorksheet
 } from '../services';
+
+const QUERY_POLL_INTERVAL_MS = 1000;
+const MAX_RESULT_ROWS = 10000;
+const QUERY_RUNNING_STATES = ['QUEUED', 'RUNNING'];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
 import {
   SQLQueryEditor,
   WorksheetEditFormModal,
@@ -290,31 +297,80 @@ const WorksheetView = () => {
   const runQuery = useCallback(async () => {
     try {
       setRunningQuery(true);
-      const response = await client.query(
-        runAthenaSqlQuery({
+      const started = await client.query(
+        startAthenaSqlQuery({
           sqlQuery: sqlBody,
           environmentUri: currentEnv.environmentUri,
           worksheetUri: worksheet.worksheetUri
         })
       );
-      if (!response.errors) {
-        const athenaResults = response.data.runAthenaSqlQuery;
-        setResults({
-          rows: athenaResults.rows.map((c, index) => ({ ...c, id: index })),
-          columns: athenaResults.columns.map((c, index) => ({
-            ...c,
-            id: index
-          }))
+      if (started.errors) {
+        dispatch({ type: SET_ERROR, error: started.errors[0].message });
+        return;
+      }
+      const athenaQueryId = started.data.startAthenaSqlQuery.AthenaQueryId;
+      const fetchPage = async (nextToken) => {
+        const response = await client.query(
+          getAthenaSqlQueryResults({
+            environmentUri: currentEnv.environmentUri,
+            worksheetUri: worksheet.worksheetUri,
+            athenaQueryId,
+            nextToken
+          })
+        );
+        if (response.errors) {
+          throw new Error(response.errors[0].message);
+        }
+        return response.data.getAthenaSqlQueryResults;
+      };
+
+      let page = await fetchPage(null);
+      while (QUERY_RUNNING_STATES.includes(page.Status)) {
+        await sleep(QUERY_POLL_INTERVAL_MS);
+        page = await fetchPage(null);
+      }
+      if (page.Status !== 'SUCCEEDED') {
+        dispatch({
+          type: SET_ERROR,
+          error: page.Error || `Query ${page.Status}`
         });
-      } else {
-        dispatch({ type: SET_ERROR, error: response.errors[0].message });
+        return;
       }
+
+      const columns = page.columns;
+      const rows = [...page.rows];
+      while (page.nextToken && rows.length < MAX_RESULT_ROWS) {
+        page = await fetchPage(page.nextToken);
+        rows.push(...page.rows);
+      }
+      if (page.nextToken || rows.length > MAX_RESULT_ROWS) {
+        enqueueSnackbar(`Showing the first ${MAX_RESULT_ROWS} rows`, {
+          anchorOrigin: {
+            horizontal: 'right',
+            vertical: 'top'
+          },
+          variant: 'info'
+        });
+      }
+      setResults({
+        rows: rows.slice(0, MAX_RESULT_ROWS).map((row, index) => ({
+          id: index,
+          cells: row.map((value, position) => ({
+            ...columns[position],
+            value
+          }))
+        })),
+        columns: columns.map((c, index) => ({
+          ...c,
+          id: index
+        }))
+      });
     } catch (e) {
       dispatch({ type: SET_ERROR, error: e.message });
     } finally {
       setRunningQuery(false);
     }
-  }, [client, dispatch, currentEnv, sqlBody]);
+  }, [client, dispatch, enqueueSnackbar, currentEnv, worksheet, sqlBody]);
 
   const deleteWorksheetfunction = useCallback(async () => {
     const response = await client.mutate(
@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from dataall.base.api.dataloader import DataLoaders
+
+
+class _Engine:
+    @contextmanager
+    def scoped_session(self):
+        yield None
+
+
+class _Dataset(SimpleNamespace):
+    pass
+
+
+def test_keys_of_a_list_are_loaded_in_one_batch():
+    calls = []
+
+    def batch_load(session, keys):
+        calls.append(sorted(keys))
+        return {key: f'environment of {key}' for key in keys if key != 'missing'}
+
+    loaders = DataLoaders(_Engine())
+    datasets = [_Dataset(environmentUri=uri) for uri in ['env1', 'env2', 'env1', 'missing']]
+    loaders.track({'count': 4, 'nodes': datasets})
+
+    environments = [loaders.load('environment', dataset, 'environmentUri', batch_load) for dataset in datasets]
+
+    assert environments == ['environment of env1', 'environment of env2', 'environment of env1', None]
+    assert calls == [['env1', 'env2', 'missing']]
+    assert loaders.stats() == {'environment': 1}
+
+
+def test_loader_default_value():
+    loaders = DataLoaders(_Engine())
+    dashboard = _Dataset(dashboardUri='dashboard1')
+
+    assert loaders.load('upvotes', dashboard, 'dashboardUri', lambda session, keys: {}, default=0) == 0
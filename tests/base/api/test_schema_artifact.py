@@ -0,0 +1,33 @@
+from dataall.base.api import bootstrap, get_executable_schema, load_type_defs, write_schema_artifact
+
+
+def test_schema_artifact_is_loaded(mocker, tmp_path):
+    artifact = str(tmp_path / 'schema.graphql')
+    mocker.patch('dataall.base.api.SCHEMA_ARTIFACT', artifact)
+    schema = bootstrap()
+    generated = load_type_defs(schema)
+
+    write_schema_artifact(artifact)
+    gql = mocker.patch('dataall.base.api.GQL')
+
+    assert load_type_defs(schema) == generated
+    gql.assert_not_called()
+    assert get_executable_schema(schema).type_map.keys()
+
+
+def test_stale_schema_artifact_is_ignored(mocker, tmp_path):
+    artifact = tmp_path / 'schema.graphql'
+    artifact.write_text('# modules: unknown\ntype Query { stale: String }')
+    mocker.patch('dataall.base.api.SCHEMA_ARTIFACT', str(artifact))
+
+    assert 'stale' not in load_type_defs(bootstrap())
+
+
+def test_schema_is_generated_without_artifact(mocker, tmp_path):
+    artifact = str(tmp_path / 'schema.graphql')
+    write_schema_artifact(artifact)
+    mocker.patch('dataall.base.api.SCHEMA_ARTIFACT', None)
+    gql = mocker.patch('dataall.base.api.GQL', return_value='type Query { generated: String }')
+
+    assert load_type_defs(bootstrap()) == 'type Query { generated: String }'
+    gql.assert_called_once()
@@ -0,0 +1,43 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.aws.sqs import SqsQueue
+
+
+@pytest.fixture
+def sqs_client(mocker):
+    client = MagicMock()
+    client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+    mocker.patch('dataall.base.aws.sqs.Parameter.get_parameter', return_value='queue-url')
+    mocker.patch.object(SqsQueue, 'get_sqs_client', return_value=client)
+    yield client
+
+
+def test_send_outside_of_a_batch(sqs_client):
+    SqsQueue.send(engine=None, task_ids=['task1'])
+
+    sqs_client.send_message_batch.assert_called_once()
+    entries = sqs_client.send_message_batch.call_args.kwargs['Entries']
+    assert [json.loads(e['MessageBody']) for e in entries] == [['task1']]
+
+
+def test_tasks_of_a_batch_are_sent_together(sqs_client, mocker):
+    mocker.patch('dataall.base.aws.sqs.TASKS_PER_MESSAGE', 2)
+    task_ids = [f'task{i}' for i in range(25)]
+
+    with SqsQueue.batch():
+        for task_id in task_ids:
+            SqsQueue.send(engine=None, task_ids=[task_id])
+        sqs_client.send_message_batch.assert_not_called()
+
+    # 13 messages of up to 2 tasks, sent with 2 requests of up to 10 entries
+    assert sqs_client.send_message_batch.call_count == 2
+    bodies = [
+        json.loads(entry['MessageBody'])
+        for call in sqs_client.send_message_batch.call_args_list
+        for entry in call.kwargs['Entries']
+    ]
+    assert len(bodies) == 13
+    assert [task_id for body in bodies for task_id in body] == task_ids
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.aws.sts import SessionHelper
+
+
+@pytest.fixture
+def sts(mocker):
+    SessionHelper.clear_session_cache()
+    mocker.patch('dataall.base.aws.sts.SessionHelper.get_external_id_secret', return_value='external-id')
+    sts = MagicMock()
+    sts.assume_role.side_effect = lambda **kwargs: {
+        'Credentials': {
+            'AccessKeyId': 'key',
+            'SecretAccessKey': 'secret',
+            'SessionToken': 'token',
+            'Expiration': datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+        }
+    }
+    base_session = MagicMock()
+    base_session.client.return_value = sts
+    yield sts, base_session
+    SessionHelper.clear_session_cache()
+
+
+expires_in = 3600
+
+
+def test_assumed_session_is_cached(sts):
+    sts, base_session = sts
+    first = SessionHelper.get_session(base_session, role_arn='arn:aws:iam::111111111111:role/pivot')
+    second = SessionHelper.get_session(base_session, role_arn='arn:aws:iam::111111111111:role/pivot')
+    other = SessionHelper.get_session(base_session, role_arn='arn:aws:iam::222222222222:role/pivot')
+
+    assert first is second
+    assert other is not first
+    assert sts.assume_role.call_count == 2
+    assert SessionHelper.session_cache_stats()['hits'] == 1
+    assert SessionHelper.session_cache_stats()['misses'] == 2
+
+
+def test_session_is_refreshed_before_expiry(sts, mocker):
+    sts, base_session = sts
+    mocker.patch('tests.base.aws.test_sts.expires_in', 60)
+    SessionHelper.get_session(base_session, role_arn='arn:aws:iam::111111111111:role/pivot')
+    SessionHelper.get_session(base_session, role_arn='arn:aws:iam::111111111111:role/pivot')
+
+    assert sts.assume_role.call_count == 2
+
+
+def test_clients_are_cached_per_service_and_region():
+    session = MagicMock()
+    session.client.side_effect = lambda *args, **kwargs: MagicMock()
+
+    s3 = SessionHelper.get_client(session, 's3', region_name='eu-west-1')
+    assert SessionHelper.get_client(session, 's3', region_name='eu-west-1') is s3
+    assert SessionHelper.get_client(session, 's3', region_name='us-east-1') is not s3
+    assert session.client.call_count == 2
@@ -0,0 +1,94 @@
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.cdkproxy import cdk_cli_wrapper
+from dataall.core.stacks.db.stack_models import Stack
+
+
+def _synth(template):
+    def run(args, env, cwd):
+        if args[0] == 'synth':
+            assembly_dir = args[-1]
+            with open(os.path.join(assembly_dir, 'stack.template.json'), 'w') as f:
+                json.dump(template, f)
+        return MagicMock(returncode=0)
+
+    return run
+
+
+@pytest.fixture
+def stack(db):
+    with db.scoped_session() as session:
+        stack = Stack(name='stack', targetUri='uri', accountid='111111111111', region='eu-west-1', stack='environment')
+        session.add(stack)
+    yield stack
+
+
+@pytest.fixture
+def mock_cdk(mocker):
+    mocker.patch.object(cdk_cli_wrapper, 'boto3')
+    mocker.patch.object(
+        cdk_cli_wrapper, 'describe_stack', return_value={'StackId': 'arn:stack', 'StackStatus': 'UPDATE_COMPLETE'}
+    )
+    mocker.patch.object(cdk_cli_wrapper, 'update_stack_output')
+
+
+def test_hash_cloud_assembly(tmp_path):
+    (tmp_path / 'stack.template.json').write_text('{"Resources": {}}')
+    (tmp_path / 'stack.assets.json').write_text('{"files": {"abc": {}}}')
+    (tmp_path / 'manifest.json').write_text('{"version": "1"}')
+    before = cdk_cli_wrapper.hash_cloud_assembly(str(tmp_path))
+
+    (tmp_path / 'manifest.json').write_text('{"version": "2"}')
+    assert cdk_cli_wrapper.hash_cloud_assembly(str(tmp_path)) == before
+
+    (tmp_path / 'stack.assets.json').write_text('{"files": {"def": {}}}')
+    assert cdk_cli_wrapper.hash_cloud_assembly(str(tmp_path)) != before
+
+
+def test_deploy_is_skipped_when_templates_did_not_change(db, stack, mock_cdk, mocker):
+    run = mocker.patch.object(cdk_cli_wrapper, '_run_cdk_command', side_effect=_synth({'Resources': {}}))
+
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert [call.args[0][0] for call in run.call_args_list] == ['synth', 'deploy --all']
+
+    run.reset_mock()
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert [call.args[0][0] for call in run.call_args_list] == ['synth']
+
+    with db.scoped_session() as session:
+        assert session.query(Stack).get(stack.stackUri).status == 'UPDATE_COMPLETE'
+
+    run.side_effect = _synth({'Resources': {'Bucket': {}}})
+    run.reset_mock()
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert [call.args[0][0] for call in run.call_args_list] == ['synth', 'deploy --all']
+
+
+def test_in_process_synth_falls_back_to_cdk_cli(stack, mocker, tmp_path):
+    from dataall.base.cdkproxy import synth_worker
+
+    mocker.patch.object(synth_worker, 'synth', return_value=False)
+    run = mocker.patch.object(cdk_cli_wrapper, '_run_cdk_command', side_effect=_synth({'Resources': {}}))
+
+    template_hash = cdk_cli_wrapper.synth_cdk_stack(stack, [], './app.py', str(tmp_path), {}, '.', in_process=True)
+
+    assert template_hash
+    assert run.call_args.args[0][0] == 'synth'
+
+
+def test_in_process_synth(stack, mocker, tmp_path):
+    from dataall.base.cdkproxy import synth_worker
+
+    def synth(stack, assembly_dir):
+        (tmp_path / 'stack.template.json').write_text('{"Resources": {}}')
+        return True
+
+    mocker.patch.object(synth_worker, 'synth', side_effect=synth)
+    run = mocker.patch.object(cdk_cli_wrapper, '_run_cdk_command')
+
+    assert cdk_cli_wrapper.synth_cdk_stack(stack, [], './app.py', str(tmp_path), {}, '.', in_process=True)
+    run.assert_not_called()
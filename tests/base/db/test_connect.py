@@ -1,4 +1,6 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import dataall
 
 
@@ -17,3 +19,36 @@ def test(db: dataall.base.db.Engine):
                 assert nb == 0
     else:
         assert True
+
+
+def test_session_per_thread(db: dataall.base.db.Engine):
+    assert db.session() is db.session()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(db.session).result()
+    assert other is not db.session()
+
+
+def test_pool_metrics(db: dataall.base.db.Engine):
+    with db.scoped_session() as session:
+        session.execute('SELECT 1')
+        metrics = db.pool_metrics()
+        assert metrics['checked_out'] >= 1
+
+    metrics = db.pool_metrics()
+    assert metrics['size'] == db.pool_config.size
+    assert metrics['checkouts'] >= 1
+    assert metrics['waits'] == 0
+
+
+def test_pool_metrics_count_checkouts_of_all_threads(db: dataall.base.db.Engine):
+    before = db.pool_metrics()['checkouts']
+
+    def checkout(_):
+        with db.engine.connect() as connection:
+            connection.execute('SELECT 1')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(checkout, range(20)))
+
+    assert db.pool_metrics()['checkouts'] - before == 20
+    assert db.engine.pool.max_overflow == db.pool_config.max_overflow
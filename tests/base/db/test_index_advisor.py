@@ -0,0 +1,193 @@
+"""
+Index advisor: runs EXPLAIN on the key queries of the repositories against a seeded database
+and fails when a plan scans one of the large tables sequentially, or does not use the index added for the query.
+Sequential scans are disabled for the EXPLAIN, so the planner only picks one when no index can serve the query.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from dataall.core.permissions.db import permission_models
+from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
+from dataall.modules.catalog.db.glossary_models import TermLink
+from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
+from dataall.modules.dataset_sharing.db.share_object_models import ShareObjectItem
+from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository
+from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareableType
+from dataall.modules.datasets_base.db.dataset_models import DatasetTable, DatasetAccess
+from dataall.modules.datasets_base.db.dataset_repositories import DatasetRepository
+from dataall.modules.datasets_base.services.datasets_base_enums import DatasetAccessKind
+from dataall.modules.notifications.db.notification_models import Notification
+from dataall.modules.notifications.db.notification_repositories import NotificationRepository
+from dataall.modules.vote.db.vote_models import Vote
+from dataall.modules.vote.db.vote_repositories import VoteRepository
+
+LARGE_TABLES = {
+    'share_object_item',
+    'term_link',
+    'dataset_table',
+    'notification',
+    'vote',
+    'resource_policy',
+    'dataset_access',
+}
+SEEDED_ROWS = 2000
+
+
+@pytest.fixture(scope='module', autouse=True)
+def seed(db):
+    rows = range(SEEDED_ROWS)
+    with db.scoped_session() as session:
+        session.bulk_insert_mappings(ShareObjectItem, [
+            dict(
+                shareUri=f'share{i % 100}',
+                itemUri=f'item{i}',
+                itemType=ShareableType.Table.value,
+                itemName=f'item{i}',
+                owner='alice',
+                status=ShareItemStatus.Share_Succeeded.value if i % 2 else ShareItemStatus.Revoke_Succeeded.value,
+            ) for i in rows
+        ])
+        session.bulk_insert_mappings(TermLink, [
+            dict(nodeUri=f'term{i % 10}', targetUri=f'target{i}', targetType='Dataset', owner='alice')
+            for i in rows
+        ])
+        session.bulk_insert_mappings(DatasetTable, [
+            dict(
+                datasetUri=f'dataset{i % 100}',
+                label=f'table{i}',
+                name=f'table{i}',
+                owner='alice',
+                AWSAccountId='1' * 12,
+                S3BucketName='bucket',
+                S3Prefix=f'table{i}',
+                GlueDatabaseName='database',
+                GlueTableName=f'table{i}',
+            ) for i in rows
+        ])
+        session.bulk_insert_mappings(Notification, [
+            dict(message='message', recipient=f'group{i % 100}', is_read=bool(i % 3)) for i in rows
+        ])
+        session.bulk_insert_mappings(Vote, [
+            dict(username=f'user{i % 100}', targetUri=f'target{i % 500}', targetType='dataset', upvote=True)
+            for i in rows
+        ])
+        session.bulk_insert_mappings(permission_models.ResourcePolicy, [
+            dict(resourceUri=f'resource{i}', resourceType='Dataset', principalId=f'group{i % 100}')
+            for i in rows
+        ])
+        session.bulk_insert_mappings(DatasetAccess, [
+            dict(principalId=f'group{i % 100}', accessKind=DatasetAccessKind.Shared.value, datasetUri=f'dataset{i}')
+            for i in rows
+        ])
+    with db.scoped_session() as session:
+        for table in LARGE_TABLES:
+            session.execute(f'ANALYZE {table}')
+
+
+@contextmanager
+def captured_selects(db):
+    """Records the SELECT statements sent to the database with their parameters"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def explain(session, statement, parameters):
+    """The tables scanned sequentially and the indexes scanned by the plan of the statement"""
+    session.execute('SET LOCAL enable_seqscan = off')
+    cursor = session.connection().connection.cursor()
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+    plans = [cursor.fetchone()[0][0]['Plan']]
+    tables, indexes = set(), set()
+    while plans:
+        plan = plans.pop()
+        if plan['Node Type'] == 'Seq Scan':
+            tables.add(plan['Relation Name'])
+        if 'Index Name' in plan:
+            indexes.add(plan['Index Name'])
+        plans.extend(plan.get('Plans', []))
+    return tables, indexes
+
+
+@pytest.mark.parametrize(
+    'run_query,expected_indexes',
+    [
+        (
+            lambda session: ShareObjectRepository.has_shared_items(session, 'item1'),
+            {'ix_share_object_item_itemUri_status'},
+        ),
+        (
+            lambda session: ShareObjectRepository.count_items_in_states(
+                session, 'share1', [ShareItemStatus.Share_Succeeded.value]
+            ),
+            {'ix_share_object_item_shareUri_status'},
+        ),
+        (
+            lambda session: ShareObjectRepository.paginated_user_datasets(session, 'alice', ['group1'], {}),
+            {'dataset_access_pkey'},
+        ),
+        (
+            lambda session: GlossaryRepository.get_glossary_terms_links(session, 'target1', 'Dataset'),
+            {'ix_term_link_targetUri_targetType'},
+        ),
+        (
+            lambda session: DatasetRepository.paginated_dataset_tables(session, 'dataset1', {}),
+            {'ix_dataset_table_datasetUri_LastGlueTableStatus'},
+        ),
+        (
+            lambda session: NotificationRepository.count_unread_notifications(session, 'alice', ['group1', 'group2']),
+            {'ix_notification_recipient_unread'},
+        ),
+        (
+            lambda session: NotificationRepository.paginated_notifications(session, 'alice', ['group1'], {'read': True}),
+            {'ix_notification_recipient_is_read'},
+        ),
+        (
+            lambda session: VoteRepository.count_upvotes(session, 'target1', 'dataset'),
+            {'ix_vote_targetUri_targetType'},
+        ),
+        (
+            lambda session: ResourcePolicy.find_resource_policy(session, 'group1', 'resource1'),
+            # the resource uri alone is selective enough for the planner to prefer its own index
+            {
+                'ix_resource_policy_resourceUri_principalId',
+                'ix_resource_policy_resourceUri',
+                'ix_resource_policy_principalId',
+            },
+        ),
+    ],
+    ids=[
+        'share_items_by_item',
+        'share_items_by_share',
+        'user_datasets',
+        'term_links',
+        'dataset_tables',
+        'unread_notifications',
+        'read_notifications',
+        'upvotes',
+        'resource_policy',
+    ],
+)
+def test_queries_use_their_index(db, run_query, expected_indexes):
+    with db.scoped_session() as session:
+        with captured_selects(db) as statements:
+            run_query(session)
+        assert statements
+
+        used_indexes = set()
+        for statement, parameters in statements:
+            scanned, indexes = explain(session, statement, parameters)
+            scanned &= LARGE_TABLES
+            assert not scanned, f'Sequential scan on {scanned} for: {statement}'
+            used_indexes |= indexes
+        assert used_indexes & expected_indexes, f'None of {expected_indexes} used, the plans use {used_indexes}'
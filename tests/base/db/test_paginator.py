@@ -0,0 +1,34 @@
+from dataall.base.db import paginate, paginate_by_cursor
+from dataall.core.permissions.db.permission_models import Permission
+
+
+def test_paginate_without_count(db):
+    with db.scoped_session() as session:
+        query = session.query(Permission).order_by(Permission.permissionUri)
+        total = query.count()
+
+        page = paginate(query, page=1, page_size=5, with_count=False).to_dict()
+        assert page['count'] is None
+        assert page['pages'] is None
+        assert len(page['nodes']) == 5
+        assert page['hasNext'] == (total > 5)
+
+
+def test_paginate_by_cursor(db):
+    with db.scoped_session() as session:
+        query = session.query(Permission)
+        order_by = [Permission.name, Permission.permissionUri]
+        expected = [p.permissionUri for p in query.order_by(*order_by).all()]
+
+        page = paginate_by_cursor(query, order_by, page_size=7).to_dict()
+        assert page['count'] == len(expected)
+        assert not page['hasPrevious']
+
+        fetched = [p.permissionUri for p in page['nodes']]
+        while page['hasNext']:
+            page = paginate_by_cursor(query, order_by, page_size=7, cursor=page['nextCursor']).to_dict()
+            assert page['count'] is None
+            assert page['hasPrevious']
+            fetched += [p.permissionUri for p in page['nodes']]
+
+        assert fetched == expected
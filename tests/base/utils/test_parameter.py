@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from dataall.base.utils import Parameter
+
+
+@pytest.fixture
+def ssm(mocker):
+    Parameter.invalidate()
+    ssm = MagicMock()
+    mocker.patch.object(Parameter, 'ssm', return_value=ssm)
+    yield ssm
+    Parameter.invalidate()
+
+
+def test_parameter_is_cached(ssm):
+    ssm.get_parameter.return_value = {'Parameter': {'Value': 'https://queue'}}
+
+    assert Parameter.get_parameter(env='test', path='sqs/queue_url') == 'https://queue'
+    assert Parameter.get_parameter(env='test', path='sqs/queue_url') == 'https://queue'
+    assert ssm.get_parameter.call_count == 1
+
+    Parameter.invalidate(env='test', path='sqs/queue_url')
+    Parameter.get_parameter(env='test', path='sqs/queue_url')
+    assert ssm.get_parameter.call_count == 2
+
+
+def test_missing_parameter_is_cached(ssm):
+    ssm.get_parameter.side_effect = ClientError({'Error': {'Code': 'ParameterNotFound'}}, 'GetParameter')
+
+    assert Parameter.get_parameter(env='test', path='reauth/apis') is None
+    assert Parameter.get_parameter(env='test', path='reauth/apis') is None
+    assert ssm.get_parameter.call_count == 1
+
+
+def test_prefetch(ssm):
+    ssm.get_paginator.return_value.paginate.return_value = [
+        {'Parameters': [{'Name': '/dataall/test/sqs/queue_url', 'Value': 'https://queue'}]}
+    ]
+
+    Parameter.prefetch(env='test', prefixes=['sqs'])
+
+    assert Parameter.get_parameter(env='test', path='sqs/queue_url') == 'https://queue'
+    assert Parameter.get_parameter(env='test', path='sqs/other') is None
+    ssm.get_parameter.assert_not_called()
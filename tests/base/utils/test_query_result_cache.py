@@ -0,0 +1,57 @@
+from dataall.base.utils.query_result_cache import QueryResultCache, normalize_sql, is_cacheable_query
+
+
+def test_equivalent_queries_share_a_key():
+    assert normalize_sql('select *\n  from  t ;') == 'select * from t'
+    key = QueryResultCache.key('worksheet', normalize_sql('select * from t;'), 'workgroup')
+    assert key == QueryResultCache.key('worksheet', normalize_sql(' select *  from t'), 'workgroup')
+    assert key != QueryResultCache.key('worksheet', normalize_sql('select * from t'), 'other')
+
+
+def test_literals_and_comments_are_not_normalized():
+    assert normalize_sql("select * from t where name = 'a  b'") != normalize_sql("select * from t where name = 'a b'")
+    assert normalize_sql('select "a  b" from t') != normalize_sql('select "a b" from t')
+    assert normalize_sql('select a -- comment\nfrom t') != normalize_sql('select a -- comment from t')
+    assert normalize_sql("select  'it''s  here' ,  b") == "select 'it''s  here' , b"
+
+
+def test_results_are_cached_until_they_expire(mocker):
+    now = mocker.patch('dataall.base.utils.query_result_cache.time.time', return_value=1000)
+    cache = QueryResultCache(ttl=60, max_entries=10, max_result_size=1000)
+    run = mocker.MagicMock(return_value={'rows': [1]})
+
+    assert cache.get_or_run('key', run) == {'rows': [1]}
+    assert cache.get_or_run('key', run) == {'rows': [1]}
+    assert run.call_count == 1
+
+    now.return_value = 1061
+    cache.get_or_run('key', run)
+    assert run.call_count == 2
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 2}
+
+
+def test_cache_limits():
+    cache = QueryResultCache(ttl=60, max_entries=2, max_result_size=20)
+    cache.put('big', {'rows': ['x' * 100]})
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('big') is None
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_only_deterministic_read_only_queries_are_cacheable():
+    assert is_cacheable_query('select * from t')
+    assert is_cacheable_query('-- comment\n(SELECT 1)')
+    assert is_cacheable_query('WITH a AS (select 1) select * from a')
+    assert is_cacheable_query("select * from t where name = 'now'")
+    assert not is_cacheable_query('insert into t select * from s')
+    assert not is_cacheable_query('create table t as select * from s')
+    assert not is_cacheable_query('msck repair table t')
+    assert not is_cacheable_query('/* select */ drop table t')
+    assert not is_cacheable_query('select rand() from t')
+    assert not is_cacheable_query('select * from t where day = current_date')
@@ -204,5 +204,6 @@ def mock_aws_client(module_mocker):
     session_helper.get_session.return_value = session
     session_helper.remote_session.return_value = session
     session.client.return_value = aws_client
+    session_helper.get_client.return_value = aws_client
 
     yield aws_client
@@ -1,11 +1,38 @@
-from dataall.core.environment.tasks.env_stacks_updater import update_stacks
+from dataall.core.environment.tasks.env_stacks_updater import update_stacks, StackUpdateScheduler
 
 
 def test_stacks_update(db, org_fixture, env_fixture, mocker):
     mocker.patch(
         'dataall.core.environment.tasks.env_stacks_updater.update_stack',
-        return_value=True,
+        return_value=None,
     )
     envs, others = update_stacks(engine=db, envname='local')
     assert envs == 1
     assert others == 0
+
+
+def test_stack_update_scheduler(mocker):
+    started = []
+
+    def start(session, envname, target_uri):
+        started.append(target_uri)
+        return f'arn:{target_uri}'
+
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.update_stack', side_effect=start)
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.Parameter.get_parameter', return_value='cluster')
+    describe = mocker.patch(
+        'dataall.core.environment.tasks.env_stacks_updater.Ecs.describe_tasks',
+        side_effect=lambda cluster_name, task_arns: {
+            arn: {'lastStatus': 'STOPPED', 'containers': [{'exitCode': 1 if arn == 'arn:env2' else 0}]}
+            for arn in task_arns
+        },
+    )
+
+    scheduler = StackUpdateScheduler(session=None, envname='local', max_running=2, sleep_time=0)
+    scheduler.run({'env1': [], 'env2': [], 'dataset1': ['env1'], 'dataset2': ['env2']})
+
+    assert started[:2] == ['env1', 'env2']
+    assert set(started[2:]) == {'dataset1', 'dataset2'}
+    assert describe.call_count == 2
+    assert scheduler.report()['failed'] == ['env2']
+    assert len(scheduler.report()['timings']) == 4
@@ -2,7 +2,7 @@ from dataall.core.environment.api.enums import EnvironmentPermission
 from dataall.core.environment.db.environment_models import Environment
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
-from dataall.core.permissions.permissions import REMOVE_ENVIRONMENT_CONSUMPTION_ROLE
+from dataall.core.permissions.permissions import REMOVE_ENVIRONMENT_CONSUMPTION_ROLE, GET_ORGANIZATION
 
 
 def get_env(client, env_fixture, group):
@@ -259,6 +259,32 @@ def test_list_environments_no_filter(org_fixture, env_fixture, client, group):
     assert response.data.listEnvironments.count == 1
 
 
+def test_list_environments_checks_organizations_at_once(org_fixture, env_fixture, client, group, mocker):
+    spy = mocker.spy(ResourcePolicy, 'has_user_resource_permission')
+    response = client.query(
+        """
+    query ListEnvironments($filter:EnvironmentFilter){
+        listEnvironments(filter:$filter){
+            count
+            nodes{
+                environmentUri
+                organization{
+                    organizationUri
+                }
+            }
+        }
+    }
+    """,
+        username='alice',
+        groups=[group.name],
+    )
+
+    assert response.data.listEnvironments.nodes[0].organization.organizationUri == org_fixture.organizationUri
+    assert not [
+        call for call in spy.call_args_list if call.kwargs['permission_name'] == GET_ORGANIZATION
+    ]
+
+
 def test_list_environment_role_filter_as_creator(org_fixture, env_fixture, client, group):
     response = client.query(
         """
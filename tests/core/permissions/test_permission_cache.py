@@ -0,0 +1,106 @@
+import pytest
+
+from dataall.base.context import set_context, dispose_context, RequestContext
+from dataall.base.db import exceptions
+from dataall.core.environment.db.environment_models import Environment
+from dataall.core.permissions.db.resource_policy_repositories import ResourcePolicy
+from dataall.core.permissions.permission_cache import PermissionCache, PRELOAD_THRESHOLD
+from dataall.core.permissions.permission_checker import has_resource_permission, filter_authorized_resources
+from dataall.core.permissions.permissions import ENVIRONMENT_ALL, GET_ENVIRONMENT
+
+from tests.core.permissions.test_permission import permissions
+
+
+@has_resource_permission(GET_ENVIRONMENT)
+def get_environment(uri):
+    return uri
+
+
+@has_resource_permission(GET_ENVIRONMENT, param_name='uris')
+def get_environments(uris):
+    return uris
+
+
+@pytest.fixture(scope='function')
+def context(db, user, group):
+    permissions(db, ENVIRONMENT_ALL)
+    set_context(RequestContext(db, user.username, [group.name], user_id=user.username))
+    yield
+    dispose_context()
+
+
+def test_resource_decision_is_cached(db, group, context, mocker):
+    with db.scoped_session() as session:
+        ResourcePolicy.attach_resource_policy(
+            session=session,
+            group=group.name,
+            permissions=[GET_ENVIRONMENT],
+            resource_uri='cached-env',
+            resource_type=Environment.__name__,
+        )
+
+    spy = mocker.spy(ResourcePolicy, 'has_user_resource_permission')
+    assert get_environment(uri='cached-env') == 'cached-env'
+    assert get_environment(uri='cached-env') == 'cached-env'
+    assert spy.call_count == 1
+    assert PermissionCache.get_resource_decision([group.name], 'cached-env', GET_ENVIRONMENT)
+
+
+def test_cache_is_invalidated_on_policy_change(db, group, context):
+    with db.scoped_session() as session:
+        ResourcePolicy.attach_resource_policy(
+            session=session,
+            group=group.name,
+            permissions=[GET_ENVIRONMENT],
+            resource_uri='revoked-env',
+            resource_type=Environment.__name__,
+        )
+        assert get_environment(uri='revoked-env') == 'revoked-env'
+
+        ResourcePolicy.delete_resource_policy(session=session, group=group.name, resource_uri='revoked-env')
+
+    with pytest.raises(exceptions.ResourceUnauthorized):
+        get_environment(uri='revoked-env')
+
+
+def test_bulk_preload(db, group, context, mocker):
+    uris = [f'preloaded-env-{i}' for i in range(PRELOAD_THRESHOLD + 5)]
+    with db.scoped_session() as session:
+        for uri in uris:
+            ResourcePolicy.attach_resource_policy(
+                session=session,
+                group=group.name,
+                permissions=[GET_ENVIRONMENT],
+                resource_uri=uri,
+                resource_type=Environment.__name__,
+            )
+
+    spy = mocker.spy(ResourcePolicy, 'has_user_resource_permission')
+    for uri in uris:
+        assert get_environment(uri=uri) == uri
+
+    assert spy.call_count == PRELOAD_THRESHOLD
+    with pytest.raises(exceptions.ResourceUnauthorized):
+        get_environment(uri='unknown-env')
+
+
+def test_filter_authorized_resources(db, group, context, mocker):
+    with db.scoped_session() as session:
+        for uri in ['bulk-env-1', 'bulk-env-2']:
+            ResourcePolicy.attach_resource_policy(
+                session=session,
+                group=group.name,
+                permissions=[GET_ENVIRONMENT],
+                resource_uri=uri,
+                resource_type=Environment.__name__,
+            )
+
+        uris = ['bulk-env-1', 'bulk-env-3', 'bulk-env-2']
+        spy = mocker.spy(ResourcePolicy, 'filter_authorized_resources')
+        assert filter_authorized_resources(session, uris, GET_ENVIRONMENT) == ['bulk-env-1', 'bulk-env-2']
+        assert filter_authorized_resources(session, uris, GET_ENVIRONMENT) == ['bulk-env-1', 'bulk-env-2']
+        assert spy.call_count == 1
+
+    assert get_environments(uris=['bulk-env-1', 'bulk-env-2']) == ['bulk-env-1', 'bulk-env-2']
+    with pytest.raises(exceptions.ResourceUnauthorized):
+        get_environments(uris=['bulk-env-1', 'bulk-env-3'])
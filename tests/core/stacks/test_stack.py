@@ -1,3 +1,7 @@
+from dataall.core.stacks.api.stack_helper import DESCRIBE_STACK_ACTION
+from dataall.core.tasks.db.task_models import Task
+
+
 def test_update_stack(
     client,
     tenant,
@@ -27,3 +31,39 @@ def update_stack_query(client, target_uri, target_type, group):
         groups=[group],
     )
     return response
+
+
+def test_get_stack_queues_one_refresh(client, db, group, env_fixture):
+    stack_uri = update_stack_query(
+        client, env_fixture.environmentUri, 'environment', group.name
+    ).data.updateStack.stackUri
+
+    def describe_tasks():
+        with db.scoped_session() as session:
+            return session.query(Task).filter(
+                Task.targetUri == stack_uri, Task.action == DESCRIBE_STACK_ACTION
+            ).count()
+
+    before = describe_tasks()
+    for _ in range(3):
+        response = get_stack_query(client, env_fixture.environmentUri, stack_uri, group.name)
+        assert response.data.getStack.stackUri == stack_uri
+    assert describe_tasks() == before + 1
+
+
+def get_stack_query(client, environment_uri, stack_uri, group):
+    return client.query(
+        """
+        query getStack($environmentUri:String!, $stackUri:String!){
+            getStack(environmentUri:$environmentUri, stackUri:$stackUri){
+                stackUri
+                status
+                refreshed
+            }
+        }
+        """,
+        environmentUri=environment_uri,
+        stackUri=stack_uri,
+        username='alice',
+        groups=[group],
+    )
@@ -0,0 +1,71 @@
+import pytest
+
+from dataall.core.tasks.db.task_models import Task
+from dataall.core.tasks.service_handlers import WorkerHandler
+
+
+@pytest.fixture
+def worker():
+    worker = WorkerHandler()
+    processed = []
+
+    @worker.handler(path='test.task.ok')
+    def ok(engine, task: Task):
+        processed.append(task.taskUri)
+        return {'target': task.targetUri}
+
+    @worker.handler(path='test.task.fail')
+    def fail(engine, task: Task):
+        raise Exception('failed')
+
+    worker.processed = processed
+    yield worker
+
+
+def _create_tasks(db, actions):
+    with db.scoped_session() as session:
+        tasks = [Task(action=action, targetUri=f'target{i % 2}', payload={}) for i, action in enumerate(actions)]
+        session.add_all(tasks)
+        session.commit()
+        return [task.taskUri for task in tasks]
+
+
+def test_process_all_tasks_of_a_batch(db, worker):
+    task_ids = _create_tasks(db, ['test.task.ok', 'test.task.ok', 'test.task.fail', 'test.task.ok'])
+
+    responses = worker.process(engine=db, task_ids=task_ids)
+
+    assert len(responses) == 4
+    assert sorted(worker.processed) == sorted(task_ids[:2] + task_ids[3:])
+    with db.scoped_session() as session:
+        statuses = {t.taskUri: t.status for t in session.query(Task).filter(Task.taskUri.in_(task_ids))}
+    assert statuses[task_ids[2]] == 'failed'
+    assert [statuses[uri] for uri in task_ids if uri != task_ids[2]] == ['completed'] * 3
+
+    metrics = worker.metrics.to_dict()
+    assert metrics['test.task.ok']['count'] == 3
+    assert metrics['test.task.fail']['failed'] == 1
+
+
+def test_tasks_are_claimed_once(db, worker):
+    task_ids = _create_tasks(db, ['test.task.ok'])
+
+    worker.process(engine=db, task_ids=task_ids)
+    assert worker.process(engine=db, task_ids=task_ids) == []
+    assert worker.processed == task_ids
+
+
+def test_duplicated_tasks_are_coalesced(db, worker):
+    pending = _create_tasks(db, ['test.task.ok', 'test.task.ok'])
+    sent = []
+    queue = worker.coalesced(lambda engine, task_ids: sent.extend(task_ids))
+
+    queue(engine=db, task_ids=pending)
+    duplicates = _create_tasks(db, ['test.task.ok', 'test.task.ok', 'test.task.fail'])
+    queue(engine=db, task_ids=duplicates)
+
+    assert sent == pending + duplicates[2:]
+    with db.scoped_session() as session:
+        task = session.query(Task).get(duplicates[0])
+        assert task.status == 'coalesced'
+        assert task.response == {'coalescedWith': pending[0]}
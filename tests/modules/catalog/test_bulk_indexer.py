@@ -0,0 +1,69 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from dataall.modules.catalog.indexers import base_indexer
+from dataall.modules.catalog.indexers.base_indexer import BulkIndexer, BaseIndexer
+
+
+def _bulk_response(*failed_ids):
+    return {'items': [{'index': {'_id': doc_id, 'error': {'type': 'mapper_parsing_exception'}}} for doc_id in failed_ids]}
+
+
+def test_bulk_indexer_batches_documents():
+    es = MagicMock()
+    es.bulk.return_value = _bulk_response()
+    bulk = BulkIndexer(lambda: es, 'dataall-index', batch_size=2)
+
+    bulk.add('uri1', {'name': 'first'})
+    assert es.bulk.call_count == 0
+    bulk.add('uri2', {'name': 'second'})
+    assert es.bulk.call_count == 1
+    bulk.add('uri3', {'name': 'third'})
+    bulk.flush()
+
+    assert es.bulk.call_count == 2
+    assert bulk.report()['batches'] == 2
+    assert bulk.report()['documents'] == 3
+
+
+def test_bulk_indexer_deduplicates_documents():
+    es = MagicMock()
+    es.bulk.return_value = _bulk_response()
+    bulk = BulkIndexer(lambda: es, 'dataall-index')
+
+    bulk.add('dataset', {'tables': 1})
+    bulk.add('dataset', {'tables': 2})
+    bulk.flush()
+
+    body = es.bulk.call_args.kwargs['body']
+    assert body == [{'index': {'_index': 'dataall-index', '_id': 'dataset'}}, {'tables': 2}]
+    assert bulk.is_indexed('dataset')
+
+
+def test_bulk_indexer_reports_failures():
+    es = MagicMock()
+    es.bulk.side_effect = [_bulk_response(), _bulk_response('uri2')]
+    bulk = BulkIndexer(lambda: es, 'dataall-index', max_bytes=1)
+
+    bulk.add('uri1', {'name': 'first'})
+    bulk.add('uri2', {'name': 'second'})
+
+    assert bulk.report()['batches'] == 2
+    assert bulk.report()['failures'] == 1
+
+
+def test_purge_orphans_deletes_documents_not_indexed_since_the_start(mocker):
+    es = MagicMock()
+    mocker.patch.object(BaseIndexer, 'es', return_value=es)
+    scan = mocker.patch.object(
+        base_indexer.helpers, 'scan', return_value=iter([{'_id': 'orphan1'}, {'_id': 'failed'}, {'_id': 'orphan2'}])
+    )
+    started = datetime(2024, 1, 1)
+
+    assert BaseIndexer.purge_orphans(started, {'failed'}, batch_size=1) == 2
+
+    assert scan.call_args.kwargs['query'] == {'query': {'range': {'_indexed': {'lt': started.isoformat()}}}}
+    assert [call.kwargs['body'] for call in es.bulk.call_args_list] == [
+        [{'delete': {'_index': 'dataall-index', '_id': 'orphan1'}}],
+        [{'delete': {'_index': 'dataall-index', '_id': 'orphan2'}}],
+    ]
@@ -0,0 +1,209 @@
+"""
+Testing the processing of the shares by DataSharingService with mocked share processors:
+the retries of the failed items, the resume of the interrupted shares and the checkpoints of the items
+"""
+from typing import Callable
+
+import pytest
+
+from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
+from dataall.core.groups.db.group_models import Group
+from dataall.core.organizations.db.organization_models import Organization
+from dataall.modules.dataset_sharing.db.share_object_models import ShareObject, ShareObjectItem
+from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository, \
+    ShareItemCheckpointRepository
+from dataall.modules.dataset_sharing.services import data_sharing_service
+from dataall.modules.dataset_sharing.services.data_sharing_service import DataSharingService
+from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareObjectStatus
+from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
+from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
+
+
+@pytest.fixture(scope="module")
+def source_environment(env: Callable, environment_group: Callable, org_fixture: Organization,
+                       group: Group) -> Environment:
+    source = env(org=org_fixture, account="1" * 12, envname="source_environment", owner=group.owner,
+                 group=group.name)
+    environment_group(environment=source, group=group.name)
+    yield source
+
+
+@pytest.fixture(scope="module")
+def target_environment(env: Callable, org_fixture: Organization, group2: Group) -> Environment:
+    yield env(org=org_fixture, account="2" * 12, envname="target_environment", owner=group2.owner,
+              group=group2.name)
+
+
+@pytest.fixture(scope="module")
+def target_environment_group(environment_group: Callable, target_environment: Environment,
+                             group2: Group) -> EnvironmentGroup:
+    yield environment_group(environment=target_environment, group=group2.name)
+
+
+@pytest.fixture(scope="module")
+def dataset1(create_dataset: Callable, org_fixture: Organization, source_environment: Environment) -> Dataset:
+    yield create_dataset(organization=org_fixture, environment=source_environment, label="dataset1")
+
+
+@pytest.fixture(scope="module")
+def table1(table: Callable, dataset1: Dataset) -> DatasetTable:
+    yield table(dataset=dataset1, label="table1")
+
+
+@pytest.fixture(scope="function")
+def share1(share: Callable, dataset1: Dataset, target_environment: Environment,
+           target_environment_group: EnvironmentGroup) -> ShareObject:
+    yield share(dataset=dataset1, environment=target_environment, env_group=target_environment_group)
+
+
+@pytest.fixture(scope="function")
+def processors(mocker):
+    """Mocks the share processors and yields the mocked tables processor, that only shares tables in the tests"""
+    mocker.patch.object(data_sharing_service, 'MAX_ATTEMPTS', 3)
+    mocker.patch.object(data_sharing_service.time, 'sleep')
+    access_point = mocker.patch.object(data_sharing_service, 'ProcessS3AccessPointShare')
+    access_point.process_approved_shares.return_value = True
+    access_point.process_revoked_shares.return_value = True
+    bucket = mocker.patch.object(data_sharing_service, 'ProcessS3BucketShare')
+    bucket.process_approved_shares.return_value = True
+    bucket.process_revoked_shares.return_value = True
+    yield mocker.patch.object(data_sharing_service, 'ProcessLakeFormationShare')
+
+
+def share_tables(processors, share, *outcomes):
+    """
+    Each run of the tables processor moves the approved table items of the share to the next status of outcomes,
+    an exception moves them in progress and is raised
+    """
+    runs = iter(outcomes)
+
+    def run():
+        outcome = next(runs)
+        status = ShareItemStatus.Share_In_Progress.value if isinstance(outcome, Exception) else outcome
+        session = processors.call_args.args[0]
+        for item in session.query(ShareObjectItem).filter(
+            ShareObjectItem.shareUri == share.shareUri,
+            ShareObjectItem.status == ShareItemStatus.Share_Approved.value,
+        ):
+            item.status = status
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome == ShareItemStatus.Share_Succeeded.value
+
+    processors.return_value.process_approved_shares.side_effect = run
+
+
+def raised_alarms(processors):
+    return [call.kwargs['raise_alarms'] for call in processors.call_args_list]
+
+
+def set_share_status(db, share, status):
+    with db.scoped_session() as session:
+        session.query(ShareObject).get(share.shareUri).status = status
+
+
+def get_item_status(db, share_item):
+    with db.scoped_session() as session:
+        return session.query(ShareObjectItem).get(share_item.shareItemUri).status
+
+
+def get_share_status(db, share):
+    with db.scoped_session() as session:
+        return session.query(ShareObject).get(share.shareUri).status
+
+
+def test_checkpoints_are_deleted_with_their_share_item(db, share1, share_item_table, table1):
+    # Given a failed share item with a completed step
+    share_item = share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_Failed.value)
+    with db.scoped_session() as session:
+        ShareCheckpoints(session, share1.shareUri).complete(ShareCheckpoints.SHARE, 'resource_link', [table1.tableUri])
+
+        # When the item is removed from the share
+        ShareObjectRepository.remove_share_object_item(session, session.query(ShareObjectItem).get(share_item.shareItemUri))
+
+    # Then its checkpoints are deleted, the item added again is processed from the start
+    share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_Approved.value)
+    with db.scoped_session() as session:
+        assert not ShareItemCheckpointRepository.list_checkpoints(session, share1.shareUri)
+        assert not ShareCheckpoints(session, share1.shareUri).is_completed(
+            ShareCheckpoints.SHARE, 'resource_link', table1.tableUri
+        )
+
+
+def test_revoke_clears_the_share_checkpoints(db, share1, share_item_table, table1, processors):
+    # Given an item to revoke with a step completed by a share that failed earlier
+    share_item_table(share=share1, table=table1, status=ShareItemStatus.Revoke_Approved.value)
+    with db.scoped_session() as session:
+        ShareCheckpoints(session, share1.shareUri).complete(ShareCheckpoints.SHARE, 'resource_link', [table1.tableUri])
+    set_share_status(db, share1, ShareObjectStatus.Revoked.value)
+    processors.return_value.process_revoked_shares.return_value = True
+
+    # When
+    assert DataSharingService.revoke_share(engine=db, share_uri=share1.shareUri)
+
+    # Then a later share of the item redoes the step
+    with db.scoped_session() as session:
+        assert not ShareItemCheckpointRepository.list_checkpoints(session, share1.shareUri)
+    # and every processor checkpoints its revoke steps
+    for processor in (data_sharing_service.ProcessS3AccessPointShare, data_sharing_service.ProcessS3BucketShare):
+        assert processor.process_revoked_shares.call_args.kwargs['checkpoints']
+    assert processors.call_args.kwargs['checkpoints']
+
+
+def test_failed_item_is_retried_until_it_succeeds(db, share1, share_item_table, table1, processors):
+    # Given a table that fails to be shared on the first attempt only
+    share_item = share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_Approved.value)
+    share_tables(
+        processors, share1, ShareItemStatus.Share_Failed.value, ShareItemStatus.Share_Succeeded.value
+    )
+
+    # When
+    assert DataSharingService.approve_share(engine=db, share_uri=share1.shareUri)
+
+    # Then the failure alarm is not raised for the retried item
+    assert raised_alarms(processors) == [False, True]
+    data_sharing_service.time.sleep.assert_called_once_with(data_sharing_service.RETRY_DELAY)
+    assert get_item_status(db, share_item) == ShareItemStatus.Share_Succeeded.value
+    assert get_share_status(db, share1) == ShareObjectStatus.Processed.value
+
+
+def test_item_fails_after_the_last_attempt(db, share1, share_item_table, table1, processors):
+    # Given a table that fails to be shared on every attempt
+    share_item = share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_Approved.value)
+    share_tables(processors, share1, *[ShareItemStatus.Share_Failed.value] * 3)
+
+    # When
+    assert not DataSharingService.approve_share(engine=db, share_uri=share1.shareUri)
+
+    # Then the failure alarm is raised by the last attempt only
+    assert raised_alarms(processors) == [False, False, True]
+    assert get_item_status(db, share_item) == ShareItemStatus.Share_Failed.value
+    assert get_share_status(db, share1) == ShareObjectStatus.Processed.value
+
+
+def test_interrupted_share_is_resumed(db, share1, share_item_table, table1, processors):
+    # Given a share whose processing was interrupted with its item in progress
+    share_item = share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_In_Progress.value)
+    set_share_status(db, share1, ShareObjectStatus.Share_In_Progress.value)
+    share_tables(processors, share1, ShareItemStatus.Share_Succeeded.value)
+
+    # When
+    assert DataSharingService.approve_share(engine=db, share_uri=share1.shareUri)
+
+    # Then the item is processed again
+    assert get_item_status(db, share_item) == ShareItemStatus.Share_Succeeded.value
+    assert get_share_status(db, share1) == ShareObjectStatus.Processed.value
+
+
+def test_share_is_finished_when_processing_raises(db, share1, share_item_table, table1, processors):
+    # Given a share whose processing raises on every attempt
+    share_item = share_item_table(share=share1, table=table1, status=ShareItemStatus.Share_Approved.value)
+    share_tables(processors, share1, *[Exception('Unexpected error')] * 3)
+
+    # When
+    with pytest.raises(Exception, match='Unexpected error'):
+        DataSharingService.approve_share(engine=db, share_uri=share1.shareUri)
+
+    # Then the item left in progress is failed and the share is not stuck in progress
+    assert get_item_status(db, share_item) == ShareItemStatus.Share_Failed.value
+    assert get_share_status(db, share1) == ShareObjectStatus.Processed.value
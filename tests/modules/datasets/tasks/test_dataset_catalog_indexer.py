@@ -1,5 +1,10 @@
+from unittest.mock import MagicMock
+
 import pytest
 
+from dataall.modules.catalog.db.catalog_indexer_repositories import CatalogIndexerRepository
+from dataall.modules.catalog.indexers import base_indexer
+from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 from dataall.modules.catalog.tasks.catalog_indexer_task import index_objects
 from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
 
@@ -47,15 +52,44 @@ def table(org, env, db, sync_dataset):
     yield table
 
 
-def test_catalog_indexer(db, org, env, sync_dataset, table, mocker):
-    mocker.patch(
-        'dataall.modules.datasets.indexers.table_indexer.DatasetTableIndexer.upsert_all',
-        return_value=[table]
-    )
-    mocker.patch(
-        'dataall.modules.datasets.indexers.dataset_indexer.DatasetIndexer.upsert', return_value=sync_dataset
-    )
+def test_catalog_indexer(db, org, env, sync_dataset, table):
     indexed_objects_counter = index_objects(
         engine=db
     )
     assert indexed_objects_counter == 2
+
+
+def test_incremental_catalog_indexer(db, sync_dataset, table):
+    # a full reindex sets the watermark, nothing changed since then
+    assert index_objects(engine=db, full_reconcile=True) == 2
+    assert index_objects(engine=db) == 0
+
+    with db.scoped_session() as session:
+        updated = session.query(DatasetTable).get(table.tableUri)
+        updated.description = 'updated description'
+
+    assert index_objects(engine=db) == 1
+
+
+def test_catalog_indexer_keeps_the_watermark_on_failures(db, sync_dataset, table, mocker):
+    # Given a full reindex where OpenSearch fails to index the table
+    es = MagicMock()
+    es.bulk.return_value = {
+        'items': [{'index': {'_id': table.tableUri, 'error': {'type': 'mapper_parsing_exception'}}}]
+    }
+    mocker.patch.object(BaseIndexer, 'es', return_value=es)
+    mocker.patch.object(base_indexer.helpers, 'scan', return_value=iter([]))
+    mocker.patch.object(
+        BaseIndexer, '_index', side_effect=lambda doc_id, doc: BaseIndexer._running_bulk().add(doc_id, doc)
+    )
+    with db.scoped_session() as session:
+        previous = CatalogIndexerRepository.get_watermark(session)
+        previous = (previous.since, previous.lastFullRun) if previous else None
+
+    # When
+    assert index_objects(engine=db, full_reconcile=True) == 2
+
+    # Then the next run indexes the table again
+    with db.scoped_session() as session:
+        watermark = CatalogIndexerRepository.get_watermark(session)
+        assert ((watermark.since, watermark.lastFullRun) if watermark else None) == previous
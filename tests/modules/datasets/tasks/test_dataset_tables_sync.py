@@ -89,12 +89,12 @@ def test_tables_sync(db, org, env, sync_dataset, table_fixture, mocker):
         ]
 
     mocker.patch(
-        'dataall.modules.datasets.tasks.tables_syncer.is_assumable_pivot_role', return_value=True
+        'dataall.modules.datasets.tasks.tables_syncer.assume_pivot_role', return_value=MagicMock()
     )
 
     mock_client = MagicMock()
     mocker.patch("dataall.modules.datasets.tasks.tables_syncer.LakeFormationTableClient", mock_client)
-    mock_client.grant_principals_all_table_permissions = True
+    mock_client.batch_grant_principals_all_table_permissions.return_value = []
 
     processed_tables = sync_tables(engine=db)
     assert len(processed_tables) == 2
@@ -106,3 +106,24 @@ def test_tables_sync(db, org, env, sync_dataset, table_fixture, mocker):
         )
         assert saved_table
         assert saved_table.GlueTableName == 'table1'
+
+
+def test_batch_grant_table_permissions():
+    from dataall.modules.datasets.aws.lf_table_client import LakeFormationTableClient
+
+    aws_session = MagicMock()
+    lf = aws_session.client.return_value
+    lf.batch_grant_permissions.side_effect = [
+        {'Failures': []},
+        {'Failures': [{'RequestEntry': {
+            'Principal': {'DataLakePrincipalIdentifier': 'arn:role'},
+            'Resource': {'Table': {'Name': 'table20'}},
+        }, 'Error': {'ErrorCode': 'InvalidInputException'}}]},
+    ]
+
+    failures = LakeFormationTableClient.batch_grant_principals_all_table_permissions(
+        aws_session, '111111111111', 'eu-west-1', 'db', [f'table{i}' for i in range(21)], ['arn:role', 'arn:team']
+    )
+
+    assert lf.batch_grant_permissions.call_count == 3
+    assert len(failures) == 1
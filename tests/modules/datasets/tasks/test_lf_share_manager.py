@@ -13,7 +13,10 @@ from typing import Callable
 from dataall.core.groups.db.group_models import Group
 from dataall.core.organizations.db.organization_models import Organization
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
-from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus
+from dataall.modules.dataset_sharing.aws import ram_client
+from dataall.modules.dataset_sharing.aws.ram_client import RamClient
+from dataall.modules.dataset_sharing.services.dataset_sharing_enums import ShareItemStatus, ShareObjectStatus, \
+    PrincipalType, ShareableType
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject, ShareObjectItem
 from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
 from dataall.modules.dataset_sharing.services.dataset_alarm_service import DatasetAlarmService
@@ -216,42 +219,6 @@ def test_build_shared_db_name_old(
     assert processor.build_shared_db_name() == (f"{dataset1.GlueDatabaseName}_shared_{share.shareUri}"[:254], False)
     mock_glue_client().get_glue_database.assert_called_once()
 
-def test_check_table_exists_in_source_database(
-        processor_with_mocks,
-        table1: DatasetTable,
-        share_item: ShareObjectItem,
-        mock_glue_client
-):
-    processor, lf_client, glue_client = processor_with_mocks
-    mock_glue_client().table_exists.return_value = True
-    # When
-    processor.check_table_exists_in_source_database(
-        share_item=share_item,
-        table=table1
-    )
-    # Then
-    mock_glue_client().table_exists.assert_called_once()
-    mock_glue_client().table_exists.assert_called_with(table1.GlueTableName)
-
-def test_check_table_exists_in_source_database_exception(
-        processor_with_mocks,
-        table1: DatasetTable,
-        share_item: ShareObjectItem,
-        mock_glue_client
-):
-    processor, lf_client, glue_client = processor_with_mocks
-    mock_glue_client().table_exists.return_value = False
-    # When
-    with pytest.raises(Exception) as exception:
-        processor.check_table_exists_in_source_database(
-            share_item=share_item,
-            table=table1
-        )
-    #Then
-    mock_glue_client().table_exists.assert_called_once()
-    mock_glue_client().table_exists.assert_called_with(table1.GlueTableName)
-    assert "ExceptionInfo" in str(exception)
-
 def test_check_resource_link_table_exists_in_target_database_true(
         processor_with_mocks,
         table1: DatasetTable,
@@ -278,24 +245,6 @@ def test_check_resource_link_table_exists_in_target_database_false(
     mock_glue_client().table_exists.assert_called_once()
     mock_glue_client().table_exists.assert_called_with(table1.GlueTableName)
 
-def test_revoke_iam_allowed_principals_from_table(
-        processor_with_mocks,
-        table1: DatasetTable,
-        source_environment
-):
-    processor, lf_client, glue_client = processor_with_mocks
-    lf_client.revoke_permissions_from_table.return_value = True
-    # Then
-    assert processor.revoke_iam_allowed_principals_from_table(table1) == True
-    lf_client.revoke_permissions_from_table.assert_called_once()
-    lf_client.revoke_permissions_from_table.assert_called_with(
-            principals=['EVERYONE'],
-            database_name=table1.GlueDatabaseName,
-            table_name=table1.GlueTableName,
-            catalog_id=source_environment.AwsAccountId,
-            permissions=['ALL']
-        )
-
 def test_grant_pivot_role_all_database_permissions_to_source_database(
         processor_with_mocks,
         dataset1: Dataset,
@@ -367,231 +316,412 @@ def test_grant_principals_database_permissions_to_shared_database(
         permissions=['DESCRIBE'],
     )
 
-def test_grant_target_account_permissions_to_source_table(
+def test_delete_resource_link_table_in_shared_database_true(
         processor_with_mocks,
-        target_environment: Environment,
-        source_environment: Environment,
-        table1: DatasetTable
+        table2: DatasetTable
 ):
     processor, lf_client, glue_client = processor_with_mocks
+
     # When
-    processor.grant_target_account_permissions_to_source_table(table1)
+    processor.delete_resource_link_table_in_shared_database(
+        table=table2
+    )
     # Then
-    lf_client.grant_permissions_to_table.assert_called_once()
-    lf_client.grant_permissions_to_table.assert_called_with(
-            principals=[target_environment.AwsAccountId],
-            database_name=table1.GlueDatabaseName,
-            table_name=table1.GlueTableName,
-            catalog_id=source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT'],
-            permissions_with_grant_options=['DESCRIBE', 'SELECT']
-        )
-
+    glue_client.table_exists.assert_called_once()
+    glue_client.delete_table.assert_called_once()
 
-def test_check_if_exists_and_create_resource_link_table_in_shared_database_false(
+def test_revoke_principals_database_permissions_to_shared_database(
         processor_with_mocks,
-        table1: DatasetTable,
-        source_environment: Environment,
-        mock_glue_client
+        dataset1: Dataset
 ):
     processor, lf_client, glue_client = processor_with_mocks
-    mock_glue_client().table_exists.return_value = False
-    glue_client.create_resource_link.return_value = True
-
     # When
-    processor.check_if_exists_and_create_resource_link_table_in_shared_database(table1)
-
+    processor.revoke_principals_database_permissions_to_shared_database()
     # Then
-    mock_glue_client().table_exists.assert_called_once()
-    glue_client.create_resource_link.assert_called_once()
-    glue_client.create_resource_link.assert_called_with(
-        resource_link_name=table1.GlueTableName,
-        table=table1,
-        catalog_id=source_environment.AwsAccountId
+    lf_client.revoke_permissions_to_database.assert_called_once()
+    lf_client.revoke_permissions_to_database.assert_called_with(
+        principals=processor.principals,
+        database_name=f"{dataset1.GlueDatabaseName}_shared",
+        permissions=['DESCRIBE'],
     )
 
-def test_check_if_exists_and_create_resource_link_table_in_shared_database_true(
+def test_delete_shared_database_in_target(
+    processor_with_mocks,
+):
+    processor, lf_client, glue_client = processor_with_mocks
+    # When
+    processor.delete_shared_database_in_target()
+    # Then
+    glue_client.delete_database.assert_called_once()
+
+
+def test_handle_share_failure(
         processor_with_mocks,
         table1: DatasetTable,
-        mock_glue_client
+        mocker
 ):
+    # Given
+    alarm_service_mock = mocker.patch.object(DatasetAlarmService, "trigger_table_sharing_failure_alarm")
+    error = Exception
     processor, lf_client, glue_client = processor_with_mocks
-    mock_glue_client().table_exists.return_value = True
-    glue_client.create_resource_link.return_value = True
 
     # When
-    processor.check_if_exists_and_create_resource_link_table_in_shared_database(table1)
+    processor.handle_share_failure(table1, error)
 
     # Then
-    mock_glue_client().table_exists.assert_called_once()
-    glue_client.create_resource_link.assert_not_called()
+    alarm_service_mock.assert_called_once()
 
 
-def test_grant_principals_permissions_to_resource_link_table(
+
+def test_handle_revoke_failure(
         processor_with_mocks,
         table1: DatasetTable,
-        target_environment: Environment
+        mocker,
 ):
+
+    # Given
+    alarm_service_mock = mocker.patch.object(DatasetAlarmService, "trigger_revoke_table_sharing_failure_alarm")
+    error = Exception
     processor, lf_client, glue_client = processor_with_mocks
+
     # When
-    processor.grant_principals_permissions_to_resource_link_table(table1)
+    processor.handle_revoke_failure(table1, error)
+
     # Then
-    lf_client.grant_permissions_to_table.assert_called_once()
-    lf_client.grant_permissions_to_table.assert_called_with(
-            principals=processor.principals,
-            database_name=processor.shared_db_name,
-            table_name=table1.GlueTableName,
-            catalog_id=target_environment.AwsAccountId,
-            permissions=['DESCRIBE']
-        )
+    alarm_service_mock.assert_called_once()
+
 
-def test_grant_principals_permissions_to_table_in_target(
+def test_batch_grant_principals_permissions_to_tables_in_target(
         processor_with_mocks,
         table1: DatasetTable,
-        source_environment: Environment
+        table2: DatasetTable,
+        source_environment: Environment,
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    lf_client.batch_grant_permissions.return_value = {'1-0': 'AccessDeniedException'}
     # When
-    processor.grant_principals_permissions_to_table_in_target(table1)
+    errors = processor.batch_grant_principals_permissions_to_tables_in_target([table1, table2])
     # Then
-    lf_client.grant_permissions_to_table_with_columns.assert_called_once()
-    lf_client.grant_permissions_to_table_with_columns.assert_called_with(
-            principals=processor.principals,
-            database_name=table1.GlueDatabaseName,
-            table_name=table1.GlueTableName,
-            catalog_id=source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT']
-        )
-
-def test_revoke_principals_permissions_to_resource_link_table(
+    lf_client.batch_grant_permissions.assert_called_once()
+    entries = lf_client.batch_grant_permissions.call_args.args[0]
+    assert len(entries) == 2 * len(processor.principals)
+    assert entries[0]['Resource'] == {
+        'TableWithColumns': {
+            'DatabaseName': table1.GlueDatabaseName,
+            'Name': table1.GlueTableName,
+            'CatalogId': source_environment.AwsAccountId,
+            'ColumnWildcard': {},
+        }
+    }
+    assert list(errors) == [table2.tableUri]
+
+
+def test_check_tables_exist_in_source_database(
         processor_with_mocks,
         table1: DatasetTable,
-        target_environment:Environment
+        table2: DatasetTable,
+        mock_glue_client
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    mock_glue_client().table_exists.side_effect = lambda name: name == table1.GlueTableName
     # When
-    processor.revoke_principals_permissions_to_resource_link_table(table=table1)
+    errors = processor.check_tables_exist_in_source_database([table1, table2])
     # Then
-    lf_client.revoke_permissions_from_table.assert_called_once()
-    lf_client.revoke_permissions_from_table.assert_called_with(
-            principals=processor.principals,
-            database_name=processor.shared_db_name,
-            table_name=table1.GlueTableName,
-            catalog_id=target_environment.AwsAccountId,
-            permissions=['DESCRIBE']
-        )
+    assert list(errors) == [table2.tableUri]
+    assert isinstance(errors[table2.tableUri], exceptions.AWSResourceNotFound)
 
 
-def test_revoke_principals_permissions_to_table_in_target(
+def test_batch_revoke_principals_permissions_to_tables_in_target(
         processor_with_mocks,
         table1: DatasetTable,
-        source_environment: Environment
+        table2: DatasetTable,
+        mocker,
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    quicksight_group = 'arn:aws:quicksight:eu-west-1:111111111111:group/default/dataall'
+    mocker.patch.object(processor, 'principals', processor.principals + [quicksight_group])
+    lf_client.batch_revoke_permissions.return_value = {}
+    # When the table1 is shared with other teams of the environment
+    errors = processor.batch_revoke_principals_permissions_to_tables_in_target(
+        [table1, table2], {table1.tableUri: True}
+    )
+    # Then the Quicksight group keeps its permissions to table1 only
+    assert errors == {}
+    entries = lf_client.batch_revoke_permissions.call_args.args[0]
+    revoked = [(entry['Resource']['TableWithColumns']['Name'], entry['Principal']['DataLakePrincipalIdentifier'])
+               for entry in entries]
+    assert (table1.GlueTableName, quicksight_group) not in revoked
+    assert (table2.GlueTableName, quicksight_group) in revoked
+
+
+def test_process_approved_shares_in_batch(
+        db,
+        processor_with_mocks,
+        share_item: ShareObjectItem,
+        mock_glue_client,
+        mocker,
+):
+    processor, lf_client, glue_client = processor_with_mocks
+    mock_glue_client().table_exists.return_value = True
+    lf_client.batch_grant_permissions.return_value = {}
+    lf_client.batch_revoke_permissions.return_value = {}
+    accept_ram_invitations = mocker.patch(
+        "dataall.modules.dataset_sharing.aws.ram_client.RamClient.accept_ram_invitations",
+        return_value=([], []),
+    )
     # When
-    processor.revoke_principals_permissions_to_table_in_target(table = table1, other_table_shares_in_env=False)
+    success = processor.process_approved_shares()
     # Then
-    lf_client.revoke_permissions_from_table_with_columns.assert_called_once()
-    lf_client.revoke_permissions_from_table_with_columns.assert_called_with(
-            principals=processor.principals,
-            database_name=table1.GlueDatabaseName,
-            table_name=table1.GlueTableName,
-            catalog_id=source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT']
-        )
+    assert success
+    accept_ram_invitations.assert_called_once()
+    glue_client.create_resource_link.assert_called_once()
+    # revoke IAMAllowedPrincipals, then grants to target account, principals on tables and on resource links
+    assert lf_client.batch_revoke_permissions.call_count == 1
+    assert lf_client.batch_grant_permissions.call_count == 3
+    with db.scoped_session() as session:
+        item = session.query(ShareObjectItem).get(share_item.shareItemUri)
+        assert item.status == ShareItemStatus.Share_Succeeded.value
 
-def test_delete_resource_link_table_in_shared_database_true(
+
+def test_process_approved_shares_resumes_from_checkpoints(
+        db,
         processor_with_mocks,
-        table2: DatasetTable
+        share: ShareObject,
+        share_item: ShareObjectItem,
+        table1: DatasetTable,
+        mock_glue_client,
+        mocker,
 ):
+    from dataall.modules.dataset_sharing.db.share_object_repositories import ShareItemCheckpointRepository
+    from dataall.modules.dataset_sharing.services.share_checkpoints import ShareCheckpoints
+
     processor, lf_client, glue_client = processor_with_mocks
+    mock_glue_client().table_exists.return_value = True
+    lf_client.batch_grant_permissions.return_value = {}
+    lf_client.batch_revoke_permissions.return_value = {}
+    accept_ram_invitations = mocker.patch(
+        "dataall.modules.dataset_sharing.aws.ram_client.RamClient.accept_ram_invitations",
+        return_value=([], []),
+    )
+    with db.scoped_session() as session:
+        session.query(ShareObjectItem).get(share_item.shareItemUri).status = ShareItemStatus.Share_Approved.value
+        for step in ['iam_allowed_principals_revoke', 'target_account_grant', 'ram_invitation', 'resource_link']:
+            ShareItemCheckpointRepository.save_checkpoints(
+                session, share.shareUri, ShareCheckpoints.SHARE, step, [share_item.shareItemUri]
+            )
+    processor.checkpoints = ShareCheckpoints(processor.session, share.shareUri)
 
     # When
-    processor.delete_resource_link_table_in_shared_database(
-        table=table2
-    )
-    # Then
-    glue_client.table_exists.assert_called_once()
-    glue_client.delete_table.assert_called_once()
+    success = processor.process_approved_shares()
 
-def test_revoke_principals_database_permissions_to_shared_database(
+    # Then the completed steps are skipped
+    assert success
+    accept_ram_invitations.assert_not_called()
+    glue_client.create_resource_link.assert_not_called()
+    lf_client.batch_revoke_permissions.assert_not_called()
+    # principals on tables and on resource links
+    assert lf_client.batch_grant_permissions.call_count == 2
+    with db.scoped_session() as session:
+        assert session.query(ShareObjectItem).get(share_item.shareItemUri).status == ShareItemStatus.Share_Succeeded.value
+        assert not ShareItemCheckpointRepository.list_checkpoints(session, share.shareUri)
+
+
+@pytest.fixture(scope="function")
+def revoked_item(db, share_item_table: Callable, share: ShareObject, table2: DatasetTable) -> ShareObjectItem:
+    item = share_item_table(share=share, table=table2, status=ShareItemStatus.Revoke_Approved.value)
+    yield item
+    with db.scoped_session() as session:
+        session.query(ShareObjectItem).filter(ShareObjectItem.shareItemUri == item.shareItemUri).delete()
+
+
+@pytest.fixture(scope="function")
+def other_share_item(db, dataset1: Dataset, target_environment: Environment,
+                     target_environment_group: EnvironmentGroup, table2: DatasetTable) -> ShareObjectItem:
+    """table2 shared to another team of the target environment"""
+    with db.scoped_session() as session:
+        other_share = ShareObject(
+            datasetUri=dataset1.datasetUri,
+            environmentUri=target_environment.environmentUri,
+            owner="alice",
+            principalId="other-team",
+            principalType=PrincipalType.Group.value,
+            principalIAMRoleName="other-team-role",
+            status=ShareObjectStatus.Processed.value,
+            groupUri="other-team",
+        )
+        session.add(other_share)
+        session.flush()
+        item = ShareObjectItem(
+            shareUri=other_share.shareUri,
+            owner="alice",
+            itemUri=table2.tableUri,
+            itemType=ShareableType.Table.value,
+            itemName=table2.name,
+            status=ShareItemStatus.Share_Succeeded.value,
+        )
+        session.add(item)
+    yield item
+    with db.scoped_session() as session:
+        session.query(ShareObjectItem).filter(ShareObjectItem.shareItemUri == item.shareItemUri).delete()
+        session.query(ShareObject).filter(ShareObject.shareUri == other_share.shareUri).delete()
+
+
+QUICKSIGHT_GROUP = 'arn:aws:quicksight:eu-west-1:111111111111:group/default/dataall'
+
+
+def revoked_principals(lf_client) -> list:
+    """The principals of every batch_revoke_permissions call, in order"""
+    return [
+        {entry['Principal']['DataLakePrincipalIdentifier'] for entry in call.args[0]}
+        for call in lf_client.batch_revoke_permissions.call_args_list
+    ]
+
+
+def get_item_status(db, share_item) -> str:
+    with db.scoped_session() as session:
+        return session.query(ShareObjectItem).get(share_item.shareItemUri).status
+
+
+def test_process_revoked_shares_in_batch(
+        db,
         processor_with_mocks,
-        dataset1: Dataset
+        revoked_item: ShareObjectItem,
+        table2: DatasetTable,
+        target_environment: Environment,
+        mock_glue_client,
+        mocker,
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    mocker.patch.object(processor, 'principals', processor.principals + [QUICKSIGHT_GROUP])
+    mock_glue_client().table_exists.return_value = True
+    glue_client.table_exists.return_value = True
+    lf_client.batch_revoke_permissions.return_value = {}
     # When
-    processor.revoke_principals_database_permissions_to_shared_database()
-    # Then
-    lf_client.revoke_permissions_to_database.assert_called_once()
-    lf_client.revoke_permissions_to_database.assert_called_with(
-        principals=processor.principals,
-        database_name=f"{dataset1.GlueDatabaseName}_shared",
-        permissions=['DESCRIBE'],
-    )
-
-def test_delete_shared_database_in_target(
-    processor_with_mocks,
+    success = processor.process_revoked_shares()
+    # Then principals on the resource link, principals and Quicksight on the table, target account on the table
+    assert success
+    principals = revoked_principals(lf_client)
+    assert len(principals) == 3
+    assert QUICKSIGHT_GROUP not in principals[0]
+    assert QUICKSIGHT_GROUP in principals[1]
+    assert principals[2] == {target_environment.AwsAccountId}
+    glue_client.delete_table.assert_called_once_with(table2.GlueTableName)
+    assert get_item_status(db, revoked_item) == ShareItemStatus.Revoke_Succeeded.value
+
+
+def test_process_revoked_shares_of_table_shared_in_other_shares(
+        db,
+        processor_with_mocks,
+        revoked_item: ShareObjectItem,
+        other_share_item: ShareObjectItem,
+        mock_glue_client,
+        mocker,
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    mocker.patch.object(processor, 'principals', processor.principals + [QUICKSIGHT_GROUP])
+    mock_glue_client().table_exists.return_value = True
+    glue_client.table_exists.return_value = True
+    lf_client.batch_revoke_permissions.return_value = {}
     # When
-    processor.delete_shared_database_in_target()
-    # Then
-    glue_client.delete_database.assert_called_once()
-
-
-def test_revoke_external_account_access_on_source_account(
+    success = processor.process_revoked_shares()
+    # Then the resource link, the Quicksight permissions and the target account access are kept for the other share
+    assert success
+    principals = revoked_principals(lf_client)
+    assert len(principals) == 2
+    assert QUICKSIGHT_GROUP not in principals[1]
+    glue_client.delete_table.assert_not_called()
+    assert get_item_status(db, revoked_item) == ShareItemStatus.Revoke_Succeeded.value
+
+
+def test_process_revoked_shares_of_old_share_deletes_resource_link(
+        db,
         processor_with_mocks,
-        table1: DatasetTable,
-        source_environment: Environment,
-        target_environment: Environment
+        revoked_item: ShareObjectItem,
+        other_share_item: ShareObjectItem,
+        table2: DatasetTable,
+        mock_glue_client,
+        mocker,
 ):
     processor, lf_client, glue_client = processor_with_mocks
+    mocker.patch.object(processor, 'is_new_share', False)
+    mock_glue_client().table_exists.return_value = True
+    glue_client.table_exists.return_value = True
+    lf_client.batch_revoke_permissions.return_value = {}
     # When
-    processor.revoke_external_account_access_on_source_account(table1)
-    # Then
-    lf_client.revoke_permissions_from_table_with_columns.assert_called_once()
-    lf_client.revoke_permissions_from_table_with_columns.assert_called_with(
-            principals=[target_environment.AwsAccountId],
-            database_name=table1.GlueDatabaseName,
-            table_name=table1.GlueTableName,
-            catalog_id=source_environment.AwsAccountId,
-            permissions=['DESCRIBE', 'SELECT'],
-            permissions_with_grant_options=['DESCRIBE', 'SELECT']
-        )
+    success = processor.process_revoked_shares()
+    # Then the resource link of the old shared database is deleted, the target account keeps its access
+    assert success
+    glue_client.delete_table.assert_called_once_with(table2.GlueTableName)
+    assert len(revoked_principals(lf_client)) == 2
+    assert get_item_status(db, revoked_item) == ShareItemStatus.Revoke_Succeeded.value
 
 
-def test_handle_share_failure(
+def test_process_revoked_shares_skips_the_steps_of_failed_tables(
+        db,
         processor_with_mocks,
-        table1: DatasetTable,
-        mocker
+        revoked_item: ShareObjectItem,
+        mock_glue_client,
+        mocker,
 ):
-    # Given
-    alarm_service_mock = mocker.patch.object(DatasetAlarmService, "trigger_table_sharing_failure_alarm")
-    error = Exception
     processor, lf_client, glue_client = processor_with_mocks
-
+    alarm = mocker.patch.object(DatasetAlarmService, "trigger_revoke_table_sharing_failure_alarm")
+    mock_glue_client().table_exists.return_value = True
+    lf_client.batch_revoke_permissions.return_value = {'0-0': 'AccessDeniedException'}
+    # When the revoke of the resource link permissions fails
+    success = processor.process_revoked_shares()
+    # Then the following steps are skipped for the table
+    assert not success
+    lf_client.batch_revoke_permissions.assert_called_once()
+    glue_client.delete_table.assert_not_called()
+    alarm.assert_called_once()
+    assert get_item_status(db, revoked_item) == ShareItemStatus.Revoke_Failed.value
+
+
+def test_accept_ram_invitations(mocker):
+    mocker.patch.object(RamClient, '__init__', return_value=None)
+    mocker.patch.object(ram_client.time, 'sleep')
+    shares = {'table1': 'share-a', 'table2': 'share-b', 'table3': 'share-c'}
+    mocker.patch.object(
+        RamClient,
+        '_list_resource_share_associations',
+        side_effect=lambda resource_arn: [{'resourceShareArn': shares[resource_arn.split('/')[-1]]}],
+    )
+    mocker.patch.object(RamClient, '_get_resource_share_invitations', return_value=[
+        dict(resourceShareName='LakeFormation-a', resourceShareArn='share-a', resourceShareInvitationArn='inv-a',
+             status='PENDING'),
+        dict(resourceShareName='LakeFormation-b', resourceShareArn='share-b', resourceShareInvitationArn='inv-b',
+             status='EXPIRED'),
+        dict(resourceShareName='LakeFormation-c', resourceShareArn='share-c', resourceShareInvitationArn='inv-c',
+             status='ACCEPTED'),
+    ])
+    accept = mocker.patch.object(RamClient, '_accept_resource_share_invitation')
+    delete = mocker.patch.object(RamClient, '_delete_resource_share')
     # When
-    processor.handle_share_failure(table1, error)
-
-    # Then
-    alarm_service_mock.assert_called_once()
-
+    retry_share_tables, failed_invitations = RamClient.accept_ram_invitations(
+        SOURCE_ENV_ACCOUNT, 'eu-west-1', TARGET_ACCOUNT_ENV, 'eu-west-1', 'database', ['table1', 'table2', 'table3']
+    )
+    # Then the pending invitation is accepted and the table with an expired invitation is shared again
+    accept.assert_called_once_with('inv-a')
+    delete.assert_called_once_with(resource_share_arn='share-b')
+    assert retry_share_tables == ['table2']
+    assert [invitation['resourceShareArn'] for invitation in failed_invitations] == ['share-b']
 
 
-def test_handle_revoke_failure(
+def test_accept_ram_invitations_shares_again_tables_with_expired_invitations(
         processor_with_mocks,
         table1: DatasetTable,
+        table2: DatasetTable,
         mocker,
 ):
-
-    # Given
-    alarm_service_mock = mocker.patch.object(DatasetAlarmService, "trigger_revoke_table_sharing_failure_alarm")
-    error = Exception
     processor, lf_client, glue_client = processor_with_mocks
-
+    accept_ram_invitations = mocker.patch.object(
+        RamClient, 'accept_ram_invitations', side_effect=[([table2.GlueTableName], [{}]), ([], [])]
+    )
+    lf_client.batch_grant_permissions.return_value = {}
     # When
-    processor.handle_revoke_failure(table1, error)
-
-    # Then
-    alarm_service_mock.assert_called_once()
-
+    errors = processor._accept_ram_invitations([table1, table2])
+    # Then the target account is granted table2 again and its new invitation is accepted
+    assert errors == {}
+    entries = lf_client.batch_grant_permissions.call_args.args[0]
+    assert {entry['Resource']['Table']['Name'] for entry in entries} == {table2.GlueTableName}
+    assert accept_ram_invitations.call_args.kwargs['source_tables'] == [table2.GlueTableName]
@@ -760,6 +760,66 @@ def test_manage_access_point_and_policy_1(
         assert len([statement for statement in new_ap_policy["Statement"] if statement["Sid"] == "AllowAllToAdmin"]) > 0
 
 
+# New access point shared with several folders in a single policy update
+def test_manage_access_point_and_policy_multiple_prefixes(
+    mocker,
+    source_environment_group: EnvironmentGroup,
+    target_environment_group: EnvironmentGroup,
+    dataset1: Dataset,
+    db,
+    share1: ShareObject,
+    share_item_folder1: ShareObjectItem,
+    location1: DatasetStorageLocation,
+    source_environment: Environment,
+    target_environment: Environment,
+):
+    # Given
+    access_point_arn = "new-access-point-arn"
+    s3_control_client = mock_s3_control_client(mocker)
+    s3_control_client().get_bucket_access_point_arn.return_value = access_point_arn
+    s3_control_client().get_access_point_policy.return_value = None
+    mocker.patch(
+        "dataall.base.aws.sts.SessionHelper.get_role_id",
+        return_value=target_environment.SamlGroupName,
+    )
+    mocker.patch(
+        "dataall.base.aws.sts.SessionHelper.get_role_ids",
+        return_value=["dataset_admin_role_id:*"],
+    )
+    mocker.patch(
+        "dataall.base.aws.sts.SessionHelper.get_delegation_role_arn",
+        return_value=None,
+    )
+
+    with db.scoped_session() as session:
+        manager = S3AccessPointShareManager(
+            session,
+            dataset1,
+            share1,
+            location1,
+            source_environment,
+            target_environment,
+            source_environment_group,
+            target_environment_group,
+        )
+
+        # When
+        manager.manage_access_point_and_policy(s3_prefixes=[location1.S3Prefix, "another-prefix"])
+
+        # Then
+        s3_control_client().attach_access_point_policy.assert_called_once()
+        policy = json.loads(s3_control_client().attach_access_point_policy.call_args.kwargs.get('policy'))
+        statements = {item["Sid"]: item for item in policy["Statement"]}
+        assert statements[f"{target_environment.SamlGroupName}0"]["Condition"]["StringLike"]["s3:prefix"] == [
+            f"{location1.S3Prefix}/*",
+            "another-prefix/*",
+        ]
+        assert statements[f"{target_environment.SamlGroupName}1"]["Resource"] == [
+            f"{access_point_arn}/object/{location1.S3Prefix}/*",
+            f"{access_point_arn}/object/another-prefix/*",
+        ]
+
+
 # Existing Access point and ap policy
 # target_env_admin is already in policy
 # current folder is NOT yet in prefix_list
@@ -11,7 +11,7 @@ def sync_dataset(create_dataset, org_fixture, env_fixture, db):
 def test_stacks_update(db, org, env, sync_dataset, mocker):
     mocker.patch(
         'dataall.core.environment.tasks.env_stacks_updater.update_stack',
-        return_value=True,
+        return_value=None,
     )
     envs, datasets = update_stacks(engine=db, envname='local')
     assert envs == 1
@@ -48,3 +48,12 @@ def test_upsert_tables(db, dataset_fixture, folder_fixture):
             session, dataset_uri=dataset_fixture.datasetUri
         )
         assert len(tables) == 1
+
+
+def test_upsert_tables_indexes_dataset_once(db, dataset_fixture, table_fixture, mocker):
+    index = mocker.spy(DatasetIndexer, 'upsert_many')
+    with db.scoped_session() as session:
+        tables = DatasetTableIndexer.upsert_many(session, [table_fixture, table_fixture])
+        assert len(tables) == 2
+    index.assert_called_once()
+    assert index.call_args.args[-1] == [dataset_fixture.datasetUri]
@@ -1,4 +1,5 @@
 import random
+import threading
 import typing
 
 import pytest
@@ -10,7 +11,8 @@ from dataall.modules.dataset_sharing.services.dataset_sharing_enums import Share
     ShareItemStatus
 from dataall.modules.dataset_sharing.db.share_object_models import ShareObject, ShareObjectItem
 from dataall.modules.dataset_sharing.db.share_object_repositories import ShareObjectRepository, ShareItemSM, ShareObjectSM
-from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset
+from dataall.modules.datasets_base.db.dataset_models import DatasetTable, Dataset, DatasetAccess
+from dataall.modules.datasets_base.services.datasets_base_enums import DatasetAccessKind
 
 
 def random_table_name():
@@ -1639,3 +1641,135 @@ def _successfull_processing_for_share_object(db, share):
 
         Share_SM.update_state(session, share, new_share_state)
 
+
+
+def test_dataset_access_follows_shared_items(db, share3_processed, share_item, table1, dataset1, user2, group2):
+    # Given an approved share item, the requesters do not access the dataset yet
+    share_item(share=share3_processed, table=table1, status=ShareItemStatus.Share_Approved.value)
+
+    def user2_dataset_uris(session):
+        datasets = ShareObjectRepository.paginated_user_datasets(session, user2.username, [group2.name], {})
+        return [node.datasetUri for node in datasets['nodes']]
+
+    with db.scoped_session() as session:
+        assert dataset1.datasetUri not in user2_dataset_uris(session)
+
+        # When the item is shared
+        item_sm = ShareItemSM(ShareItemStatus.Share_Approved.value)
+        item_sm.update_state(session, share3_processed.shareUri, ShareItemStatus.Share_In_Progress.value)
+        session.commit()
+
+        # Then the requesters access the dataset
+        assert dataset1.datasetUri in user2_dataset_uris(session)
+
+        # When the sharing fails
+        item_sm.update_state(session, share3_processed.shareUri, ShareItemStatus.Share_Failed.value)
+        session.commit()
+
+        # Then they do not access it anymore
+        assert dataset1.datasetUri not in user2_dataset_uris(session)
+
+
+def test_paginate_unique_shared_datasets_by_cursor(
+        db, share, share_item, table, dataset1, env2, env2group, user2
+):
+    # Given two shares with several shared items each
+    shares = [
+        share(
+            dataset=dataset1,
+            environment=env2,
+            env_group=env2group,
+            owner=user2.username,
+            status=ShareObjectStatus.Processed.value
+        ) for _ in range(2)
+    ]
+    tables = [table(dataset=dataset1, name=f'pagedtable{i}', username=dataset1.owner) for i in range(2)]
+    for paged_share in shares:
+        for paged_table in tables:
+            share_item(share=paged_share, table=paged_table, status=ShareItemStatus.Share_Succeeded.value)
+
+    with db.scoped_session() as session:
+        # When the unique shares are listed one per page
+        data = {'uniqueShares': True, 'datasetUri': dataset1.datasetUri, 'pageSize': 1, 'cursor': None}
+        page = ShareObjectRepository.paginate_shared_datasets(session, env2.environmentUri, data)
+        share_uris = [node.shareUri for node in page['nodes']]
+        while page['hasNext']:
+            page = ShareObjectRepository.paginate_shared_datasets(
+                session, env2.environmentUri, dict(data, cursor=page['nextCursor'])
+            )
+            share_uris += [node.shareUri for node in page['nodes']]
+
+        # Then every share is listed once
+        assert len(share_uris) == len(set(share_uris))
+        assert {paged_share.shareUri for paged_share in shares} <= set(share_uris)
+
+        for paged_share in shares:
+            session.query(ShareObjectItem).filter(ShareObjectItem.shareUri == paged_share.shareUri).delete()
+            session.query(ShareObject).filter(ShareObject.shareUri == paged_share.shareUri).delete()
+
+
+def test_concurrent_shares_of_a_dataset_keep_its_access(
+        db, share, share_item, table1, dataset1, env2, env2group, user, user2, group2
+):
+    # Given two shares of the dataset to the same group, requested by different users
+    shares = [
+        share(
+            dataset=dataset1,
+            environment=env2,
+            env_group=env2group,
+            owner=owner.username,
+            status=ShareObjectStatus.Share_In_Progress.value
+        ) for owner in (user, user2)
+    ]
+    for concurrent_share in shares:
+        share_item(share=concurrent_share, table=table1, status=ShareItemStatus.Share_Approved.value)
+
+    def share_items(share_uri):
+        with db.scoped_session() as session:
+            ShareItemSM(ShareItemStatus.Share_Approved.value).update_state(
+                session, share_uri, ShareItemStatus.Share_In_Progress.value
+            )
+
+    errors = []
+
+    def share_second_items():
+        try:
+            share_items(shares[1].shareUri)
+        except Exception as e:
+            errors.append(e)
+
+    second_share = threading.Thread(target=share_second_items)
+
+    # When their items are shared by concurrent transactions
+    with db.scoped_session() as session:
+        ShareItemSM(ShareItemStatus.Share_Approved.value).update_state(
+            session, shares[0].shareUri, ShareItemStatus.Share_In_Progress.value
+        )
+        second_share.start()
+        second_share.join(timeout=1)
+
+        # Then the second one waits for the first to commit
+        assert second_share.is_alive()
+    second_share.join()
+
+    # and the access to the dataset includes both shares
+    assert not errors
+    with db.scoped_session() as session:
+        accesses = set(
+            session.query(DatasetAccess.principalId, DatasetAccess.accessKind).filter(
+                DatasetAccess.datasetUri == dataset1.datasetUri,
+                DatasetAccess.accessKind.in_(
+                    [DatasetAccessKind.Shared.value, DatasetAccessKind.ShareRequester.value]
+                ),
+            )
+        )
+        assert accesses >= {
+            (group2.name, DatasetAccessKind.Shared.value),
+            (user.username, DatasetAccessKind.ShareRequester.value),
+            (user2.username, DatasetAccessKind.ShareRequester.value),
+        }
+
+        for concurrent_share in shares:
+            session.query(ShareObjectItem).filter(ShareObjectItem.shareUri == concurrent_share.shareUri).delete()
+            session.query(ShareObject).filter(ShareObject.shareUri == concurrent_share.shareUri).delete()
+        ShareObjectRepository.update_dataset_share_access(session, dataset1.datasetUri)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.db import exceptions
+from dataall.modules.worksheets.aws.athena_client import AthenaClient
+
+ENV_GROUP = SimpleNamespace(environmentAthenaWorkGroup='workgroup', environmentIAMRoleArn='role')
+
+
+@pytest.fixture
+def athena(mocker):
+    athena = MagicMock()
+    athena.get_query_execution.return_value = {
+        'QueryExecution': {
+            'WorkGroup': 'workgroup',
+            'Status': {'State': 'SUCCEEDED'},
+            'Statistics': {'TotalExecutionTimeInMillis': 1200, 'DataScannedInBytes': 2048},
+            'ResultConfiguration': {'OutputLocation': 's3://bucket/query.csv'},
+        }
+    }
+    athena.get_query_results.return_value = {
+        'ResultSet': {
+            'ResultSetMetadata': {'ColumnInfo': [{'Name': 'id', 'Type': 'integer'}, {'Name': 'name', 'Type': 'varchar'}]},
+            'Rows': [
+                {'Data': [{'VarCharValue': 'id'}, {'VarCharValue': 'name'}]},
+                {'Data': [{'VarCharValue': '1'}, {}]},
+            ],
+        },
+        'NextToken': 'token',
+    }
+    mocker.patch.object(AthenaClient, '_client', return_value=athena)
+    yield athena
+
+
+def test_first_page_of_results(athena):
+    result = AthenaClient.get_athena_query_results('111111111111', ENV_GROUP, 'eu-west-1', 'query-id')
+
+    assert result['columns'] == [
+        {'columnName': 'id', 'typeName': 'integer'},
+        {'columnName': 'name', 'typeName': 'varchar'},
+    ]
+    assert result['rows'] == [['1', None]]
+    assert result['nextToken'] == 'token'
+    assert result['DataScannedInBytes'] == 2048
+    assert result['ElapsedTimeInMs'] == 1200
+
+
+def test_running_query_has_no_results(athena):
+    athena.get_query_execution.return_value['QueryExecution']['Status'] = {'State': 'RUNNING'}
+
+    result = AthenaClient.get_athena_query_results('111111111111', ENV_GROUP, 'eu-west-1', 'query-id')
+
+    assert result['Status'] == 'RUNNING'
+    assert result['rows'] == []
+    athena.get_query_results.assert_not_called()
+
+
+def test_queries_of_other_workgroups_are_not_found(athena):
+    athena.get_query_execution.return_value['QueryExecution']['WorkGroup'] = 'other'
+
+    with pytest.raises(exceptions.ObjectNotFound):
+        AthenaClient.get_athena_query_results('111111111111', ENV_GROUP, 'eu-west-1', 'query-id')